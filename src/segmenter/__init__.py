@@ -2,11 +2,21 @@ from ._util.by_category import (
 	segment_by_categories_and_slk_discontinuities,
 	segment_by_categories_and_slk_true_discontinuities
 )
-from ._util.linspace_steps import linspace_steps;
+from ._util.linspace_steps import linspace_steps, linspace_steps_batch;
 from ._util.split_rows_by_category_to_max_measure_length import split_rows_by_category_to_max_segment_length
-from ._util.fetch_road_network_info import fetch_road_network_info
-from ._util.split_rows_by_segmentation import split_rows_by_segmentation
+from ._util.fetch_road_network_info import fetch_road_network_info, iter_road_network_info, concat_road_network_pages, sync_road_network_info
+from ._util.split_rows_by_segmentation import split_rows_by_segmentation, split_rows_by_segmentations
 
 from ._util.cross_sections.cross_sections import cross_sections, cross_sections_normalised
 
-from ._util.check_segmentation import check_linear_index, check_linear_index_is_ordered_and_disjoint, check_monotonically_increasing_segments, check_no_reversed_segments
\ No newline at end of file
+from ._util.network_index import NetworkIndex
+
+from ._util.interval_join import interval_join
+from ._util.locate_points import locate_points
+from ._util.measure_conversion import MeasureConversionIndex
+
+from ._util.check_segmentation import check_linear_index, check_linear_index_is_ordered_and_disjoint, check_monotonically_increasing_segments, check_no_reversed_segments, linear_index_violations, find_overlaps
+
+from ._util.validation import mark_validated
+
+from ._util.streaming import stream_partitions, align_partitions, iter_parquet_partitions, write_parquet
\ No newline at end of file
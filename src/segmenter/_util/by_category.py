@@ -1,17 +1,22 @@
 
 
 
-from typing import Optional, List, Tuple
+from typing import Optional, List, Tuple, Union
 import pandas
 import numpy as np
+from .network_index import NetworkIndex, network_data
+from .fixed_point import to_fixed_point
+from .check_segmentation import _overlaps_earlier_row
 CATEGORY_COLUMN_NAME = "seg.ctg"
 
 
 
 def segment_by_categories_and_slk_discontinuities(
-        data:pandas.DataFrame,
+        data:Union[pandas.DataFrame, NetworkIndex],
         categories:List[str],
         measure_slk:Tuple[str,str],
+        measure_decimals:Optional[int]=None,
+        check_overlaps:bool=False,
     ):
     """
     Returns a series containing integer segment labels:
@@ -22,17 +27,18 @@ def segment_by_categories_and_slk_discontinuities(
     Please Note:
     
     - For each unique combination of `categories` in the input `data`, the range `slk_from` to `slk_to` for observations **must** be non-overlapping.
-    - No check is made for overlapping observations in this function, it is actually very computationally intensive to do so. I might write a utility that does it one day.
-    - Weird stuff will happen if there are overlaps
-    - You have been warned
+    - No check is made for overlapping observations unless `check_overlaps=True`. Weird stuff will happen if there are overlaps.
+      Use `find_overlaps()` to list every overlapping pair of rows.
 
     Internally, data is sorted by the `categories` (in order provided) then by 
     `measure_slk[0]` prior to seeking discontinuities then labeling.
 
     Args:
-        data (pandas.DataFrame):       data to be segmented
+        data (pandas.DataFrame):       data to be segmented, or a `NetworkIndex` of the data
         categories (list[str]):        column names of categories to segment by; eg ["road", "cwy"] or ["road", "cwy", "xsp"]
         measure_slk (tuple[str,str]):  column names of slk measure to segment by; eg ("slk_from", "slk_to")
+        measure_decimals (int, optional): see `segment_by_categories_and_slk_true_discontinuities()`
+        check_overlaps (bool, optional):  see `segment_by_categories_and_slk_true_discontinuities()`
     Returns:
         pandas.Series: A series of integers which label the segment_id of each row.
         A series with an index that is compatible
@@ -59,14 +65,18 @@ def segment_by_categories_and_slk_discontinuities(
         data,
         categories,
         measure_slk,
-        measure_slk 
+        measure_slk,
+        measure_decimals,
+        check_overlaps,
     )
 
 def segment_by_categories_and_slk_true_discontinuities(
-        data:pandas.DataFrame,
+        data:Union[pandas.DataFrame, NetworkIndex],
         categories:List[str],
         measure_slk:Tuple[str,str],
-        measure_true:Tuple[str,str]
+        measure_true:Tuple[str,str],
+        measure_decimals:Optional[int]=None,
+        check_overlaps:bool=False,
     ) -> pandas.Series:
     """
     Returns a series containing integer segment labels:
@@ -77,18 +87,24 @@ def segment_by_categories_and_slk_true_discontinuities(
     Please Note:
     
     - For each unique combination of `categories` in the input `data`, the range `true_from` to `true_to` for observations **must** be non-overlapping.
-    - No check is made for overlapping observations in this function, it is actually very computationally intensive to do so. I might write a utility that does it one day.
-    - Weird stuff will happen if there are overlaps
-    - You have been warned
+    - No check is made for overlapping observations unless `check_overlaps=True`. Weird stuff will happen if there are overlaps.
+      Use `find_overlaps()` to list every overlapping pair of rows.
 
     Internally, data is sorted by the `categories` (in order provided) then by 
     `measure_true[0]` prior to seeking discontinuities then labeling.
+    If `data` is a `NetworkIndex` built with the same `categories` and sorted by
+    `measure_true[0]`, its sort order is reused instead.
 
     Args:
-        data (pandas.DataFrame):       data to be segmented
+        data (pandas.DataFrame):       data to be segmented, or a `NetworkIndex` of the data
         categories (list[str]):        column names of categories to segment by; eg ["road", "cwy"] or ["road", "cwy", "xsp"]
         measure_slk (tuple[str,str]):  column names of slk measure to segment by; eg ("slk_from", "slk_to")
         measure_true (tuple[str,str]): column names of true measure to segment by; eg ("true_from", "true_to")
+        measure_decimals (int, optional): Opt-in fixed point mode. Measures are converted to integer units of
+                                          `10**-measure_decimals` (eg `6` for millimetres when measures are in kilometres)
+                                          and compared exactly. By default measures are compared after rounding to 3 decimal places.
+        check_overlaps (bool, optional):  Raise a `ValueError` if any rows overlap in `measure_true` within a group of `categories`.
+                                          The check reuses the sort performed for segmentation, so it is cheap.
     Returns:
         pandas.Series: A series of integers which label the segment_id of each row.
         A series with an index that is compatible
@@ -112,49 +128,78 @@ def segment_by_categories_and_slk_true_discontinuities(
     measure_slk_from, measure_slk_to = measure_slk
     measure_true_from, measure_true_to = measure_true
     
-    # note: after this line, we must not touch the index of this dataframe until it is recombined with the result at the end of this function
-    data = data.sort_values(by=[*categories, measure_true_from])
-
-    result_column = data.set_index(categories).loc[:,[]]
-    
-    
-
-    offset = 0
-    for group_index, group in data.groupby(categories):
-
-        slk_discontinuities = (   
-           np.around(group[  measure_slk_to].values[ :-1], 3)
-        != np.around(group[measure_slk_from].values[1:  ], 3)
+    # Rather than looping over data.groupby(categories), the whole sorted frame is
+    # labelled in a single pass. A new segment starts at row `i` when either
+    #  - any of the categories differ from row `i-1` (the start of a new group), or
+    #  - there is a discontinuity in the slk or true measure between row `i-1` and row `i`.
+    if isinstance(data, NetworkIndex) and data.is_sorted_by(categories, measure_true_from):
+        sorted_index = data.data.index.take(data.order)
+        breaks = np.zeros(len(sorted_index), dtype=bool)
+        breaks[data.group_offsets[:-1]] = True
+        slk_from, slk_to, true_from, true_to = (
+            data.sorted_measure(column)
+            for column in (measure_slk_from, measure_slk_to, measure_true_from, measure_true_to)
         )
-        
-        true_discontinuities = (
-            np.around(group[  measure_true_to].values[ :-1], 3)
-            != np.around(group[measure_true_from].values[1:  ], 3)
+    else:
+        # note: after this line, we must not touch the index of this dataframe until it is recombined with the result at the end of this function
+        data = network_data(data).sort_values(by=[*categories, measure_true_from])
+        sorted_index = data.index
+        breaks = _category_breaks(data, categories)
+        slk_from, slk_to, true_from, true_to = (
+            data[column].to_numpy()
+            for column in (measure_slk_from, measure_slk_to, measure_true_from, measure_true_to)
         )
 
-        # discontinuities is a boolean array, true at each index where a discontinuity occurs
-        discontinuities = slk_discontinuities | true_discontinuities
-
-        # but taking the cumulative sum of this array will give us the index of the first observation in each segment
-        cat_values = np.cumsum(
-            np.append(
-                np.full(1,False),
-                discontinuities
+    if check_overlaps:
+        overlapping = _overlaps_earlier_row(breaks, true_from.astype("f8"), true_to.astype("f8"))
+        if overlapping.any():
+            raise ValueError(
+                f"{overlapping.sum()} rows overlap an earlier row in {measure_true} for the same {categories}; "
+                f"the first is at index {sorted_index[np.argmax(overlapping)]}. Use `find_overlaps()` to list every overlapping pair."
             )
-        )
 
-        result_column.loc[group_index, "seg.ctg"] = cat_values + offset
-        offset += max(cat_values)+1
+    if measure_decimals is None:
+        def rounded(values): return np.around(values, 3)
+    else:
+        def rounded(values): return to_fixed_point(values, measure_decimals)
+
+    breaks[1:] |= (
+           rounded(slk_to  [ :-1])
+        != rounded(slk_from[1:  ])
+    )
     
+    breaks[1:] |= (
+           rounded(true_to  [ :-1])
+        != rounded(true_from[1:  ])
+    )
+
+    # taking the cumulative sum of this array gives the label of each segment
+    segment_labels = np.cumsum(breaks) - 1
 
-    # Note: the following strips the index from result_column 
-    # and relies on sort order to join with original data.index
+    # Note: relies on sort order to join with original data.index
     return pandas.Series(
-        result_column.iloc[:,0].values.astype("u8"),
-        index=data.index
+        segment_labels.astype("u8"),
+        index=sorted_index
     )
 
 
+def _category_breaks(data:pandas.DataFrame, categories:List[str]) -> np.ndarray:
+    """
+    Takes a dataframe `data` which is already sorted by `categories` and returns
+    a boolean array which is `True` at the first row of each unique combination
+    of `categories`.
+    """
+    breaks = np.zeros(len(data), dtype=bool)
+    if len(breaks) == 0:
+        return breaks
+    breaks[0] = True
+    for category in categories:
+        # factorize so that we compare integer codes rather than python objects
+        codes, _uniques = pandas.factorize(data[category])
+        breaks[1:] |= codes[1:] != codes[:-1]
+    return breaks
+
+
 
 def segment_by_cross_section(
         data,
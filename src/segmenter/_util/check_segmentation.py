@@ -1,18 +1,135 @@
+import numpy as np
 import pandas as pd
-from typing import List, Tuple
+from typing import List, Optional, Tuple
+from .network_index import NetworkIndex, network_data
+from .searchsorted_by_group import searchsorted_by_group
+
+
+VIOLATION_KINDS = ("nan", "reversed", "zero_length", "unsorted", "overlapping")
+
+
+def linear_index_violations(df, measure:Tuple[str,str], categories:Optional[List[str]]=None) -> pd.DataFrame:
+    """
+    Checks every row of `df` in one vectorised pass and returns a dataframe with one row per violation.
+
+    Takes
+    - a dataframe `df` (or a `NetworkIndex`; if it is grouped by `categories` its grouping is reused)
+    - a tuple `measure` (the names of the from/to measure columns eg `("true_from","true_to")`)
+    - A list of `categories` (column names) by which to group the data (optional; by default all rows form one group);
+
+    Rows keep their original order within each group (no sort is performed). The kinds of violation are
+
+    - `"nan"`: `measure[0]` or `measure[1]` is NaN
+    - `"reversed"`: `measure[0]` is greater than `measure[1]`
+    - `"zero_length"`: `measure[0]` is equal to `measure[1]`
+    - `"unsorted"`: `measure[0]` or `measure[1]` is less than in the previous row of the group
+    - `"overlapping"`: `measure[0]` is less than `measure[1]` of the previous row of the group
+
+    The `"unsorted"` and `"overlapping"` kinds are not reported for rows with a missing category value.
+
+    The result has the columns
+    - `position`: the integer position of the offending row in `df`
+    - `previous_position`: for `"unsorted"` and `"overlapping"`, the position of the previous row of the group, otherwise `-1`
+    - `group`: the group number of the row (groups are numbered in sorted order of `categories`; `-1` if a category value is missing)
+    - `kind`: one of the kinds above
+    - one column for each of `categories`
+
+    and is sorted by `position` then `kind`. An empty result means no violations were found.
+    """
+    categories = [] if categories is None else list(categories)
+    data = network_data(df)
+    measure_from = data[measure[0]].to_numpy(dtype="f8")
+    measure_to   = data[measure[1]].to_numpy(dtype="f8")
+    group_number = _group_number(df, categories, measure)
+
+    return _violations_to_dataframe(
+        *_find_violations(measure_from, measure_to, group_number),
+        group_number,
+        data,
+        categories,
+    )
+
+
+def find_overlaps(df, categories:List[str], measure:Tuple[str,str]) -> pd.DataFrame:
+    """
+    Returns every pair of rows of `df` which overlap, within each group of `categories`.
+
+    Two rows overlap when their open intervals `(measure[0], measure[1])` intersect;
+    touching rows (eg `[1,2]` and `[2,3]`) do not overlap, and rows which are zero length,
+    reversed or NaN never overlap anything (see `linear_index_violations` for those).
+    Like the `segment_by_categories...` functions, rows with missing category values are grouped together.
+
+    Rows are sorted by `measure[0]` within each group, so the rows overlapping a given row
+    are a contiguous run of the rows after it. The cost is O(n log n) plus O(1) per pair.
+
+    `df` may be a `NetworkIndex`; if it is sorted by `categories` and `measure[0]` its sort order is reused.
+
+    The result has one row per overlapping pair, with the columns
+    - `first_position`: the integer position in `df` of the row which starts first
+    - `second_position`: the integer position in `df` of the other row
+    - `overlap_length`: the length of the intersection of the two rows
+    - one column for each of `categories`
+    """
+    data = network_data(df)
+    if isinstance(df, NetworkIndex) and df.is_sorted_by(categories, measure[0]):
+        network = df
+    else:
+        network = NetworkIndex(data, categories, measure)
+
+    order = network.order
+    sorted_group = network.group_number[order]
+    sorted_from  = data[measure[0]].to_numpy(dtype="f8")[order]
+    sorted_to    = data[measure[1]].to_numpy(dtype="f8")[order]
+    has_length   = sorted_from < sorted_to
+
+    # the rows which start before row j ends are rows j+1 ... end-1
+    end = searchsorted_by_group(sorted_group, sorted_from, sorted_group, sorted_to, side="left")
+    pair_count = np.where(has_length, np.maximum(end - np.arange(1, len(order) + 1), 0), 0)
+    first  = np.repeat(np.arange(len(order)), pair_count)
+    second = (
+        first + 1
+        + np.arange(len(first))
+        - np.repeat(np.cumsum(pair_count) - pair_count, pair_count)
+    )
+    is_pair = has_length[second]
+    first  = first [is_pair]
+    second = second[is_pair]
+
+    result = pd.DataFrame({
+        "first_position":  order[first],
+        "second_position": order[second],
+        "overlap_length":  np.minimum(sorted_to[first], sorted_to[second]) - sorted_from[second],
+    })
+    for category in categories:
+        result[category] = data[category].take(order[first]).to_numpy()
+    return result
+
 
 def check_monotonically_increasing_segments(df, categories:List[str], measure:Tuple[str,str]):
     """
     Check that the segments are monotonically increasing;
-    Every segment in each category must start at or after the end of the previous segment
+    Every segment in each category must start at or after the end of the previous segment,
+    and the first segment in each category must start at or after zero
 
     - Note: does not perform a sort. Input data must be pre-sorted by measure[0]
+    - `df` may be a `NetworkIndex`; if it is grouped by `categories` its grouping is reused
+    - rows with a missing category value are not checked
+    - see `linear_index_violations` to find the offending rows
     """
-    return all(
-        (values[measure[0]] >= values[measure[1]].shift(1, fill_value=0)).all()
-        for _index, values
-        in df.groupby(categories)
-    )
+    data = network_data(df)
+    group_number = _group_number(df, categories, measure)
+
+    # rows of each group, in original order
+    order = np.argsort(group_number, kind="stable")
+    order = order[group_number[order] != -1]
+    sorted_group = group_number[order]
+    sorted_from  = data[measure[0]].to_numpy(dtype="f8")[order]
+    sorted_to    = data[measure[1]].to_numpy(dtype="f8")[order]
+
+    previous_to = np.zeros(len(order))
+    previous_to[1:] = np.where(sorted_group[1:] == sorted_group[:-1], sorted_to[:-1], 0)
+    # comparisons with NaN are False, so NaN values fail the check
+    return bool((sorted_from >= previous_to).all())
 
 def check_no_reversed_segments(df, measure:Tuple[str,str]):
     """
@@ -59,17 +176,26 @@ def check_linear_index(measure:pd.DataFrame) -> None:
     if not pd.api.types.is_numeric_dtype(measure.dtypes.iloc[1]):
         raise TypeError(f"The column {measure.columns.to_series().iloc[1]} is not a numeric dtype; {measure.dtypes.iloc[1]}")
 
-    if measure.isna().sum().sum() > 0:
+    measure_from = measure.iloc[:,0].to_numpy(dtype="f8")
+    measure_to   = measure.iloc[:,1].to_numpy(dtype="f8")
+    _position, _previous_position, kind_code = _find_violations(
+        measure_from,
+        measure_to,
+        np.full(len(measure_from), -1, dtype=np.int64),
+    )
+    kinds = {VIOLATION_KINDS[code] for code in np.unique(kind_code)}
+
+    if "nan" in kinds:
         raise ValueError(
             f"The columns ({column_names}) contain at least one NaN value"
         )
 
-    if (measure.iloc[:,0] > measure.iloc[:,1]).any():
+    if "reversed" in kinds:
         raise ValueError(
             f"The columns ({column_names}) contain at least one row where the first column is greater than the second"
         )
     
-    if (measure.iloc[:,0] == measure.iloc[:,1]).any():
+    if "zero_length" in kinds:
         raise ValueError(
             f"The columns ({column_names}) contain at least one zero length segment"
         )
@@ -86,24 +212,118 @@ def check_linear_index_is_ordered_and_disjoint(df, measure:Tuple[str,str], categ
     The function will group the dataframe by `categories` then check
     - both `measure` columns are monotonically increasing
     - the 'measure from' column is always less than the 'measure to' column
+
+    `df` may be a `NetworkIndex`; if it is grouped by `categories` its grouping is reused
+    """
+
+    violations = linear_index_violations(df, measure, categories)
+    violations = violations[(violations["group"] != -1) & violations["kind"].isin(["nan", "unsorted", "overlapping"])]
+    if len(violations) == 0:
+        return
+
+    # report the first offending group, like a loop over `df.groupby(categories)` would
+    violations = violations[violations["group"] == violations["group"].min()]
+    group_key = tuple(violations[categories].iloc[0])
+    group_index = group_key[0] if len(group_key) == 1 else group_key
+
+    data = network_data(df)
+    measure_from = data[measure[0]].to_numpy(dtype="f8")
+    measure_to   = data[measure[1]].to_numpy(dtype="f8")
+    position          = violations["position"].to_numpy()
+    previous_position = violations["previous_position"].to_numpy()
+    kind              = violations["kind"].to_numpy()
+    is_unsorted = kind == "unsorted"
+    is_nan      = kind == "nan"
+
+    if (
+        (is_nan & np.isnan(measure_from[position])).any()
+        or (is_unsorted & (measure_from[position] < measure_from[previous_position])).any()
+    ):
+        raise ValueError(
+            f"The column {measure[0]} is not monotonic increasing for the group {categories}:{group_index}. Please try sorting your dataset by {measure[0]}. Otherwise remove overlapping segments."
+        )
+
+    if (is_nan | is_unsorted).any():
+        raise ValueError(
+            f"The column {measure[1]} is not monotonic increasing for the group {categories}:{group_index}. Please try sorting your dataset by {measure[0]}. Otherwise remove overlapping segments."
+        )
+
+    raise ValueError(
+        f"The columns {measure} have rows which are not disjoint intervals for the group {categories}:{group_index}."
+    )
+
+
+def _group_number(df, categories:List[str], measure:Tuple[str,str]) -> np.ndarray:
+    """The group number of each row of `df`, or `-1` where a category value is missing; reuses the grouping of a `NetworkIndex` where possible"""
+    data = network_data(df)
+    if len(categories) == 0:
+        return np.zeros(len(data.index), dtype=np.int64)
+    network = df if isinstance(df, NetworkIndex) and df.is_grouped_by(categories) else NetworkIndex(data, categories, measure)
+    return np.where(network._row_has_missing_category, -1, network.group_number)
+
+
+def _find_violations(measure_from:np.ndarray, measure_to:np.ndarray, group_number:np.ndarray):
     """
+    Returns the arrays `(position, previous_position, kind_code)` of every violation,
+    where `kind_code` indexes `VIOLATION_KINDS`. Rows with `group_number == -1` are only checked on their own.
+    """
+    positions = []
+    previous_positions = []
+    kind_codes = []
+
+    def add(kind:str, mask:np.ndarray, position:np.ndarray, previous_position:np.ndarray=None):
+        found = position[mask]
+        positions.append(found)
+        previous_positions.append(np.full(len(found), -1, dtype=np.int64) if previous_position is None else previous_position[mask])
+        kind_codes.append(np.full(len(found), VIOLATION_KINDS.index(kind), dtype=np.int8))
 
-    # for group_index, group in df.groupby(categories):
-    # TODO: Triggers useless future warning: if len(categories) == 1 then group_index will yield a length 1 tuple instead of a string.
-    # To suppress the warning we can do something yuck:
-    for group_index, group in df.groupby(categories[0] if len(categories)==1 else categories):
-        measure_columns = group[[*measure]]
-        if not measure_columns.iloc[:,0].is_monotonic_increasing:
-            raise ValueError(
-                f"The column {measure[0]} is not monotonic increasing for the group {categories}:{group_index}. Please try sorting your dataset by {measure[0]}. Otherwise remove overlapping segments."
-            )
-            
-        if not measure_columns.iloc[:,1].is_monotonic_increasing:
-            raise ValueError(
-                f"The column {measure[1]} is not monotonic increasing for the group {categories}:{group_index}. Please try sorting your dataset by {measure[0]}. Otherwise remove overlapping segments."
-            )
-        
-        if not (measure_columns.iloc[:1,1].to_numpy() <= measure_columns.iloc[1:,0].to_numpy()).all():
-            raise ValueError(
-                f"The columns {measure} have rows which are not disjoint intervals for the group {categories}:{group_index}."
-        )
\ No newline at end of file
+    every_position = np.arange(len(measure_from), dtype=np.int64)
+    add("nan",         np.isnan(measure_from) | np.isnan(measure_to), every_position)
+    add("reversed",    measure_from >  measure_to,                    every_position)
+    add("zero_length", measure_from == measure_to,                    every_position)
+
+    # rows of each group, in original order; consecutive rows are compared
+    order = np.argsort(group_number, kind="stable")
+    sorted_group = group_number[order]
+    sorted_from  = measure_from[order]
+    sorted_to    = measure_to[order]
+    same_group = (sorted_group[1:] == sorted_group[:-1]) & (sorted_group[1:] != -1)
+    add(
+        "unsorted",
+        same_group & ((sorted_from[1:] < sorted_from[:-1]) | (sorted_to[1:] < sorted_to[:-1])),
+        order[1:],
+        order[:-1],
+    )
+    add("overlapping", same_group & (sorted_from[1:] < sorted_to[:-1]), order[1:], order[:-1])
+
+    position          = np.concatenate(positions)
+    previous_position = np.concatenate(previous_positions)
+    kind_code         = np.concatenate(kind_codes)
+    result_order = np.lexsort((kind_code, position))
+    return position[result_order], previous_position[result_order], kind_code[result_order]
+
+
+def _violations_to_dataframe(position, previous_position, kind_code, group_number, data:pd.DataFrame, categories:List[str]) -> pd.DataFrame:
+    result = pd.DataFrame({
+        "position":          position,
+        "previous_position": previous_position,
+        "group":             group_number[position],
+        "kind":              pd.Categorical.from_codes(kind_code, categories=list(VIOLATION_KINDS)),
+    })
+    for category in categories:
+        result[category] = data[category].take(position).to_numpy()
+    return result
+
+
+def _overlaps_earlier_row(group_start:np.ndarray, sorted_from:np.ndarray, sorted_to:np.ndarray) -> np.ndarray:
+    """
+    Takes measures sorted by `sorted_from` within groups (`group_start` is `True` at the first row of each group)
+    and returns a boolean array which is `True` where a row overlaps any earlier row of its group,
+    by comparing each row with the running maximum of `sorted_to` over the earlier rows.
+    Uses the same definition of overlap as `find_overlaps()`.
+    """
+    group_label = np.cumsum(group_start)
+    running_max_to = pd.Series(np.where(sorted_from < sorted_to, sorted_to, -np.inf)).groupby(group_label).cummax().to_numpy()
+    earlier_max_to = np.full(len(sorted_to), -np.inf)
+    earlier_max_to[1:] = np.where(group_start[1:], -np.inf, running_max_to[:-1])
+    return (sorted_from < sorted_to) & (sorted_from < earlier_max_to)
@@ -1,57 +1,93 @@
 from __future__ import annotations
-from typing import Callable, Collection, Generator, Iterable, Iterator, List, Optional, Hashable, Any, Sequence, Tuple
-import pandas as pd
-import itertools
+from typing import Callable, Dict, Iterable, Iterator, Hashable, Tuple
 
 
 class Addable:
-    """A list of tuples that can be added to another list of tuples
-    Each tuple contains a `(index:Hashable, value:float)`. When the lists are added elements with the same index are added.
-    they merge elements with the same `index`, either adding or subtracting from the
-    float value. If the float component an element becomes zero then it is removed
-    from the list.
+    """A collection of `(index:Hashable, value:float)` members that can be added to
+    another collection. When two collections are added, members with the same `index`
+    are merged by adding their values.
 
-    >>> Addable([(1, 1), (1, 2), (2, 3)]) + Addable([(1, 1), (2, 3)])
-    Addable([(1, 2), (2, 0)])
+    Membership is tracked using an integer count, kept separately from the float value.
+    Each tuple passed to the constructor contributes `+1` to the count of its `index`,
+    and negating an `Addable` negates both the count and the value. A member is removed
+    when its count becomes exactly zero (no floating point epsilon is involved).
 
-    Note that the list cannot be instantiated with zero tuples:
+    >>> Addable([(1, 1), (2, 3)]) + Addable([(1, 1)])
+    [(1, 2.000), (2, 3.000)]
+
+    >>> Addable([(1, 1), (2, 3)]) - Addable([(1, 1)])
+    [(2, 3.000)]
+
+    Note that a member with a value of zero is still a member:
 
     >>> Addable([(1,0)])
-    Addable([])
+    [(1, 0.000)]
 
+    Members are stored in dictionaries, so adding or removing a member does not
+    require the collection to be re-sorted. Members are only sorted by `index`
+    when the collection is iterated.
     """
-    __slots__ = ['_data']
-    _data:List[Tuple[Hashable, float]]
-
-    def __init__(self, data:List[tuple[Hashable, float]]):
-        self._data = [
-            (groupby_index, the_sum)
-            for groupby_index, index_overlap_iterator in
-            itertools.groupby(sorted(data), lambda item:item[0])
-            if abs(the_sum:=sum(item[1] for item in index_overlap_iterator)) > 1e-6
-        ]
-    
+    __slots__ = ['_counts', '_values']
+    _counts:Dict[Hashable, int]
+    _values:Dict[Hashable, float]
+
+    def __init__(self, data:Iterable[Tuple[Hashable, float]]=()):
+        self._counts = {}
+        self._values = {}
+        for index, value in data:
+            self._accumulate(index, 1, value)
+
+    def _accumulate(self, index:Hashable, count:int, value:float) -> None:
+        # only used while the Addable is being constructed; Addable is otherwise immutable.
+        new_count = self._counts.get(index, 0) + count
+        if new_count == 0:
+            del self._counts[index]
+            del self._values[index]
+        else:
+            self._counts[index] = new_count
+            self._values[index] = self._values.get(index, 0) + value
+
+    @classmethod
+    def _from_dicts(cls, counts:Dict[Hashable, int], values:Dict[Hashable, float]) -> Addable:
+        result = cls.__new__(cls)
+        result._counts = counts
+        result._values = values
+        return result
+
     def __add__(self, other:Addable) -> Addable:
-        return Addable(self._data + other._data)
+        # copy the larger collection, then accumulate the members of the smaller one
+        larger, smaller = (self, other) if len(self) >= len(other) else (other, self)
+        result = Addable._from_dicts(larger._counts.copy(), larger._values.copy())
+        for index, count in smaller._counts.items():
+            result._accumulate(index, count, smaller._values[index])
+        return result
 
     def __neg__(self) -> Addable:
-        return Addable([(item[0], -item[1]) for item in self._data])
-    
+        return Addable._from_dicts(
+            {index: -count for index, count in self._counts.items()},
+            {index: -value for index, value in self._values.items()},
+        )
+
     def __sub__(self, other:Addable) -> Addable:
         return self + (-other)
-    
+
     def __len__(self) -> int:
-        return len(self._data)
+        return len(self._counts)
 
     def __repr__(self) -> str:
-        inner = ', '.join(f'({item[0]}, {item[1]:.3f})' for item in self._data)
+        inner = ', '.join(f'({item[0]}, {item[1]:.3f})' for item in self)
         return f"[{inner}]"
 
     def copy(self) -> Addable:
-        return Addable(self._data.copy())
-    
+        return Addable._from_dicts(self._counts.copy(), self._values.copy())
+
     def map(self, func:Callable[[tuple[Hashable, float]], tuple[Hashable, float]]) -> Addable:
-        return Addable([func(item) for item in self._data])
+        """Replace each `(index, value)` with `func((index, value))`. Membership counts are preserved."""
+        result = Addable()
+        for index, count in self._counts.items():
+            new_index, new_value = func((index, self._values[index]))
+            result._accumulate(new_index, count, new_value)
+        return result
 
     def __iter__(self) -> Iterator[tuple[Hashable, float]]:
-        return iter(self._data)
\ No newline at end of file
+        return ((index, self._values[index]) for index in sorted(self._counts))
@@ -11,9 +11,13 @@ class ImmutableTreeMergeError(Exception):
 
 class ImmutableTree:
     """
-    This is not a very clever implementation of a Tree storage structure.
-    It was cobbled together while itterating on the algorithm.
-    It is intended to be replaced with a refactored version.
+    A persistent (immutable) tree. Each node has named `_children` and some `_data`.
+
+    Nodes are never modified after they are returned to the caller. Operations
+    like `add_data()` copy only the nodes along the modified path and share every
+    untouched subtree with the original tree. Therefore keeping many versions
+    of the tree costs memory proportional to the depth of the tree per version,
+    rather than the size of the tree.
     """
     __slots__ = (
         '_children',
@@ -45,25 +49,46 @@ class ImmutableTree:
         return clone
 
     def prune(self) -> Optional[ImmutableTree]:
-        result = self.deep_clone()
-        result._children = {
+        """Returns a tree with all empty leaves removed, or None if the tree is empty"""
+        pruned_children = {
             child_name:child_pruned 
-            for child_name, child in result._children.items() 
+            for child_name, child in self._children.items() 
             if (child_pruned:=child.prune()) is not None
         }
-        if len(result._children) == 0 and len(result._data) == 0:
+        if len(pruned_children) == 0 and len(self._data) == 0:
             return None
+        if len(pruned_children) == len(self._children) and all(pruned_children[key] is self._children[key] for key in pruned_children):
+            # nothing was pruned; share this node
+            return self
+        result = ImmutableTree()
+        result._children = pruned_children
+        result._data = self._data
         return result
 
     def add_data(self, path_values:list[str], data:Addable) -> ImmutableTree:
-        result = self.deep_clone()
-        pointer = result
-        for path_value in path_values:
-            if path_value not in pointer._children:
-                pointer._children[path_value] = ImmutableTree()
-            pointer = pointer._children[path_value]
-        pointer._data += data
-        return result_pruned if (result_pruned:=result.prune()) is not None else ImmutableTree()
+        return result if (result:=self._add_data(path_values, 0, data)) is not None else ImmutableTree()
+
+    def _add_data(self, path_values:list[str], depth:int, data:Addable) -> Optional[ImmutableTree]:
+        """
+        Path copying; only the nodes from the root to `path_values` are copied.
+        Returns None if the resulting node would be empty so that it is pruned from its parent.
+        """
+        result = ImmutableTree()
+        result._children = self._children.copy()
+        result._data = self._data
+        if depth == len(path_values):
+            result._data = self._data + data
+        else:
+            path_value = path_values[depth]
+            child = self._children.get(path_value)
+            child_result = (child if child is not None else ImmutableTree())._add_data(path_values, depth + 1, data)
+            if child_result is None:
+                result._children.pop(path_value, None)
+            else:
+                result._children[path_value] = child_result
+        if len(result._children) == 0 and len(result._data) == 0:
+            return None
+        return result
     
 
     def remove_data(self, node_values:list[str], data:Addable) -> ImmutableTree:
@@ -73,25 +98,24 @@ class ImmutableTree:
     def merge(self, other:ImmutableTree) -> ImmutableTree:
         
         if self.is_leaf() and other.is_leaf():
-            result = self.deep_clone()
-            result._data += other._data
+            result = ImmutableTree()
+            result._data = self._data + other._data
             return result
-        
-        result = self.deep_clone()
 
-        if not all(key in other._children for key in self._children):
+        if self._children.keys() != other._children.keys():
             raise ImmutableTreeMergeError(f"Cannot merge trees with different node sets: {self} {other}")
 
-        for key, value in other._children.items():
-            if key in result._children:
-                result._children[key] = result._children[key].merge(value)
-            else:
-                raise ImmutableTreeMergeError(f"{key} not in ImmutableTree {self}")
+        result = ImmutableTree()
+        result._data = self._data
+        result._children = {
+            key:value.merge(other._children[key])
+            for key, value in self._children.items()
+        }
         return result
 
 
     def map(self, func:Callable[[tuple[Hashable, float]], tuple[Hashable, float]]) -> ImmutableTree:
-        result = self.deep_clone()
+        result = ImmutableTree()
         result._data = self._data.map(func)
         for key, value in self._children.items():
             result._children[key] = value.map(func)
@@ -1,12 +1,20 @@
 from __future__ import annotations
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import partial
+from typing import Any, Optional, Union
+
+import numpy as np
 import pandas as pd
 
 from ..check_segmentation import check_linear_index, check_linear_index_is_ordered_and_disjoint
+from ..network_index import NetworkIndex, network_data
+from ..fixed_point import to_fixed_point, from_fixed_point
+from ..validation import check_validate_level, run_check
 
 
 from .Addable import Addable
-from .ImmutableTree import ImmutableTree, ImmutableTreeMergeError
-from .Transition import Transition
+from .ImmutableTree import ImmutableTree
 
 class CN:
     """Column Names"""
@@ -17,11 +25,10 @@ class CN:
     event_effect_cumsum = "__event_effect_cumsum__"
     event_measure_diff  = "__event_measure_diff__"
     event_trees         = "__event_trees__"
-    group_number        = "__group_number__"
 
 
 def cross_sections(
-    segmentation:pd.DataFrame,
+    segmentation:Union[pd.DataFrame, NetworkIndex],
     group_categories:list[str],
     cross_section_categories:list[str],
     measure_slk:tuple[str,str],
@@ -29,154 +36,397 @@ def cross_sections(
     out_col_name_cross_section_number:str = "cross_section_number",
     out_col_name_original_index:str = "original_index",
     out_col_name_overlap:str = "overlap",
+    n_jobs:int = 1,
+    executor:Optional[Executor] = None,
+    measure_decimals:Optional[int] = None,
+    validate:str = "full",
 )->pd.DataFrame:
 
     """
     Please see documentation for `cross_sections_normalised()` for the time being
     """
 
-    check_linear_index(segmentation[list(measure_slk)])
-    check_linear_index(segmentation[list(measure_true)])
-    check_linear_index_is_ordered_and_disjoint(segmentation, measure_true, [*group_categories, *cross_section_categories])
-    
-    output_rows = []
-
-    # for group_counter, (group_index, group) in enumerate(segmentation.groupby(group_categories)):
-    # TODO: Triggers useless future warning: if len(group_categories) == 1 then group_counter will yield a length 1 tuple instead of a string.
-    # To suppress the warning we can do something yuck:
-    for group_counter, (group_index, group) in enumerate(segmentation.groupby(group_categories[0] if len(group_categories)==1 else group_categories)):
-        
-        group = group[[*group_categories, *cross_section_categories, *measure_true, *measure_slk]]#.reset_index(drop=True)
-
-        # capture segment start events, sort ascending
-        start_events: pd.DataFrame = group.copy().sort_values(by=cross_section_categories, ascending=True)
-        start_events[CN.event_measure_true] = start_events[measure_true[0]]
-        start_events[CN.event_measure_slk]  = start_events[measure_slk[0]]
-        start_events[CN.event_type]         = "start"
-        start_events[CN.event_effect]       = +1
-        
-        # capture segment end events, sort decending
-        end_events: pd.DataFrame = group.copy().sort_values(by=cross_section_categories, ascending=False)
-        end_events[CN.event_measure_true] = end_events[measure_true[1]]
-        end_events[CN.event_measure_slk]  = end_events[measure_slk[1]]
-        end_events[CN.event_type]         = "end"
-        end_events[CN.event_effect]       = -1
-
-        # combine start and end events and sort using stable sort
-        events:pd.DataFrame = pd.concat([end_events, start_events], axis='index')
-        events = events.sort_values(by=CN.event_measure_true, kind="stable")
-        # the cumulative sum of event_effect and the
-        events[CN.event_effect_cumsum] = events[CN.event_effect].cumsum()
-
-        # this next line changes the dtype
-        #events["event_measure_diff"] = events["event_measure"].diff().fillna(0)
-        # this next version avoids changing the dtype, but has a different value for the first row;
-        # But It turns out this doesnt matter since we only look at this column [1:]
-        #events[CN.event_measure_diff] = events[CN.event_measure_true] - events[CN.event_measure_true].shift(1, fill_value=0)
-        events[CN.event_measure_diff] = events[CN.event_measure_true] - events[CN.event_measure_true].shift(1, fill_value=events[CN.event_measure_true].iloc[0])
-
-        # use a special tree stack type to build up list of transitions
-        # each transition occurs when the cross section changes
-        past_trees = []
-        current_tree = ImmutableTree()
-        for index, row in events.iterrows():
-            csc:list[str] = row[cross_section_categories].to_list()
-            if row[CN.event_type]=="start":
-                current_tree = current_tree.add_data(csc, Addable([(index, 1)]))
-                past_trees.append(current_tree)
-            elif row[CN.event_type]=="end":
-                current_tree = current_tree.remove_data(csc, Addable([(index, 1)]))
-                past_trees.append(current_tree)
-        events[CN.event_trees] = past_trees
-
-        # pair down transitions such that we only capture non-zero length cross-sections
-        transitions:list[Transition] = []
-        # last_index = events.index[0]
-        last_row = events.iloc[0]
-        for _index, row in events.iloc[1:].iterrows():
-            if row[CN.event_measure_diff] > 0:
-                transitions.append(
-                    Transition(
-                        measure_true_from = last_row[CN.event_measure_true],
-                        measure_true_to   = row[CN.event_measure_true],
-                        measure_slk_from  = last_row[CN.event_measure_slk],
-                        measure_slk_to    = row[CN.event_measure_slk],
-                        tree              = last_row[CN.event_trees],
-                    )
-                )
-                # NOTE: The selection of `measure_slk_from` and `measure_slk_to` above are
-                #       wrong, but impossible to fix; if we take a cross section over two carriageways
-                #       (or two datasets) (where the SLK system is different), then it is not possible to guarantee
-                #       1) that we have selected a coherent SLK `from` and `to`. Maybe `from` > `to`?
-                #       2) that points of equation are correctly handled.
-                #       We can at least guarantee that the selected SLKs DO EXIST as we are not interpolating between SLKs.
-            #last_index = index
-            last_row = row
-        
-        mapped_transitions:list[Transition] = [
-            transition.map_tree(lambda item: (item[0], transition.measure_true_to - transition.measure_true_from))
-            for transition
-            in transitions
-        ]
-
-        merged_transitions:list[Transition] = []
-        transition_accumulator = mapped_transitions[0]
-        for transition in mapped_transitions[1:]:
-            #measure_from,      measure_to,      tree      = transition
-            #measure_from_last, measure_to_last, tree_last = transition_accumulator
-            try:
-                transition_accumulator = transition_accumulator.accumulate(transition)
-            except ImmutableTreeMergeError:
-                merged_transitions.append(transition_accumulator)
-                transition_accumulator = transition
-        # append the last transition
-        merged_transitions.append(transition_accumulator)
-        
-        group_index_list = [group_index] if not isinstance(group_index, tuple) else group_index
-
-        for cross_section_number, each_transition in enumerate(merged_transitions):
-            for child_name, child_data in each_transition.tree.iter_leaf_data():
-                for child_data_sub in child_data:
-                    output_rows.append([
-                        group_counter,
-                        cross_section_number,
-                        *group_index_list,
-                        *child_name,
-                        each_transition.measure_true_from,
-                        each_transition.measure_true_to,
-                        each_transition.measure_slk_from,
-                        each_transition.measure_slk_to,
-                        *child_data_sub
-                    ])
+    group_table, cross_section_table = _cross_sections_tables(
+        segmentation             = segmentation,
+        group_categories         = group_categories,
+        cross_section_categories = cross_section_categories,
+        measure_slk              = measure_slk,
+        measure_true             = measure_true,
+        n_jobs                   = n_jobs,
+        executor                 = executor,
+        measure_decimals         = measure_decimals,
+        validate                 = validate,
+    )
+
+    # repeat the group table columns for each row of the cross section table
+    num_group_categories         = len(group_categories)
+    num_cross_section_categories = len(cross_section_categories)
+    group_rows = group_table.take(np.searchsorted(
+        group_table.iloc[:, 0].to_numpy(),
+        cross_section_table.iloc[:, 0].to_numpy(),
+    )).reset_index(drop=True)
+    result = pd.concat(
+        [
+            cross_section_table.iloc[:, :1],
+            group_rows.iloc[:, 1:1+num_group_categories],
+            cross_section_table.iloc[:, 1:1+num_cross_section_categories],
+            group_rows.iloc[:, 1+num_group_categories:],
+            cross_section_table.iloc[:, 1+num_cross_section_categories:],
+        ],
+        axis="columns",
+    )
+    result.columns = [
+        out_col_name_cross_section_number,
+        *group_categories,
+        *cross_section_categories,
+        *measure_true,
+        *measure_slk,
+        out_col_name_original_index,
+        out_col_name_overlap
+    ]
+    return result
+
+
+def _cross_sections_tables(
+        segmentation:             Union[pd.DataFrame, NetworkIndex],
+        group_categories:         list[str],
+        cross_section_categories: list[str],
+        measure_slk:              tuple[str,str],
+        measure_true:             tuple[str,str],
+        n_jobs:                   int,
+        executor:                 Optional[Executor],
+        measure_decimals:         Optional[int],
+        validate:                 str,
+    ) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Returns the group table and cross section table described in `cross_sections_normalised()`, but with
+    positional column labels, since `measure_slk` and `measure_true` are allowed to refer to the same columns:
+
+    - group table: `[cross_section_number, *group_categories, *measure_true, *measure_slk]`
+    - cross section table: `[cross_section_number, *cross_section_categories, original_index, overlap]`
+
+    The group table is sorted by `cross_section_number`.
+    """
+
+    if n_jobs == 0 or n_jobs < -1:
+        raise ValueError(f"n_jobs must be a positive integer or -1, got {n_jobs}")
+
+    check_validate_level(validate)
+    data = network_data(segmentation)
+    all_categories = [*group_categories, *cross_section_categories]
+    run_check(validate, data, "check_linear_index", list(measure_slk),  lambda: check_linear_index(data[list(measure_slk)]))
+    run_check(validate, data, "check_linear_index", list(measure_true), lambda: check_linear_index(data[list(measure_true)]))
+    run_check(
+        validate, data, "check_linear_index_is_ordered_and_disjoint", [*all_categories, *measure_true],
+        lambda: check_linear_index_is_ordered_and_disjoint(segmentation, measure_true, all_categories),
+    )
     
-    result = pd.DataFrame(
-        data=output_rows,
-        columns=[
-            CN.group_number,
-            out_col_name_cross_section_number,
-            *group_categories,
-            *cross_section_categories,
-            *measure_true,
-            *measure_slk,
-            out_col_name_original_index,
-            out_col_name_overlap
-        ]
+    if isinstance(segmentation, NetworkIndex) and segmentation.is_grouped_by(group_categories):
+        groups = list(segmentation.groups())
+    else:
+        # for group_index, group in segmentation.groupby(group_categories):
+        # TODO: Triggers useless future warning: if len(group_categories) == 1 then group_index will yield a length 1 tuple instead of a string.
+        # To suppress the warning we can do something yuck:
+        groups = list(network_data(segmentation).groupby(group_categories[0] if len(group_categories)==1 else group_categories))
+
+    process_groups = partial(
+        _cross_sections_of_groups,
+        group_categories         = group_categories,
+        cross_section_categories = cross_section_categories,
+        measure_slk              = measure_slk,
+        measure_true             = measure_true,
+        measure_decimals         = measure_decimals,
+    )
+
+    if executor is None and n_jobs == 1:
+        chunk_results = [process_groups(groups)]
+    else:
+        # several chunks per worker helps to even out the load when group sizes vary
+        num_workers = n_jobs if n_jobs > 0 else (os.cpu_count() or 1)
+        group_chunks = _chunk_groups_by_size(groups, num_chunks=4 * num_workers)
+        if executor is not None:
+            chunk_results = list(executor.map(process_groups, group_chunks))
+        else:
+            with ProcessPoolExecutor(max_workers=num_workers) as process_pool:
+                chunk_results = list(process_pool.map(process_groups, group_chunks))
+
+    # results are concatenated in group order, so numbering is identical regardless of how the work was split up
+    group_results = [group_result for chunk_result in chunk_results for group_result in chunk_result]
+
+    # cross section numbers start from zero in each group; offset them so that they are unique.
+    # Each group consumes numbers up to its last cross section which has at least one lane.
+    group_table_lengths         = np.array([len(group_columns[0])         for group_columns, _         in group_results], dtype=np.int64)
+    cross_section_table_lengths = np.array([len(cross_section_columns[0]) for _, cross_section_columns in group_results], dtype=np.int64)
+    group_num_cross_sections    = np.array([
+        group_columns[0][-1] + 1 if len(group_columns[0]) > 0 else 0
+        for group_columns, _ in group_results
+    ], dtype=np.int64)
+    group_offsets = np.cumsum(group_num_cross_sections) - group_num_cross_sections
+
+    group_table = _columns_to_dataframe(
+        [group_columns for group_columns, _ in group_results],
+        num_columns = 5 + len(group_categories),
     )
+    group_table[0] += np.repeat(group_offsets, group_table_lengths)
 
-    result.loc[:,out_col_name_cross_section_number] = (
-        result.loc[:,out_col_name_cross_section_number]
-        +
-        result[[CN.group_number]].join(
-            (result.groupby(CN.group_number)[out_col_name_cross_section_number].max()+1).cumsum().shift(1, fill_value=0),
-            on=CN.group_number
-        ).loc[:,out_col_name_cross_section_number]
+    cross_section_table = _columns_to_dataframe(
+        [cross_section_columns for _, cross_section_columns in group_results],
+        num_columns = 3 + len(cross_section_categories),
     )
+    cross_section_table[0] += np.repeat(group_offsets, cross_section_table_lengths)
 
-    return result.drop(columns=[CN.group_number])
+    return group_table, cross_section_table
+
+
+def _columns_to_dataframe(column_lists:list[list[Union[np.ndarray, list]]], num_columns:int) -> pd.DataFrame:
+    """
+    Concatenates the columns returned by each group into a dataframe with positional column labels.
+    numpy arrays are concatenated, other columns are treated as lists of python objects.
+    """
+    columns = {}
+    for column_number in range(num_columns):
+        parts = [group_columns[column_number] for group_columns in column_lists]
+        if len(parts) > 0 and all(isinstance(part, np.ndarray) for part in parts):
+            columns[column_number] = np.concatenate(parts)
+        else:
+            columns[column_number] = pd.Series([item for part in parts for item in part])
+    return pd.DataFrame(columns)
+
+
+def _cross_sections_of_group(
+        group_index:              Any,
+        group:                    pd.DataFrame,
+        group_categories:         list[str],
+        cross_section_categories: list[str],
+        measure_slk:              tuple[str,str],
+        measure_true:             tuple[str,str],
+        measure_decimals:         Optional[int] = None,
+    ) -> tuple[list, list]:
+    """
+    Computes the cross sections for a single group of `group_categories`.
+    Returns the columns of the group table and the columns of the cross section table for this group
+    (see `_cross_sections_tables()`); cross section numbers start from zero in each group.
+    """
+    
+    group = group[[*group_categories, *cross_section_categories, *measure_true, *measure_slk]]#.reset_index(drop=True)
+    if measure_decimals is not None:
+        # all event arithmetic below is done in exact integers; measures are converted back to floats on output.
+        # Each from / to pair is converted together so that both share the (often int32) dtype chosen by `to_fixed_point`;
+        # only differences of measures, and sums of overlaps within one row, are computed from them
+        group = group.assign(**{
+            column: fixed_point_measure[:, number]
+            for measure in (measure_true, measure_slk)
+            for fixed_point_measure in [to_fixed_point(group[list(measure)].to_numpy(), measure_decimals)]
+            for number, column in enumerate(measure)
+        })
+
+    # capture segment start events, sort ascending
+    start_events: pd.DataFrame = group.copy().sort_values(by=cross_section_categories, ascending=True)
+    start_events[CN.event_measure_true] = start_events[measure_true[0]]
+    start_events[CN.event_measure_slk]  = start_events[measure_slk[0]]
+    start_events[CN.event_type]         = "start"
+    start_events[CN.event_effect]       = +1
+    # capture segment end events, sort decending
+    end_events: pd.DataFrame = group.copy().sort_values(by=cross_section_categories, ascending=False)
+    end_events[CN.event_measure_true] = end_events[measure_true[1]]
+    end_events[CN.event_measure_slk]  = end_events[measure_slk[1]]
+    end_events[CN.event_type]         = "end"
+    end_events[CN.event_effect]       = -1
+
+    # combine start and end events and sort using stable sort
+    events:pd.DataFrame = pd.concat([end_events, start_events], axis='index')
+    events = events.sort_values(by=CN.event_measure_true, kind="stable")
+    # the cumulative sum of event_effect and the
+    events[CN.event_effect_cumsum] = events[CN.event_effect].cumsum()
+
+    # this next line changes the dtype
+    #events["event_measure_diff"] = events["event_measure"].diff().fillna(0)
+    # this next version avoids changing the dtype, but has a different value for the first row;
+    # But It turns out this doesnt matter since we only look at this column [1:]
+    #events[CN.event_measure_diff] = events[CN.event_measure_true] - events[CN.event_measure_true].shift(1, fill_value=0)
+    events[CN.event_measure_diff] = events[CN.event_measure_true] - events[CN.event_measure_true].shift(1, fill_value=events[CN.event_measure_true].iloc[0])
+
+    # use a special tree stack type to build up list of transitions
+    # each transition occurs when the cross section changes
+    # ImmutableTree is persistent, so each version in `past_trees` shares all unchanged nodes with the previous version
+    past_trees = []
+    current_tree = ImmutableTree()
+    for index, csc, event_type in zip(
+        events.index,
+        events[cross_section_categories].itertuples(index=False, name=None),
+        events[CN.event_type],
+    ):
+        if event_type=="start":
+            current_tree = current_tree.add_data(csc, Addable([(index, 1)]))
+            past_trees.append(current_tree)
+        elif event_type=="end":
+            current_tree = current_tree.remove_data(csc, Addable([(index, 1)]))
+            past_trees.append(current_tree)
+    events[CN.event_trees] = past_trees
+
+    # pair down transitions such that we only capture non-zero length cross-sections;
+    # transition `i` spans from event `transition_start[i]` to event `transition_end[i]`
+    event_measure_true = events[CN.event_measure_true].to_numpy()
+    event_measure_slk  = events[CN.event_measure_slk ].to_numpy()
+    transition_end     = np.flatnonzero(events[CN.event_measure_diff].to_numpy()[1:] > 0) + 1
+    transition_start   = transition_end - 1
+    # NOTE: The selection of `measure_slk_from` and `measure_slk_to` below are
+    #       wrong, but impossible to fix; if we take a cross section over two carriageways
+    #       (or two datasets) (where the SLK system is different), then it is not possible to guarantee
+    #       1) that we have selected a coherent SLK `from` and `to`. Maybe `from` > `to`?
+    #       2) that points of equation are correctly handled.
+    #       We can at least guarantee that the selected SLKs DO EXIST as we are not interpolating between SLKs.
+
+    # The lanes active during each transition are the leaves of the tree just after its first event.
+    # Each transition is reduced to a hashable signature; the set of cross section category paths.
+    # Consecutive transitions with the same signature belong to the same cross section.
+    transition_leaves = [
+        [(tuple(child_name), child_data) for child_name, child_data in past_trees[event_number].iter_leaf_data()]
+        for event_number in transition_start
+    ]
+    transition_signature_codes, _ = pd.factorize(pd.Series(
+        [frozenset(path for path, _ in leaves) for leaves in transition_leaves],
+        dtype=object
+    ))
+    transition_is_new_cross_section = np.ones(len(transition_end), dtype=bool)
+    transition_is_new_cross_section[1:] = transition_signature_codes[1:] != transition_signature_codes[:-1]
+    transition_cross_section = np.cumsum(transition_is_new_cross_section) - 1
+
+    cross_section_first_transition = np.flatnonzero(transition_is_new_cross_section)
+    cross_section_last_transition  = np.append(cross_section_first_transition[1:] - 1, len(transition_end) - 1)
+    cross_section_measure_true_from = event_measure_true[transition_start[cross_section_first_transition]]
+    cross_section_measure_true_to   = event_measure_true[transition_end  [cross_section_last_transition ]]
+    cross_section_measure_slk_from  = event_measure_slk [transition_start[cross_section_first_transition]]
+    cross_section_measure_slk_to    = event_measure_slk [transition_end  [cross_section_last_transition ]]
+
+    # collect one overlap for each original row in each transition.
+    # within each cross section, paths are ranked in the order they appear in the first transition
+    cross_section_paths:list[list[tuple]] = []
+    overlap_cross_section = []
+    overlap_path_rank     = []
+    overlap_index         = []
+    overlap_length        = []
+    for transition_number, leaves in enumerate(transition_leaves):
+        if transition_is_new_cross_section[transition_number]:
+            cross_section_paths.append([path for path, _ in leaves])
+            path_rank = {path:rank for rank, (path, _) in enumerate(leaves)}
+        transition_length = (
+              event_measure_true[transition_end  [transition_number]]
+            - event_measure_true[transition_start[transition_number]]
+        )
+        for path, child_data in leaves:
+            for original_index, _count in child_data:
+                overlap_cross_section.append(transition_cross_section[transition_number])
+                overlap_path_rank    .append(path_rank[path])
+                overlap_index        .append(original_index)
+                overlap_length       .append(transition_length)
+    # sum the overlaps for each original row in each cross section
+    overlaps = (
+        pd.DataFrame({
+            "cross_section": overlap_cross_section,
+            "path_rank":     overlap_path_rank,
+            "index":         pd.Series(overlap_index, dtype=object),
+            "length":        overlap_length,
+        })
+        .groupby(["cross_section", "path_rank", "index"], sort=True)["length"]
+        .sum()
+    )
+
+    # only cross sections which contain at least one lane appear in the output
+    overlap_cross_section_number = overlaps.index.get_level_values("cross_section").to_numpy()
+    overlap_path_rank            = overlaps.index.get_level_values("path_rank").to_numpy()
+    output_cross_section_number  = np.unique(overlap_cross_section_number)
+    overlap_paths = [
+        cross_section_paths[cross_section_number][path_rank]
+        for cross_section_number, path_rank
+        in zip(overlap_cross_section_number, overlap_path_rank)
+    ]
+
+    group_index_list = [group_index] if not isinstance(group_index, tuple) else group_index
+
+    overlap_length = overlaps.to_numpy()
+    if measure_decimals is not None:
+        (
+            cross_section_measure_true_from,
+            cross_section_measure_true_to,
+            cross_section_measure_slk_from,
+            cross_section_measure_slk_to,
+            overlap_length,
+        ) = (
+            from_fixed_point(measure, measure_decimals)
+            for measure in (
+                cross_section_measure_true_from,
+                cross_section_measure_true_to,
+                cross_section_measure_slk_from,
+                cross_section_measure_slk_to,
+                overlap_length,
+            )
+        )
+
+    group_columns = [
+        output_cross_section_number,
+        *([group_index_value] * len(output_cross_section_number) for group_index_value in group_index_list),
+        cross_section_measure_true_from[output_cross_section_number],
+        cross_section_measure_true_to  [output_cross_section_number],
+        cross_section_measure_slk_from [output_cross_section_number],
+        cross_section_measure_slk_to   [output_cross_section_number],
+    ]
+    cross_section_columns = [
+        overlap_cross_section_number,
+        *([path[level] for path in overlap_paths] for level in range(len(cross_section_categories))),
+        overlaps.index.get_level_values("index").tolist(),
+        overlap_length,
+    ]
+    return group_columns, cross_section_columns
+
+
+def _cross_sections_of_groups(
+        groups:                   list[tuple[Any, pd.DataFrame]],
+        group_categories:         list[str],
+        cross_section_categories: list[str],
+        measure_slk:              tuple[str,str],
+        measure_true:             tuple[str,str],
+        measure_decimals:         Optional[int] = None,
+    ) -> list[tuple[list, list]]:
+    """
+    Computes the cross sections for a chunk of groups; `groups` is a list of `(group_index, group)`.
+    This is a module level function so that it can be sent to a worker process.
+    """
+    return [
+        _cross_sections_of_group(
+            group_index              = group_index,
+            group                    = group,
+            group_categories         = group_categories,
+            cross_section_categories = cross_section_categories,
+            measure_slk              = measure_slk,
+            measure_true             = measure_true,
+            measure_decimals         = measure_decimals,
+        )
+        for group_index, group in groups
+    ]
+
+
+def _chunk_groups_by_size(groups:list[tuple[Any, pd.DataFrame]], num_chunks:int) -> list[list[tuple[Any, pd.DataFrame]]]:
+    """
+    Splits `groups` into at most `num_chunks` contiguous chunks containing a similar number of rows.
+    Chunks are contiguous so that results can be concatenated back in the original group order.
+    """
+    group_sizes = np.array([len(group.index) for _, group in groups], dtype=np.int64)
+    boundaries = np.searchsorted(
+        np.cumsum(group_sizes),
+        np.linspace(0, group_sizes.sum(), num_chunks + 1)[1:-1],
+        side="right"
+    )
+    return [
+        groups[chunk_start:chunk_end]
+        for chunk_start, chunk_end
+        in zip([0, *boundaries], [*boundaries, len(groups)])
+        if chunk_end > chunk_start
+    ]
 
 
 def cross_sections_normalised(
-        segmentation:                      pd.DataFrame,
+        segmentation:                      Union[pd.DataFrame, NetworkIndex],
         group_categories:                  list[str],
         cross_section_categories:          list[str],
         measure_slk:                       tuple[str,str],
@@ -184,6 +434,10 @@ def cross_sections_normalised(
         out_col_name_cross_section_number: str = "cross_section_number",
         out_col_name_original_index:       str = "original_index",
         out_col_name_overlap:              str = "overlap",
+        n_jobs:                            int = 1,
+        executor:                          Optional[Executor] = None,
+        measure_decimals:                  Optional[int] = None,
+        validate:                          str = "full",
     ):
     """
     Takes a `segmentation` dataframe and returns a tuple of two dataframes 
@@ -317,33 +571,53 @@ def cross_sections_normalised(
     cross_sections_aggregated = cross_sections_with_original_columns.groupby("cross_section_number").aggregate(...)
     result = group_table.join(cross_sections_aggregated, on="cross_section_number")
     ```
+
+    `segmentation` may be a `NetworkIndex`; if it is grouped by `group_categories`
+    its grouping is reused.
+
+    Groups are independent of each other, so the work can be spread across
+    several processes. `n_jobs` sets the number of worker processes (`-1` uses
+    all CPUs), or an existing `concurrent.futures.Executor` can be passed as
+    `executor`. Groups are dealt out in contiguous chunks of similar row count,
+    and the results are combined in group order, so `cross_section_number` is
+    identical to the single process result.
+
+    `measure_decimals` enables an opt-in fixed point mode; measures are converted to
+    integer units of `10**-measure_decimals` (eg `6` for millimetres when measures are
+    in kilometres), cross sections and overlaps are computed in exact integer arithmetic,
+    and the results are converted back to floats.
+
+    `validate="full"` (default) checks `segmentation` on every call. With `validate="fast"`
+    the checks are skipped if `segmentation` has been passed to `mark_validated()` with the same
+    categories and measures. `validate="none"` skips the checks.
     """
 
 
 
-    result = cross_sections(
-        segmentation                      = segmentation,
-        group_categories                  = group_categories,
-        cross_section_categories          = cross_section_categories,
-        measure_slk                       = measure_slk,
-        measure_true                      = measure_true,
-        out_col_name_cross_section_number = out_col_name_cross_section_number,
-        out_col_name_original_index       = out_col_name_original_index,
-        out_col_name_overlap        = out_col_name_overlap
+    group_table, cross_section_table = _cross_sections_tables(
+        segmentation             = segmentation,
+        group_categories         = group_categories,
+        cross_section_categories = cross_section_categories,
+        measure_slk              = measure_slk,
+        measure_true             = measure_true,
+        n_jobs                   = n_jobs,
+        executor                 = executor,
+        measure_decimals         = measure_decimals,
+        validate                 = validate,
     )
     # group table (each cross section id appears once)
-    group_table = result[[
+    group_table.columns = [
         out_col_name_cross_section_number,
         *group_categories,
         *measure_true,
         *measure_slk
-    ]].drop_duplicates().reset_index(drop=True)
+    ]
     # cross section table; one row per lane per cross section id
-    cross_section_table = result[[
+    cross_section_table.columns = [
         out_col_name_cross_section_number,
         *cross_section_categories,
         out_col_name_original_index,
         out_col_name_overlap
-    ]]
+    ]
     
     return group_table, cross_section_table
\ No newline at end of file
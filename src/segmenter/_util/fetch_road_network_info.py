@@ -1,22 +1,326 @@
-from typing import Any, Optional, Dict
+from typing import Any, Optional, Dict, Iterable, Iterator, List
 import requests
+from requests.adapters import HTTPAdapter
 from urllib.parse import urlencode
+from concurrent.futures import ThreadPoolExecutor
+from json import dumps
+from datetime import datetime, timezone
 import math
+import time
 import pandas as pd
 from deprecated import deprecated
 
+from .road_network_cache import RoadNetworkCache
+
 
 DATA_SOURCE_URL = "https://mrgis.mainroads.wa.gov.au/arcgis/rest/services/OpenData/RoadAssets_DataPortal/MapServer/17/query"
 
+# pandas dtypes used for each ArcGIS field type by `iter_road_network_info`.
+# Date fields are converted from milliseconds since the epoch separately.
+ESRI_FIELD_TYPE_DTYPES = {
+    "esriFieldTypeOID":          "Int64",
+    "esriFieldTypeInteger":      "Int64",
+    "esriFieldTypeSmallInteger": "Int64",
+    "esriFieldTypeDouble":       "float64",
+    "esriFieldTypeSingle":       "float64",
+    "esriFieldTypeString":       "string",
+    "esriFieldTypeGUID":         "string",
+    "esriFieldTypeGlobalID":     "string",
+}
+
 
 @deprecated(reason="This function has been moved to another package. See https://github.com/thehappycheese/fetchopendata", version="0.5.1")
 def fetch_road_network_info(
     url:str=DATA_SOURCE_URL,
     chunk_limit:Optional[int]=None,
+    max_workers:int=1,
+    retries:int=3,
+    backoff:float=0.5,
+    cache_dir:Optional[str]=None,
+    cache_format:str="parquet",
+    edit_date_field:Optional[str]=None,
+    offline:bool=False,
     **kwargs
     ) -> Dict[str, Any]:
+    """
+    Downloads the road network from an ArcGIS MapServer layer `url`, one page at a time.
+    Extra `kwargs` are added to the query parameters.
+
+    - `chunk_limit` limits the number of pages downloaded
+    - `max_workers` is the number of pages downloaded concurrently. When greater than `1`,
+      the first page is used to discover the server's page size, then the offsets of all
+      remaining pages are computed from the record count and fetched on a thread pool.
+      Pages are reassembled in order, so the result is the same as a sequential download.
+    - `retries` is the number of times a failed request is retried, waiting
+      `backoff * 2**attempt` seconds before each retry.
+    - `cache_dir` enables an on-disk cache of the result, keyed by `url`, the query parameters
+      and `chunk_limit`. The cached result is re-used when the record count reported by the
+      server is unchanged, and, if `edit_date_field` is given, the maximum value of that field is
+      also unchanged. `cache_format` is `"parquet"` (default), `"feather"` (both require `pyarrow`)
+      or `"pickle"`.
+    - `offline=True` returns the cached result without contacting the server, and raises
+      `FileNotFoundError` if there is none.
+
+    See also `iter_road_network_info()` which yields one dataframe per page.
+    """
+
+    if max_workers < 1:
+        raise ValueError(f"max_workers must be at least 1, got {max_workers}")
+    if offline and cache_dir is None:
+        raise ValueError("offline=True requires a cache_dir")
+
+    query_params = _road_network_query_params(**kwargs)
+
+    cache = None
+    if cache_dir is not None:
+        cache = RoadNetworkCache(cache_dir, url, query_params | {"chunk_limit":chunk_limit}, cache_format=cache_format)
+        if offline:
+            return cache.read()
+
+    with _road_network_session(max_workers) as session:
+
+        record_count = _get_json(session, url, query_params | {"returnCountOnly":True}, retries=retries, backoff=backoff)["count"]
+
+        if cache is not None:
+            freshness = {"count":record_count}
+            if edit_date_field is not None:
+                freshness["max_edit_date"] = _get_json(session, url, query_params | {"outStatistics":dumps([{
+                    "statisticType":         "max",
+                    "onStatisticField":      edit_date_field,
+                    "outStatisticFieldName": "MAX_EDIT_DATE",
+                }])}, retries=retries, backoff=backoff)["features"][0]["attributes"]["MAX_EDIT_DATE"]
+            if cache.read_freshness() == freshness:
+                print(f"Using cached copy of {record_count} records")
+                return cache.read()
+
+        print(f"Downloading {record_count} records" + (":" if chunk_limit is None else f", chunk_limit={chunk_limit}:"))
+
+        ASSUMED_CHUNK_SIZE = 1000
+        if chunk_limit is not None:
+            print("." * min(chunk_limit, math.floor(record_count/ASSUMED_CHUNK_SIZE)))
+        else:
+            print("." * math.floor(record_count/ASSUMED_CHUNK_SIZE))
+
+        output=[]
+        for json in _iter_pages(
+            session,
+            url,
+            query_params,
+            record_count = record_count,
+            chunk_limit  = chunk_limit,
+            max_workers  = max_workers,
+            retries      = retries,
+            backoff      = backoff,
+        ):
+            output.extend(json["features"])
+            print(".", end="")
+
+    print(f"\nDownload Completed. received {len(output)} records")
+
+    result = _features_to_dataframe(output)
+
+    if cache is not None:
+        cache.write(result, freshness)
+
+    return result
+
+
+def sync_road_network_info(
+    snapshot_dir:str,
+    url:str=DATA_SOURCE_URL,
+    road_field:str="ROAD",
+    edit_date_field:Optional[str]=None,
+    cache_format:str="parquet",
+    max_workers:int=1,
+    retries:int=3,
+    backoff:float=0.5,
+    roads_per_request:int=100,
+    **kwargs
+    ) -> pd.DataFrame:
+    """
+    Keeps a local snapshot of the road network in `snapshot_dir` up to date by downloading only the roads which changed.
+    The first call downloads everything. Returns the updated snapshot, in the same format as `fetch_road_network_info()`,
+    sorted by `road_field` (the original server order is kept within each road).
+
+    A road is downloaded again if
+
+    - its record count reported by the server differs from the snapshot
+      (a `groupByFieldsForStatistics` query, paged like the records), which catches added and deleted records, or
+    - `edit_date_field` is given, and one of its records was edited since the previous sync
+      (a `where` clause on `edit_date_field` returning distinct values of `road_field`).
+      The watermark is the maximum edit date observed at the start of the previous sync.
+
+    Changed roads are downloaded with a `road_field IN (...)` `where` clause, `roads_per_request` roads at a time,
+    and replace the snapshot rows for those roads. Any `where` passed in `kwargs` is combined with these clauses.
+    Other arguments are the same as for `fetch_road_network_info()`.
+    """
+    if max_workers < 1:
+        raise ValueError(f"max_workers must be at least 1, got {max_workers}")
+
+    query_params = _road_network_query_params(**kwargs)
+    snapshot = RoadNetworkCache(snapshot_dir, url, query_params | {"sync_by":road_field}, cache_format=cache_format)
+    previous_freshness = snapshot.read_freshness()
+
+    with _road_network_session(max_workers) as session:
+
+        def get_json(extra_params:Dict[str, Any]) -> Dict[str, Any]:
+            return _get_json(session, url, query_params | extra_params, retries=retries, backoff=backoff)
+
+        def download(where:str) -> pd.DataFrame:
+            where_params = query_params | {"where":_and_where(query_params["where"], where)}
+            record_count = None
+            if max_workers > 1:
+                record_count = _get_json(session, url, where_params | {"returnCountOnly":True}, retries=retries, backoff=backoff)["count"]
+            features = []
+            for json in _iter_pages(
+                session,
+                url,
+                where_params,
+                record_count = record_count,
+                chunk_limit  = None,
+                max_workers  = max_workers,
+                retries      = retries,
+                backoff      = backoff,
+            ):
+                features.extend(json["features"])
+            return _features_to_dataframe(features)
+
+        # the watermark is read before anything is downloaded, so edits made during the sync are picked up next time
+        freshness = {}
+        if edit_date_field is not None:
+            freshness["max_edit_date"] = get_json({"outStatistics":dumps([{
+                "statisticType":         "max",
+                "onStatisticField":      edit_date_field,
+                "outStatisticFieldName": "MAX_EDIT_DATE",
+            }])})["features"][0]["attributes"]["MAX_EDIT_DATE"]
+
+        if previous_freshness is None:
+            print("No snapshot found, downloading all roads")
+            result = download("1=1")
+        else:
+            result = snapshot.read()
+
+            # the server returns at most one page of groups per request, so roads beyond the first page are fetched with `resultOffset`
+            road_count_params = {
+                "outStatistics":dumps([{
+                    "statisticType":         "count",
+                    "onStatisticField":      road_field,
+                    "outStatisticFieldName": "RECORD_COUNT",
+                }]),
+                "groupByFieldsForStatistics":road_field,
+                "orderByFields":             road_field,
+            }
+            server_road_counts = pd.Series({
+                feature["attributes"][road_field]: feature["attributes"]["RECORD_COUNT"]
+                for json in _iter_pages(
+                    session,
+                    url,
+                    query_params | road_count_params,
+                    record_count = None,
+                    chunk_limit  = None,
+                    max_workers  = 1,
+                    retries      = retries,
+                    backoff      = backoff,
+                )
+                for feature in json["features"]
+            }, dtype="int64")
+            snapshot_road_counts = result[road_field].value_counts() if len(result.index) > 0 else pd.Series(dtype="int64")
+            road_counts = pd.concat([server_road_counts, snapshot_road_counts], axis="columns").fillna(0)
+            changed_roads = set(road_counts.index[road_counts.iloc[:, 0] != road_counts.iloc[:, 1]])
+
+            watermark = previous_freshness.get("max_edit_date")
+            if edit_date_field is not None and watermark is not None:
+                # ArcGIS timestamp literals have a resolution of one second; round down so no edit is missed
+                watermark_text = datetime.fromtimestamp(watermark // 1000, tz=timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+                edited_road_params = {
+                    "where":                _and_where(query_params["where"], f"{edit_date_field} > timestamp '{watermark_text}'"),
+                    "outFields":            road_field,
+                    "returnDistinctValues": True,
+                }
+                for json in _iter_pages(
+                    session,
+                    url,
+                    query_params | edited_road_params,
+                    record_count = None,
+                    chunk_limit  = None,
+                    max_workers  = 1,
+                    retries      = retries,
+                    backoff      = backoff,
+                ):
+                    changed_roads.update(feature["attributes"][road_field] for feature in json["features"])
 
-    query_params = {
+            changed_roads = sorted(changed_roads)
+            print(f"Updating {len(changed_roads)} changed roads")
+            updated_roads = [
+                download(_in_where(road_field, changed_roads[batch_start:batch_start + roads_per_request]))
+                for batch_start in range(0, len(changed_roads), roads_per_request)
+            ]
+            result = pd.concat(
+                [
+                    result[~result[road_field].isin(changed_roads)],
+                    *(updated_road for updated_road in updated_roads if len(updated_road.index) > 0),
+                ],
+                axis="index",
+            )
+
+    result = result.sort_values(road_field, kind="stable").reset_index(drop=True)
+    snapshot.write(result, freshness)
+    return result
+
+
+def iter_road_network_info(
+    url:str=DATA_SOURCE_URL,
+    chunk_limit:Optional[int]=None,
+    max_workers:int=1,
+    retries:int=3,
+    backoff:float=0.5,
+    **kwargs
+    ) -> Iterator[pd.DataFrame]:
+    """
+    Downloads the road network from an ArcGIS MapServer layer `url` and yields one dataframe per page,
+    so that the whole download never needs to be held in memory as json.
+    Arguments are the same as for `fetch_road_network_info()`.
+
+    Each dataframe is built directly from the `attributes` of each feature. When the server reports the
+    layer's `fields`, every page has the same columns and dtypes (see `ESRI_FIELD_TYPE_DTYPES`), even if it is empty.
+    Date fields become `datetime64` columns.
+
+    Use `concat_road_network_pages()` to combine the pages into a single dataframe.
+    """
+    if max_workers < 1:
+        raise ValueError(f"max_workers must be at least 1, got {max_workers}")
+
+    query_params = _road_network_query_params(**kwargs)
+
+    with _road_network_session(max_workers) as session:
+        record_count = None
+        if max_workers > 1:
+            record_count = _get_json(session, url, query_params | {"returnCountOnly":True}, retries=retries, backoff=backoff)["count"]
+        for json in _iter_pages(
+            session,
+            url,
+            query_params,
+            record_count = record_count,
+            chunk_limit  = chunk_limit,
+            max_workers  = max_workers,
+            retries      = retries,
+            backoff      = backoff,
+        ):
+            yield _page_to_dataframe(json)
+
+
+def concat_road_network_pages(pages:Iterable[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Concatenates the pages yielded by `iter_road_network_info()` into a single dataframe with a fresh `RangeIndex`
+    """
+    pages = list(pages)
+    if len(pages) == 0:
+        return pd.DataFrame()
+    return pd.concat(pages, axis="index", ignore_index=True)
+
+
+def _road_network_query_params(**kwargs) -> Dict[str, Any]:
+    return {
         "where":"1=1",
         "outFields":",".join({"ROAD", "START_SLK", "END_SLK", "CWY", "NETWORK_TYPE", "START_TRUE_DIST", "END_TRUE_DIST", "RA_NO"}),
         "outSR":4326,
@@ -25,49 +329,133 @@ def fetch_road_network_info(
         **kwargs
     }
 
-    response = requests.request("GET", f"{url}?"+urlencode(query_params | {"returnCountOnly":True}))
-    record_count = response.json()["count"]
 
-    print(f"Downloading {record_count} records" + (":" if chunk_limit is None else f", chunk_limit={chunk_limit}:"))
+def _features_to_dataframe(features:List[Dict[str, Any]]) -> pd.DataFrame:
+    result = pd.json_normalize(features)
+    result.columns = [c.replace("attributes.", "") for c in result.columns]
+    return result
+
 
-    ASSUMED_CHUNK_SIZE = 1000
-    if chunk_limit is not None:
-        print("." * min(chunk_limit, math.floor(record_count/ASSUMED_CHUNK_SIZE)))
-    else:
-        print("." * math.floor(record_count/ASSUMED_CHUNK_SIZE))
+def _and_where(*clauses:str) -> str:
+    clauses = [clause for clause in clauses if clause != "1=1"]
+    if len(clauses) == 0:
+        return "1=1"
+    return " AND ".join(f"({clause})" for clause in clauses)
+
+
+def _in_where(field:str, values:List[Any]) -> str:
+    quoted_values = ",".join(
+        "'" + value.replace("'", "''") + "'" if isinstance(value, str) else str(value)
+        for value in values
+    )
+    return f"{field} IN ({quoted_values})"
+
+
+def _road_network_session(max_workers:int) -> requests.Session:
+    session = requests.Session()
+    # one connection per worker thread is kept open and reused
+    session.mount("http://",  HTTPAdapter(pool_maxsize=max_workers))
+    session.mount("https://", HTTPAdapter(pool_maxsize=max_workers))
+    return session
+
+
+def _iter_pages(
+        session:requests.Session,
+        url:str,
+        query_params:Dict[str, Any],
+        record_count:Optional[int],
+        chunk_limit:Optional[int],
+        max_workers:int,
+        retries:int,
+        backoff:float,
+    ) -> Iterator[Dict[str, Any]]:
+    """
+    Yields the json response for each page of the query, in order.
+
+    When `max_workers > 1`, the first page reveals how many records the server returns per page,
+    then the offsets of the remaining pages are computed from `record_count`, and fetched on a thread pool.
+    If more records exist than `record_count` suggested, the remainder are fetched one page at a time.
+    """
+
+    def fetch_page(offset:int) -> Dict[str, Any]:
+        return _get_json(session, url, {"resultOffset":offset} | query_params, retries=retries, backoff=backoff)
 
-    output=[]
     offset = 0
     chunk_counter = 0
+    download_complete = False
 
-    while True:
+    if max_workers > 1 and (chunk_limit is None or chunk_limit > 1):
+        chunk_counter += 1
+        json = fetch_page(offset)
+        offset += len(json["features"])
+        yield json
+        page_size = len(json["features"])
+        if json.get("exceededTransferLimit", False) and page_size > 0:
+            remaining_offsets = list(range(offset, record_count, page_size))
+            if chunk_limit is not None:
+                remaining_offsets = remaining_offsets[:chunk_limit - chunk_counter]
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                # executor.map yields pages in the order of remaining_offsets
+                for json in executor.map(fetch_page, remaining_offsets):
+                    chunk_counter += 1
+                    offset += len(json["features"])
+                    yield json
+        download_complete = not json.get("exceededTransferLimit", False)
+
+    while not download_complete:
 
         if chunk_limit is not None and chunk_counter >= chunk_limit:
             break
 
         chunk_counter += 1
 
-        response = requests.request(
-            "GET",
-             f"{url}?"
-            + urlencode(
-                {"resultOffset":offset} | query_params
-            )
-        )
+        json = fetch_page(offset)
 
-        json = response.json()
-        
         offset += len(json["features"])
-        output.extend(json["features"])
+        yield json
 
         if "exceededTransferLimit" not in json or not json["exceededTransferLimit"]:
             break
-        print(".", end="")
 
-    print(f"\nDownload Completed. received {len(output)} records")
-    json["features"] = output
 
-    result = pd.json_normalize(json, record_path="features")
-    result.columns = [c.replace("attributes.", "") for c in result.columns]
+def _page_to_dataframe(json:Dict[str, Any]) -> pd.DataFrame:
+    fields = json.get("fields", [])
+    if len(fields) == 0:
+        return pd.DataFrame.from_records([feature["attributes"] for feature in json["features"]])
+    result = pd.DataFrame.from_records(
+        [feature["attributes"] for feature in json["features"]],
+        columns = [field["name"] for field in fields],
+    )
+    for field in fields:
+        if field["type"] == "esriFieldTypeDate":
+            result[field["name"]] = pd.to_datetime(result[field["name"]], unit="ms")
+        elif field["type"] in ESRI_FIELD_TYPE_DTYPES:
+            result[field["name"]] = result[field["name"]].astype(ESRI_FIELD_TYPE_DTYPES[field["type"]])
+    return result
 
-    return result
\ No newline at end of file
+
+def _get_json(
+        session:requests.Session,
+        url:str,
+        query_params:Dict[str, Any],
+        retries:int,
+        backoff:float,
+    ) -> Dict[str, Any]:
+    """
+    GET `url` with `query_params` and return the decoded json.
+    Connection errors, HTTP error statuses and ArcGIS error responses are retried
+    up to `retries` times with exponential backoff.
+    """
+    for attempt in range(retries + 1):
+        try:
+            response = session.get(f"{url}?" + urlencode(query_params))
+            response.raise_for_status()
+            json = response.json()
+            if "error" in json:
+                # ArcGIS reports errors with a 200 status code
+                raise requests.HTTPError(f"ArcGIS server returned an error: {json['error']}", response=response)
+            return json
+        except (requests.RequestException, ValueError):
+            if attempt == retries:
+                raise
+            time.sleep(backoff * 2**attempt)
@@ -0,0 +1,29 @@
+import numpy as np
+
+
+def to_fixed_point(values, measure_decimals:int) -> np.ndarray:
+    """
+    Converts measures to integers counting units of `10**-measure_decimals`.
+    For example if measures are in kilometres, `measure_decimals=6` gives integer millimetres.
+
+    Returns `int32` when the range of the values allows it (including the difference of any two values),
+    otherwise `int64`.
+
+    Raises a `ValueError` if any value is NaN or too large to be represented exactly.
+    """
+    values = np.asarray(values, dtype="f8")
+    scaled = np.rint(values * 10**measure_decimals)
+    if np.isnan(scaled).any():
+        raise ValueError("Measures containing NaN values cannot be converted to fixed point")
+    largest = np.abs(scaled).max() if len(scaled) > 0 else 0
+    if largest >= 2**53:
+        raise ValueError(f"Measures are too large to be represented exactly with measure_decimals={measure_decimals}")
+    if 2 * largest <= np.iinfo(np.int32).max:
+        return scaled.astype(np.int32)
+    return scaled.astype(np.int64)
+
+
+def from_fixed_point(values, measure_decimals:int) -> np.ndarray:
+    """Converts integer measures created by `to_fixed_point()` back to `float64`"""
+    # dividing (rather than multiplying by 10**-measure_decimals) gives the float nearest to the exact decimal value
+    return np.asarray(values, dtype="f8") / 10**measure_decimals
@@ -0,0 +1,118 @@
+from typing import List, Tuple, Union
+import numpy as np
+import pandas as pd
+
+from .network_index import NetworkIndex, network_data
+from .searchsorted_by_group import searchsorted_by_group
+
+
+def interval_join(
+        left:Union[pd.DataFrame, NetworkIndex],
+        right:Union[pd.DataFrame, NetworkIndex],
+        categories:List[str],
+        measure:Tuple[str,str],
+        how:str="inner",
+        min_overlap:float=0,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Finds every pair of a row of `left` and a row of `right` which overlap within the same values of `categories`.
+
+    Two rows overlap when their open intervals `(measure[0], measure[1])` intersect;
+    touching rows (eg `[1,2]` and `[2,3]`) do not overlap, and rows which are zero length,
+    reversed or NaN never overlap anything. Missing category values match each other (as in `pandas.merge`).
+    Pairs which overlap by less than `min_overlap` are dropped.
+
+    `right` is sorted by `[*categories, measure[0]]` once, and all rows of `left` are then located
+    in it together by a merge sweep (see `searchsorted_by_group()`); `right` may overlap itself.
+    The cost is O((n + m) log(n + m)) plus O(1) per candidate pair.
+    `right` may be a `NetworkIndex`; if it is sorted by `categories` and `measure[0]` its sort order is reused.
+
+    Returns `(left_position, right_position, overlap_length)`, three arrays with one entry per pair where
+    - `left_position` / `right_position` are integer positions (for use with `.iloc[]` / `.take()`) in `left` / `right`
+    - `overlap_length` is the length of the intersection of the two rows
+
+    Pairs are ordered by `left_position`, then by the start of the `right` row.
+    With `how="left"` every row of `left` with no overlap also gets one entry, with a `right_position` of `-1` and an
+    `overlap_length` of `NaN` (`right_data.reset_index(drop=True).reindex(right_position)` gives missing values for those rows).
+
+    ```python
+    left_position, right_position, overlap_length = interval_join(segments, surfaces, ["road", "cwy"], ("true_from", "true_to"), how="left")
+    joined = segments.take(left_position).reset_index(drop=True)
+    joined["surface"] = surfaces["surface"].reset_index(drop=True).reindex(right_position).to_numpy()
+    joined["overlap_length"] = overlap_length
+    ```
+    """
+    if how not in ("inner", "left"):
+        raise ValueError(f"how must be 'inner' or 'left', got {how!r}")
+    if not min_overlap >= 0:
+        raise ValueError(f"min_overlap must not be negative, got {min_overlap}")
+    left_data  = network_data(left)
+    right_data = network_data(right)
+    left_group, right_group = _shared_group_codes(left_data, right_data, categories)
+
+    left_from  = left_data [measure[0]].to_numpy(dtype="f8")
+    left_to    = left_data [measure[1]].to_numpy(dtype="f8")
+    right_from = right_data[measure[0]].to_numpy(dtype="f8")
+    right_to   = right_data[measure[1]].to_numpy(dtype="f8")
+
+    # the shared group codes follow the sorted order of the category values, like `NetworkIndex`
+    if isinstance(right, NetworkIndex) and right.is_sorted_by(categories, measure[0]):
+        right_order = right.order
+    else:
+        right_order = np.lexsort((right_from, right_group))
+    right_order = right_order[right_from[right_order] < right_to[right_order]]
+
+    sorted_group = right_group[right_order]
+    sorted_from  = right_from [right_order]
+    sorted_to    = right_to   [right_order]
+
+    # the running maximum of `sorted_to` is sorted within each group even if `right` overlaps itself,
+    # therefore every row which may overlap a row of `left` lies in the range [first_candidate, last_candidate)
+    sorted_to_running_max = pd.Series(sorted_to).groupby(sorted_group).cummax().to_numpy()
+    first_candidate = searchsorted_by_group(sorted_group, sorted_to_running_max, left_group, left_from, side="right")
+    last_candidate  = searchsorted_by_group(sorted_group, sorted_from,           left_group, left_to,   side="left" )
+    pair_count = np.where(left_from < left_to, np.maximum(last_candidate - first_candidate, 0), 0)
+
+    # expand to one entry per (left row, candidate) pair
+    pair_left = np.repeat(np.arange(len(left_from)), pair_count)
+    pair_candidate = (
+        np.repeat(first_candidate, pair_count)
+        + np.arange(len(pair_left))
+        - np.repeat(np.cumsum(pair_count) - pair_count, pair_count)
+    )
+    overlap_length = (
+          np.minimum(sorted_to  [pair_candidate], left_to  [pair_left])
+        - np.maximum(sorted_from[pair_candidate], left_from[pair_left])
+    )
+    is_pair = (overlap_length > 0) & (overlap_length >= min_overlap)
+    left_position  = pair_left                  [is_pair]
+    right_position = right_order[pair_candidate[is_pair]]
+    overlap_length = overlap_length             [is_pair]
+
+    if how == "left":
+        unmatched = np.flatnonzero(np.bincount(left_position, minlength=len(left_from)) == 0)
+        left_position  = np.concatenate([left_position, unmatched])
+        right_position = np.concatenate([right_position, np.full(len(unmatched), -1, dtype=right_position.dtype)])
+        overlap_length = np.concatenate([overlap_length, np.full(len(unmatched), np.nan)])
+        output_order   = np.argsort(left_position, kind="stable")
+        left_position  = left_position [output_order]
+        right_position = right_position[output_order]
+        overlap_length = overlap_length[output_order]
+
+    return left_position, right_position, overlap_length
+
+
+def _shared_group_codes(left:pd.DataFrame, right:pd.DataFrame, categories:List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Integer codes of the `categories` values of each row of `left` and of `right`, such that rows of either table
+    have the same code exactly when they have the same values. Codes follow the sorted order of the values,
+    and missing values sort last, as in `NetworkIndex`.
+    """
+    num_left = len(left.index)
+    group = np.zeros(num_left + len(right.index), dtype=np.int64)
+    for category in categories:
+        codes, uniques = pd.factorize(pd.concat([left[category], right[category]], ignore_index=True), sort=True)
+        codes = np.where(codes == -1, len(uniques), codes)
+        # re-factorizing after each category keeps the codes small; `sort=True` keeps them in lexicographic order
+        group, _ = pd.factorize(group * (len(uniques) + 1) + codes, sort=True)
+    return group[:num_left], group[num_left:]
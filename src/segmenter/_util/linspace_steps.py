@@ -1,3 +1,4 @@
+from typing import Tuple
 import numpy as np
 
 
@@ -59,3 +60,97 @@ def linspace_steps(measure_from: float, measure_to: float, multiples: float, min
             else:
                 result = np.append(result, [measure_to])
     return result
+
+
+def linspace_steps_batch(
+        measure_from:   np.ndarray,
+        measure_to:     np.ndarray,
+        multiples:      float,
+        minimum_length: float=0.0
+    ) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Batched version of `linspace_steps()`. Applies exactly the same rules to every
+    `(measure_from[i], measure_to[i])` pair, but without a python loop.
+
+    The results are returned in a "compressed sparse row" layout; the values for
+    interval `i` are `values[offsets[i]:offsets[i+1]]`.
+
+    Args:
+        measure_from (np.ndarray): The starting point of each list
+        measure_to (np.ndarray): The ending point of each list. Must be the same length as `measure_from`
+        multiples (float): Align items of each list to integer multiples of this value
+        minimum_length (float, optional): Optionally merge the first and last segment with the second or second-last segment respectively if they would be less than this length. Zero by default.
+    
+    Returns:
+        tuple[np.ndarray, np.ndarray]: `(values, offsets)` where `offsets` has length `len(measure_from)+1`
+
+    Example:
+
+    ```python
+    values, offsets = linspace_steps_batch(
+        measure_from   = np.array([190,    14.05]),
+        measure_to     = np.array([270.05, 14.60]),
+        multiples      = 50,
+        minimum_length = 0.1
+    )
+    assert values.tolist()  == [190, 200, 250, 270.05, 14.05, 14.60]
+    assert offsets.tolist() == [0, 4, 6]
+    ```
+    """
+    measure_from = np.asarray(measure_from, dtype="f8")
+    measure_to   = np.asarray(measure_to,   dtype="f8")
+
+    if measure_from.shape != measure_to.shape or measure_from.ndim != 1:
+        raise ValueError("measure from and measure to must be one dimensional arrays of the same length")
+
+    if (measure_from > measure_to).any():
+        raise ValueError("measure from must be less than measure to")
+
+    left  = np.ceil (measure_from / multiples)
+    right = np.floor(measure_to   / multiples)
+    num   = right - left
+
+    # number of integer multiples which lie inside each interval
+    grid_count = np.maximum(num + 1, 0).astype(np.int64)
+    empty      = grid_count == 0
+
+    # the first and last grid values are calculated exactly the same way as
+    # the elements of `(np.arange(0, num + 1) + left) * multiples` in `linspace_steps()`
+    # so that the floating point results are identical
+    grid_first = left * multiples
+    grid_last  = (np.maximum(grid_count - 1, 0) + left) * multiples
+
+    with np.errstate(invalid="ignore"):
+        first_differs = ~empty & (grid_first != measure_from)
+        first_merge   = first_differs & (np.round(grid_first - measure_from, 6) < minimum_length)
+        first_prepend = first_differs & ~first_merge
+
+        # when there is only one grid value it may already have been replaced by `measure_from`
+        grid_last     = np.where((grid_count == 1) & first_merge, measure_from, grid_last)
+        last_differs  = ~empty & (grid_last != measure_to)
+        last_merge    = last_differs & (np.round(measure_to - grid_last, 6) < minimum_length)
+        last_append   = last_differs & ~last_merge
+
+    lengths = np.where(empty, 2, grid_count + first_prepend + last_append)
+    offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+
+    values = np.empty(offsets[-1], dtype="f8")
+
+    # fill in the grid values
+    grid_start      = offsets[:-1] + first_prepend
+    grid_interval   = np.repeat(np.arange(len(grid_count)), grid_count)
+    grid_position   = np.arange(grid_count.sum()) - np.repeat(np.cumsum(grid_count) - grid_count, grid_count)
+    values[grid_start[grid_interval] + grid_position] = (grid_position + left[grid_interval]) * multiples
+
+    # apply the first / last rules
+    values[offsets[:-1][first_prepend]]                 = measure_from[first_prepend]
+    values[grid_start[first_merge]]                     = measure_from[first_merge]
+    values[(grid_start + grid_count - 1)[last_merge]]   = measure_to[last_merge]
+    values[(offsets[1:] - 1)[last_append]]              = measure_to[last_append]
+
+    # intervals with no integer multiples inside them
+    values[offsets[:-1][empty]]     = measure_from[empty]
+    values[offsets[:-1][empty] + 1] = measure_to[empty]
+
+    return values, offsets
@@ -0,0 +1,98 @@
+from typing import List, Optional, Tuple, Union
+import numpy as np
+import pandas as pd
+
+from .interval_join import _shared_group_codes
+from .network_index import NetworkIndex, network_data
+from .searchsorted_by_group import searchsorted_by_group
+
+
+def locate_points(
+        segmentation:Union[pd.DataFrame, NetworkIndex],
+        points:pd.DataFrame,
+        categories:List[str],
+        measure:Tuple[str,str],
+        point_measure:Optional[str]=None,
+    ) -> np.ndarray:
+    """
+    Finds the row of `segmentation` which contains each of `points` (eg crashes or assets given as `road`, `cwy`, `slk`).
+    `points` must have the `categories` columns and a `point_measure` column (defaults to `measure[0]`).
+
+    Returns an array with one entry per row of `points`; the integer position (for use with `.iloc[]` / `.take()`)
+    of the row of `segmentation` which contains the point, or `-1` if there is none.
+
+    Points on a boundary are located deterministically:
+    - a point where one row ends and the next row starts is located in the row which starts there
+      (rows are treated as `[measure[0], measure[1])`)
+    - a point at the end of a row which no other row starts at (eg the end of a road, or the start of a gap)
+      is located in the row which ends there
+    - points in gaps, before the first row or after the last row of their categories, or with a missing measure get `-1`
+
+    Rows of `segmentation` which are zero length, reversed or NaN are ignored.
+    Missing category values match each other.
+    `segmentation` is expected to be disjoint within each group of `categories` (see `check_linear_index_is_ordered_and_disjoint()`);
+    where rows overlap, the point is located in the row starting last at or before it if that row contains it,
+    otherwise in the earlier row which ends furthest.
+
+    `segmentation` is sorted by `[*categories, measure[0]]` once, then all points are located together with one
+    `searchsorted_by_group()`, so the cost is O((n + m) log(n + m)).
+    `segmentation` may be a `NetworkIndex`; if it is sorted by `categories` and `measure[0]` its sort order is reused.
+
+    ```python
+    crashes["segment_position"] = locate_points(segments, crashes, ["road", "cwy"], ("slk_from", "slk_to"), point_measure="slk")
+    ```
+    """
+    if point_measure is None:
+        point_measure = measure[0]
+    data = network_data(segmentation)
+    row_group, point_group = _shared_group_codes(data, points, categories)
+
+    row_from     = data[measure[0]].to_numpy(dtype="f8")
+    row_to       = data[measure[1]].to_numpy(dtype="f8")
+    point_values = points[point_measure].to_numpy(dtype="f8")
+
+    # the shared group codes follow the sorted order of the category values, like `NetworkIndex`
+    if isinstance(segmentation, NetworkIndex) and segmentation.is_sorted_by(categories, measure[0]):
+        order = segmentation.order
+    else:
+        order = np.lexsort((row_to, row_from, row_group))
+    order = order[row_from[order] < row_to[order]]
+    if len(order) == 0:
+        return np.full(len(point_values), -1, dtype=np.int64)
+
+    candidate = _locate_sorted(row_group[order], row_from[order], row_to[order], point_group, point_values)
+    return np.where(candidate >= 0, order[candidate], -1)
+
+
+def _locate_sorted(
+        sorted_group:np.ndarray,
+        sorted_from:np.ndarray,
+        sorted_to:np.ndarray,
+        query_group:np.ndarray,
+        query_values:np.ndarray,
+    ) -> np.ndarray:
+    """
+    Returns the position in the sorted arrays of the row containing each query, or `-1`, using the boundary rules of `locate_points()`.
+    Rows must be sorted by group then `sorted_from`, and must all have positive length.
+    """
+    if len(sorted_group) == 0:
+        return np.full(len(query_values), -1, dtype=np.int64)
+
+    # the last row of the same group which starts at or before each query
+    candidate = searchsorted_by_group(sorted_group, sorted_from, query_group, query_values, side="right") - 1
+    has_candidate = candidate >= 0
+    candidate = np.where(has_candidate, candidate, 0)
+
+    # where rows overlap, that row may end before the query even though an earlier row contains it;
+    # `furthest_row[i]` is the row ending furthest of the rows up to `i` in the same group
+    running_max_to = pd.Series(sorted_to).groupby(sorted_group).cummax().to_numpy()
+    furthest_row = np.maximum.accumulate(np.where(sorted_to == running_max_to, np.arange(len(sorted_to)), 0))
+    candidate = np.where(query_values <= sorted_to[candidate], candidate, furthest_row[candidate])
+
+    is_located = (
+          has_candidate
+        & (sorted_group[candidate] == query_group)
+        # a query at the end of the candidate is only reached here if no row starts at that value
+        & (query_values <= sorted_to[candidate])
+    )
+    return np.where(is_located, candidate, -1)
@@ -0,0 +1,124 @@
+from __future__ import annotations
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+import pandas
+
+from .locate_points import _locate_sorted
+
+
+class MeasureConversionIndex:
+    """
+    Converts SLK to true distance and back, using a network table like the one returned by `fetch_road_network_info()`,
+    where each row gives the SLK and true distance at the start and end of a piece of carriageway.
+
+    The network is sorted once when the `MeasureConversionIndex` is constructed; each conversion then locates
+    whole arrays of values with one vectorised search (see `locate_points()`) and interpolates linearly within the located row.
+    Values at the start or end of a row convert exactly to the stored measures at that end, so points of equation are exact.
+
+    At a point of equation the SLK jumps while the true distance continues, so one true distance has two SLK values
+    (and one SLK may have two true distances where the SLK repeats). `side` chooses between them:
+    - `side="start"`: use the row which starts at the value (eg for the `_from` measure of a segment)
+    - `side="end"`: use the row which ends at the value (eg for the `_to` measure of a segment)
+
+    Values in gaps of the network, beyond either end of a carriageway, with a missing value, or with category values
+    which are not in the network convert to `NaN`. Network rows with missing category values or with zero length,
+    reversed or NaN measures are ignored.
+
+    ```python
+    network    = fetch_road_network_info()
+    conversion = MeasureConversionIndex(network)
+    df["true_from"] = conversion.slk_to_true(df, "slk_from", categories=["road", "cwy"], side="start")
+    df["true_to"]   = conversion.slk_to_true(df, "slk_to",   categories=["road", "cwy"], side="end")
+    ```
+    """
+
+    def __init__(
+            self,
+            network:pandas.DataFrame,
+            categories:Sequence[str]=("ROAD", "CWY"),
+            measure_slk:Tuple[str,str]=("START_SLK", "END_SLK"),
+            measure_true:Tuple[str,str]=("START_TRUE_DIST", "END_TRUE_DIST"),
+        ):
+        self.categories   = list(categories)
+        self.measure_slk  = tuple(measure_slk)
+        self.measure_true = tuple(measure_true)
+
+        network = network[~network[self.categories].isna().any(axis=1).to_numpy()]
+
+        # group codes combine the category codes in lexicographic order, so sorting by group sorts by `categories`
+        self._category_uniques:List[pandas.Index] = []
+        self._group = np.zeros(len(network.index), dtype=np.int64)
+        for category in self.categories:
+            codes, uniques = pandas.factorize(network[category], sort=True)
+            self._category_uniques.append(pandas.Index(uniques))
+            self._group = self._group * len(uniques) + codes
+
+        self._measures:Dict[str, Tuple[np.ndarray, np.ndarray]] = {
+            "slk":  (network[self.measure_slk [0]].to_numpy(dtype="f8"), network[self.measure_slk [1]].to_numpy(dtype="f8")),
+            "true": (network[self.measure_true[0]].to_numpy(dtype="f8"), network[self.measure_true[1]].to_numpy(dtype="f8")),
+        }
+        self._sorted_rows:Dict[Tuple[str,str], Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]] = {}
+
+    def slk_to_true(self, data:pandas.DataFrame, slk:str, categories:Optional[List[str]]=None, side:str="start") -> np.ndarray:
+        """
+        Converts the column `slk` of `data` to true distance.
+        `categories` are the columns of `data` matching the network `categories` (defaults to the same names).
+        """
+        return self._convert(data, slk, categories, side, source="slk", target="true")
+
+    def true_to_slk(self, data:pandas.DataFrame, true:str, categories:Optional[List[str]]=None, side:str="start") -> np.ndarray:
+        """
+        Converts the column `true` of `data` to SLK.
+        `categories` are the columns of `data` matching the network `categories` (defaults to the same names).
+        """
+        return self._convert(data, true, categories, side, source="true", target="slk")
+
+    def _convert(self, data:pandas.DataFrame, column:str, categories:Optional[List[str]], side:str, source:str, target:str) -> np.ndarray:
+        if side not in ("start", "end"):
+            raise ValueError(f"side must be 'start' or 'end', got {side!r}")
+        if categories is None:
+            categories = self.categories
+        if len(categories) != len(self.categories):
+            raise ValueError(f"Expected {len(self.categories)} category columns to match {self.categories}, got {categories}")
+
+        values = data[column].to_numpy(dtype="f8")
+        order, sorted_group, sorted_from, sorted_to = self._sorted(source, side)
+        candidate = _locate_sorted(
+            sorted_group,
+            sorted_from,
+            sorted_to,
+            self._query_group(data, categories),
+            values if side == "start" else -values,
+        )
+        if len(order) == 0:
+            return np.full(len(values), np.nan)
+
+        row = order[np.maximum(candidate, 0)]
+        source_from, source_to = (measure[row] for measure in self._measures[source])
+        target_from, target_to = (measure[row] for measure in self._measures[target])
+        converted = target_from + (values - source_from) / (source_to - source_from) * (target_to - target_from)
+        # the ends of each row are exact, so values at points of equation give the stored measures
+        converted = np.where(values == source_from, target_from, np.where(values == source_to, target_to, converted))
+        return np.where(candidate >= 0, converted, np.nan)
+
+    def _query_group(self, data:pandas.DataFrame, categories:List[str]) -> np.ndarray:
+        """The group code of each row of `data`, or `-1` if its category values are not in the network"""
+        group = np.zeros(len(data.index), dtype=np.int64)
+        is_known = np.ones(len(data.index), dtype=bool)
+        for column, uniques in zip(categories, self._category_uniques):
+            codes = uniques.get_indexer(data[column])
+            is_known &= codes >= 0
+            group = group * len(uniques) + codes
+        return np.where(is_known, group, -1)
+
+    def _sorted(self, source:str, side:str) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """The rows with positive length in the `source` measure sorted by group then start; cached for each `source` and `side`"""
+        if (source, side) not in self._sorted_rows:
+            measure_from, measure_to = self._measures[source]
+            if side == "end":
+                # mirroring the measures makes the row which ends at a value into the row which starts there
+                measure_from, measure_to = -measure_to, -measure_from
+            order = np.lexsort((measure_to, measure_from, self._group))
+            order = order[measure_from[order] < measure_to[order]]
+            self._sorted_rows[(source, side)] = (order, self._group[order], measure_from[order], measure_to[order])
+        return self._sorted_rows[(source, side)]
@@ -0,0 +1,113 @@
+from __future__ import annotations
+from typing import Any, Dict, Iterator, List, Tuple, Union
+import numpy as np
+import pandas
+
+
+class NetworkIndex:
+    """
+    Sorts and groups a dataframe once, so that the result can be shared by several functions.
+
+    Rows of `data` are grouped by `categories`, then sorted by `measure[0]` within each group.
+    The following are computed once when the `NetworkIndex` is constructed:
+
+    - `category_codes`: integer codes of each category column (one array per category, in original row order).
+      Codes follow the sorted order of the category values; missing values get the largest code.
+    - `group_number`: the integer group number of each row (in original row order)
+    - `order`: the sort permutation; `data.iloc[order]` is sorted by `[*categories, measure[0]]`
+    - `group_offsets`: the rows of group `i` are `order[group_offsets[i]:group_offsets[i+1]]`
+    - `group_keys`: a dataframe of the `categories` values of each group
+
+    Contiguous arrays of the sorted measure columns are available from `sorted_measure()`.
+
+    Every public function in this package accepts a `NetworkIndex` in place of the dataframe it was built from.
+    When the function groups by the same `categories` (and sorts by the same `measure[0]`) the precomputed
+    ordering is reused, otherwise the function falls back to working on `data`.
+    `data` must not be modified after the `NetworkIndex` is built.
+
+    ```python
+    network = NetworkIndex(df, categories=["road", "cwy"], measure=("true_from", "true_to"))
+    check_linear_index_is_ordered_and_disjoint(network, ("true_from", "true_to"), ["road", "cwy"])
+    df["segment_id"] = segment_by_categories_and_slk_true_discontinuities(network, ["road", "cwy"], ("slk_from", "slk_to"), ("true_from", "true_to"))
+    ```
+    """
+
+    def __init__(self, data:pandas.DataFrame, categories:List[str], measure:Tuple[str,str]):
+        self.data       = data
+        self.categories = list(categories)
+        self.measure    = tuple(measure)
+
+        self.category_codes:List[np.ndarray] = []
+        self._category_uniques:List[np.ndarray] = []
+        self._row_has_missing_category = np.zeros(len(data.index), dtype=bool)
+        for category in self.categories:
+            codes, uniques = pandas.factorize(data[category], sort=True)
+            missing = codes == -1
+            codes[missing] = len(uniques)
+            self._row_has_missing_category |= missing
+            self.category_codes.append(codes.astype(np.int64))
+            self._category_uniques.append(np.asarray(uniques, dtype=object))
+
+        # np.lexsort is stable, so rows which tie on every key keep their original order
+        self.order = np.lexsort((data[self.measure[0]].to_numpy(), *reversed(self.category_codes)))
+
+        is_group_start = np.zeros(len(self.order), dtype=bool)
+        if len(is_group_start) > 0:
+            is_group_start[0] = True
+        for codes in self.category_codes:
+            sorted_codes = codes[self.order]
+            is_group_start[1:] |= sorted_codes[1:] != sorted_codes[:-1]
+        group_starts = np.flatnonzero(is_group_start)
+        self.group_offsets = np.append(group_starts, len(self.order))
+
+        self.group_number = np.empty(len(self.order), dtype=np.int64)
+        self.group_number[self.order] = np.cumsum(is_group_start) - 1
+
+        self.group_keys = data[self.categories].take(self.order[group_starts]).reset_index(drop=True)
+        self._sorted_measures:Dict[str, np.ndarray] = {}
+
+    @property
+    def num_groups(self) -> int:
+        return len(self.group_offsets) - 1
+
+    def is_grouped_by(self, categories:List[str]) -> bool:
+        return list(categories) == self.categories
+
+    def is_sorted_by(self, categories:List[str], measure_from:str) -> bool:
+        return self.is_grouped_by(categories) and measure_from == self.measure[0]
+
+    def sorted_measure(self, column:str) -> np.ndarray:
+        """Returns a contiguous array of `data[column]` in sorted order. The array is cached; do not modify it."""
+        if column not in self._sorted_measures:
+            self._sorted_measures[column] = np.ascontiguousarray(self.data[column].to_numpy()[self.order])
+        return self._sorted_measures[column]
+
+    def sorted_data(self) -> pandas.DataFrame:
+        """Returns `data` sorted by `[*categories, measure[0]]`"""
+        return self.data.take(self.order)
+
+    def groups(self) -> Iterator[Tuple[Any, pandas.DataFrame]]:
+        """
+        Yields `(group_key, group)` like `data.groupby(categories)`;
+        groups are in sorted order, rows within each group keep their original order,
+        groups with a missing category value are skipped,
+        and `group_key` is a scalar when there is only one category.
+        """
+        original_order_by_group = np.argsort(self.group_number, kind="stable")
+        for group in range(self.num_groups):
+            positions = original_order_by_group[self.group_offsets[group]:self.group_offsets[group + 1]]
+            if self._row_has_missing_category[positions[0]]:
+                continue
+            key = tuple(
+                uniques[codes[positions[0]]]
+                for codes, uniques
+                in zip(self.category_codes, self._category_uniques)
+            )
+            yield (key[0] if len(key) == 1 else key), self.data.take(positions)
+
+
+def network_data(data:Union[pandas.DataFrame, NetworkIndex]) -> pandas.DataFrame:
+    """Returns the dataframe behind `data` if it is a `NetworkIndex`, otherwise returns `data` unchanged"""
+    if isinstance(data, NetworkIndex):
+        return data.data
+    return data
@@ -0,0 +1,108 @@
+from typing import Dict, Iterable, Tuple, Union
+import numpy as np
+import pandas
+
+
+AGGREGATIONS = (
+    "length_weighted_mean",
+    "longest_non_null",
+    "min",
+    "max",
+    "sum_prorated",
+    "mode_by_length",
+)
+
+_NUMERIC_AGGREGATIONS = ("length_weighted_mean", "sum_prorated")
+
+
+def check_aggregation(aggregation:Dict[str,str], data:pandas.DataFrame, reserved_columns:Iterable[str]) -> None:
+    """Raises a `ValueError` if `aggregation` names an unknown aggregation, a missing column, or one of `reserved_columns`"""
+    reserved_columns = set(reserved_columns)
+    for column, how in aggregation.items():
+        if how not in AGGREGATIONS:
+            raise ValueError(f"Unknown aggregation {how!r} for column {column!r}; must be one of {AGGREGATIONS}")
+        if column not in data.columns:
+            raise ValueError(f"Column {column!r} named in `aggregation` is not present in the data")
+        if column in reserved_columns:
+            raise ValueError(f"Column {column!r} is a category or measure column and cannot be aggregated")
+        if how in _NUMERIC_AGGREGATIONS and not (
+            pandas.api.types.is_numeric_dtype(data[column]) or pandas.api.types.is_bool_dtype(data[column])
+        ):
+            raise ValueError(f"Aggregation {how!r} requires a numeric column, but column {column!r} has dtype {data[column].dtype}")
+
+
+def aggregate_overlaps(
+        original_data:pandas.DataFrame,
+        aggregation:Dict[str,str],
+        measure:Tuple[str,str],
+        pair_row:np.ndarray,
+        pair_position:np.ndarray,
+        overlap_len:np.ndarray,
+        num_rows:int,
+    ) -> Dict[str, Union[np.ndarray, pandas.api.extensions.ExtensionArray]]:
+    """
+    Aggregates columns of `original_data` onto `num_rows` new rows, given every overlapping `(row, original row)` pair.
+    Pair `i` is new row `pair_row[i]` overlapping `original_data.iloc[pair_position[i]]` by `overlap_len[i]` (which must be positive).
+
+    `aggregation` maps column names to one of
+    - `"length_weighted_mean"`: the mean of the non-null values weighted by overlap length
+    - `"longest_non_null"`: the non-null value with the longest overlap (ties go to the first row of `original_data`)
+    - `"min"` / `"max"`: the smallest / largest non-null value
+    - `"sum_prorated"`: the sum of the non-null values, each multiplied by the fraction of its original row (by `measure`) which is overlapped
+    - `"mode_by_length"`: the non-null value with the greatest total overlap length (ties go to the smaller value)
+
+    New rows with no non-null overlapping value get a missing value.
+    Returns a dict of arrays of length `num_rows`, one per column of `aggregation`.
+    """
+    result = {}
+    for column, how in aggregation.items():
+        values = original_data[column]
+        is_valid = ~values.isna().to_numpy()[pair_position]
+        row      = pair_row     [is_valid]
+        position = pair_position[is_valid]
+        length   = overlap_len  [is_valid]
+
+        if how in _NUMERIC_AGGREGATIONS:
+            numeric_values = values.to_numpy(dtype="f8", na_value=np.nan)[position]
+            if how == "length_weighted_mean":
+                weights = length
+            else:
+                weights = length / (
+                      original_data[measure[1]].to_numpy()[position]
+                    - original_data[measure[0]].to_numpy()[position]
+                )
+            total      = np.bincount(row, weights=numeric_values * weights, minlength=num_rows)
+            has_values = np.bincount(row, minlength=num_rows) > 0
+            if how == "length_weighted_mean":
+                total_weight = np.bincount(row, weights=weights, minlength=num_rows)
+                total = np.divide(total, total_weight, out=np.zeros(num_rows), where=has_values)
+            result[column] = np.where(has_values, total, np.nan)
+            continue
+
+        # the remaining aggregations pick one original row for each new row
+        if how == "longest_non_null":
+            pair_order = np.lexsort((position, -length, row))
+        elif how == "mode_by_length":
+            codes, _ = pandas.factorize(values.take(position), sort=True)
+            pair_order = np.lexsort((position, codes, row))
+            row, position, length, codes = row[pair_order], position[pair_order], length[pair_order], codes[pair_order]
+            # total the overlap length of each distinct value within each new row
+            is_run_start = np.ones(len(row), dtype=bool)
+            is_run_start[1:] = (row[1:] != row[:-1]) | (codes[1:] != codes[:-1])
+            run_start  = np.flatnonzero(is_run_start)
+            run_length = np.add.reduceat(length, run_start) if len(run_start) > 0 else length[:0]
+            row, position = row[run_start], position[run_start]
+            pair_order = np.lexsort((codes[run_start], -run_length, row))
+        else:
+            codes, _ = pandas.factorize(values.take(position), sort=True)
+            pair_order = np.lexsort((position, codes if how == "min" else -codes, row))
+        row      = row     [pair_order]
+        position = position[pair_order]
+        is_first = np.ones(len(row), dtype=bool)
+        is_first[1:] = row[1:] != row[:-1]
+
+        # rows with no value are infilled via reindex with -1
+        chosen_position = np.full(num_rows, -1, dtype=np.int64)
+        chosen_position[row[is_first]] = position[is_first]
+        result[column] = values.reset_index(drop=True).reindex(chosen_position).array
+    return result
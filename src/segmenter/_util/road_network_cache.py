@@ -0,0 +1,61 @@
+from typing import Any, Dict, Optional
+import hashlib
+import json
+import os
+import pandas as pd
+
+
+CACHE_FORMATS = ("parquet", "feather", "pickle")
+
+
+class RoadNetworkCache:
+    """
+    An on-disk cache of road network data, stored in `cache_dir`.
+
+    Each entry is keyed by the url and query parameters used to fetch it,
+    and consists of a data file (Parquet, Feather or pickle; Parquet and
+    Feather require `pyarrow`) plus a small json metadata file recording the
+    `freshness` of the data (eg the record count and maximum edit date reported
+    by the server when the data was downloaded).
+
+    The metadata file is written after the data file, so an interrupted
+    write leaves no usable entry.
+    """
+
+    def __init__(self, cache_dir:str, url:str, query_params:Dict[str, Any], cache_format:str="parquet"):
+        if cache_format not in CACHE_FORMATS:
+            raise ValueError(f"cache_format must be one of {CACHE_FORMATS}, got {cache_format!r}")
+        self.cache_format = cache_format
+        self.key_info = {"url": url, "query_params": query_params}
+        key = hashlib.sha256(json.dumps(self.key_info, sort_keys=True, default=str).encode()).hexdigest()[:32]
+        self.data_path     = os.path.join(cache_dir, f"{key}.{cache_format}")
+        self.metadata_path = os.path.join(cache_dir, f"{key}.json")
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def read_freshness(self) -> Optional[Dict[str, Any]]:
+        """Returns the freshness recorded when the data was cached, or `None` if there is no cache entry"""
+        if not (os.path.exists(self.metadata_path) and os.path.exists(self.data_path)):
+            return None
+        with open(self.metadata_path, "r") as file:
+            return json.load(file)["freshness"]
+
+    def read(self) -> pd.DataFrame:
+        if self.read_freshness() is None:
+            raise FileNotFoundError(f"No cached road network data for {self.key_info}")
+        if self.cache_format == "parquet":
+            return pd.read_parquet(self.data_path)
+        elif self.cache_format == "feather":
+            return pd.read_feather(self.data_path)
+        return pd.read_pickle(self.data_path)
+
+    def write(self, data:pd.DataFrame, freshness:Dict[str, Any]) -> None:
+        if os.path.exists(self.metadata_path):
+            os.remove(self.metadata_path)
+        if self.cache_format == "parquet":
+            data.to_parquet(self.data_path)
+        elif self.cache_format == "feather":
+            data.reset_index(drop=True).to_feather(self.data_path)
+        else:
+            data.to_pickle(self.data_path)
+        with open(self.metadata_path, "w") as file:
+            json.dump({**self.key_info, "freshness": freshness}, file, default=str)
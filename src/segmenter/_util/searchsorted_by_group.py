@@ -0,0 +1,55 @@
+import numpy as np
+
+
+def searchsorted_by_group(
+        sorted_group:  np.ndarray,
+        sorted_values: np.ndarray,
+        query_group:   np.ndarray,
+        query_values:  np.ndarray,
+        side:          str = "left",
+    ) -> np.ndarray:
+    """
+    Like `numpy.searchsorted()`, but `sorted_values` is made up of many independently
+    sorted blocks labelled by `sorted_group`, and each query is only searched for
+    within the block which has the same group label.
+
+    `sorted_group` / `sorted_values` must be sorted by group, then by value.
+
+    The returned insertion indexes are positions in the full `sorted_values` array.
+    A query for a group that has no values returns the position where that block
+    would be.
+
+    Internally the queries and the sorted values are merged with a single `np.lexsort`
+    so the cost is O((n + m) log(n + m)) regardless of the number of groups.
+
+    Args:
+        sorted_group (np.ndarray): integer group label of each sorted value
+        sorted_values (np.ndarray): values to search, sorted within each group
+        query_group (np.ndarray): integer group label of each query
+        query_values (np.ndarray): values to search for
+        side (str, optional): `"left"` or `"right"`, as per `numpy.searchsorted()`
+    """
+    if side not in ("left", "right"):
+        raise ValueError(f"side must be 'left' or 'right'; found {side}")
+
+    num_sorted = len(sorted_values)
+    num_query  = len(query_values)
+
+    # On ties, queries are placed before sorted values for side="left" and after for side="right"
+    query_first = side == "left"
+    tie_breaker = np.concatenate([
+        np.full(num_sorted, 1 if query_first else 0, dtype=np.int8),
+        np.full(num_query,  0 if query_first else 1, dtype=np.int8),
+    ])
+
+    order = np.lexsort((
+        tie_breaker,
+        np.concatenate([sorted_values, query_values]),
+        np.concatenate([sorted_group,  query_group ]),
+    ))
+    is_sorted_value = order < num_sorted
+    sorted_values_before = np.cumsum(is_sorted_value) - is_sorted_value
+
+    result = np.empty(num_query, dtype=np.int64)
+    result[order[~is_sorted_value] - num_sorted] = sorted_values_before[~is_sorted_value]
+    return result
@@ -1,36 +1,64 @@
-from typing import List, Tuple
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import partial
+from typing import Dict, List, Optional, Tuple, Union
 import pandas
 import numpy as np
 from .by_category import segment_by_categories_and_slk_true_discontinuities
-from .linspace_steps import linspace_steps
+from .network_index import NetworkIndex, network_data
+from .fixed_point import to_fixed_point, from_fixed_point
+from .linspace_steps import linspace_steps_batch
+from .searchsorted_by_group import searchsorted_by_group
+from .overlap_aggregation import aggregate_overlaps, check_aggregation
 
 def split_rows_by_category_to_max_segment_length(
-    data:pandas.DataFrame,
+    data:Union[pandas.DataFrame, NetworkIndex],
     measure_slk:Tuple[str,str],
     measure_true:Tuple[str,str],
     categories:List[str],
     max_segment_length:float,
     min_segment_length:float=0,
+    measure_decimals:Optional[int]=None,
+    n_jobs:int=1,
+    executor:Optional[Executor]=None,
+    aggregation:Optional[Dict[str,str]]=None,
 ) -> pandas.DataFrame:
     """
     Split rows by category, then into segments of even length.
     The SLK of each segment will be at integer multiples of `max_segment_length`.
 
-    Other columns of the dataframe are ignored.
+    Other columns of the dataframe are copied from the original row with the longest overlap (even if its value is missing),
+    unless an aggregation is given for them with `aggregation`.
     
     Each `segment_index` in the output will have only one distinct value for the columns `original_index_from` and `original_index_to`.
 
     Args:
-        data (pandas.DataFrame):              data to be segmented
+        data (pandas.DataFrame):              data to be segmented, or a `NetworkIndex` of the data grouped by `categories` and sorted by `measure_true[0]`
         measure_slk (tuple[str,str]):         column names of slk measure to segment by; eg ("slk_from", "slk_to")
         measure_true (tuple[str,str]):        column names of true measure to segment by; eg ("true_from", "true_to")
         categories (list[str]):               column names of categories to segment by; eg ["road", "cwy"]
         max_segment_length (float):           This is the target segment length. May not be achieved at the segment ends. Segments will be made at integer multiples of this value.
         min_segment_length (float, optional): Segments shorter than this will be merged with adjacent segments. Only happens to the first and last observation in each segment id. Default is Zero.
+        measure_decimals (int, optional):     Opt-in fixed point mode. Measures and lengths are converted to integer units of `10**-measure_decimals`
+                                              (eg `6` for millimetres when measures are in kilometres), all splitting is done in exact integer
+                                              arithmetic, and the results are converted back to floats. By default interpolated measures are rounded to 3 decimal places.
+        n_jobs (int, optional):               Number of worker processes (`-1` uses all CPUs). Groups of `categories` are independent, so the data is
+                                              dealt out in contiguous chunks of whole groups with a similar row count, and the results are concatenated
+                                              in group order with `segment_index` offset so that the output is identical to the single process result.
+                                              Default is 1 (no parallelism).
+        executor (concurrent.futures.Executor, optional): An existing executor to use instead of creating a process pool.
+        aggregation (dict[str,str], optional): Maps other columns to how their values are combined from all the original rows overlapping each new row
+                                              (overlap lengths are measured with `measure_true`). One of `"length_weighted_mean"`, `"longest_non_null"`,
+                                              `"min"`, `"max"`, `"sum_prorated"` (each value is multiplied by the fraction of its original row which is overlapped)
+                                              or `"mode_by_length"` (the value with the greatest total overlap length; ties go to the smaller value).
+                                              Missing values are ignored. All columns are computed together in one vectorised pass over the overlaps.
     Returns:
         pandas.DataFrame: 
     """
 
+    if n_jobs == 0 or n_jobs < -1:
+        raise ValueError(f"n_jobs must be a positive integer or -1, got {n_jobs}")
+
     # check none of the slk columns are the same as true columns
     if set(measure_slk) & set(measure_true):
         raise ValueError(
@@ -38,23 +66,106 @@ def split_rows_by_category_to_max_segment_length(
             f"Found {set(measure_slk) & set(measure_true)} in common."
             f" If you do not have true distance columns then you should duplicate the slk columns with new names before calling this function.")
 
-    
+    if aggregation:
+        check_aggregation(aggregation, network_data(data), reserved_columns=[*categories, *measure_slk, *measure_true])
+
+    split_chunk = partial(
+        _split_rows_to_max_segment_length,
+        measure_slk        = measure_slk,
+        measure_true       = measure_true,
+        categories         = categories,
+        max_segment_length = max_segment_length,
+        min_segment_length = min_segment_length,
+        measure_decimals   = measure_decimals,
+        aggregation        = aggregation,
+    )
+
+    if executor is None and n_jobs == 1:
+        result, _num_segments = split_chunk(data)
+        return result
+
+    # several chunks per worker helps to even out the load when group sizes vary
+    num_workers = n_jobs if n_jobs > 0 else (os.cpu_count() or 1)
+    chunks = _chunk_by_groups(data, categories, measure_true, num_chunks=4 * num_workers)
+    if len(chunks) <= 1:
+        result, _num_segments = split_chunk(data)
+        return result
+    if executor is not None:
+        chunk_results = list(executor.map(split_chunk, chunks))
+    else:
+        with ProcessPoolExecutor(max_workers=num_workers) as process_pool:
+            chunk_results = list(process_pool.map(split_chunk, chunks))
+
+    # segment_index starts from zero in each chunk; chunks hold whole groups in sorted order,
+    # so offsetting by the number of segments in the preceding chunks gives the single process numbering
+    results = []
+    segment_offset = 0
+    for result, num_segments in chunk_results:
+        result.index = result.index.set_levels(result.index.levels[-1] + segment_offset, level=-1)
+        results.append(result)
+        segment_offset += num_segments
+    return pandas.concat(results)
+
+
+def _chunk_by_groups(
+        data:Union[pandas.DataFrame, NetworkIndex],
+        categories:List[str],
+        measure:Tuple[str,str],
+        num_chunks:int,
+    ) -> List[pandas.DataFrame]:
+    """
+    Splits `data` into at most `num_chunks` dataframes, each holding whole groups of `categories` with a similar number of rows.
+    Chunks are in the sorted order of `categories` (as used by `segment_by_categories_and_slk_true_discontinuities()`).
+    """
+    network = data if isinstance(data, NetworkIndex) and data.is_grouped_by(categories) else NetworkIndex(data, categories, measure)
+    group_offsets = network.group_offsets
+    boundaries = np.searchsorted(
+        group_offsets[1:],
+        np.linspace(0, group_offsets[-1], num_chunks + 1)[1:-1],
+        side="right",
+    )
+    row_boundaries = np.unique(group_offsets[[0, *boundaries, -1]])
+    return [
+        network.data.take(network.order[chunk_start:chunk_end])
+        for chunk_start, chunk_end
+        in zip(row_boundaries[:-1], row_boundaries[1:])
+    ]
+
+
+def _split_rows_to_max_segment_length(
+        data:Union[pandas.DataFrame, NetworkIndex],
+        measure_slk:Tuple[str,str],
+        measure_true:Tuple[str,str],
+        categories:List[str],
+        max_segment_length:float,
+        min_segment_length:float,
+        measure_decimals:Optional[int],
+        aggregation:Optional[Dict[str,str]]=None,
+    ) -> Tuple[pandas.DataFrame, int]:
+    """
+    Does the work of `split_rows_by_category_to_max_segment_length()` in a single process.
+    Also returns the number of `segment_index` values consumed (some segments may produce no rows).
+    """
+
     # segment_index is like the "network_element" field in the imaginary geometry table
     segment_index    = segment_by_categories_and_slk_true_discontinuities(
-        data         = data,
-        measure_slk  = measure_slk,
-        measure_true = measure_true,
-        categories   = categories
+        data             = data,
+        measure_slk      = measure_slk,
+        measure_true     = measure_true,
+        categories       = categories,
+        measure_decimals = measure_decimals,
     )
 
     # This copy would not be necessary, except the user may pass in a heavily filtered view
     # then, when we try assign stuff to this frame we will get errors.
-    data = data.copy()
+    data = network_data(data).copy()
 
     data["__segment_index"] = segment_index
 
     data["__original_order"] = np.arange(len(data)).astype(np.int64)
-    data = data.sort_values(by=[*categories, "__segment_index"])
+    # segment labels increase in the order of `categories`,
+    # so a stable sort by label alone is the same as sorting by [*categories, "__segment_index"]
+    data = data.sort_values(by="__segment_index", kind="stable")
     data["__sorted_order"  ] = np.arange(len(data)).astype(np.int64)
 
     # the following table is an intermediate result;
@@ -73,112 +184,88 @@ def split_rows_by_category_to_max_segment_length(
         })
     )
 
-    # create lists to hold the new data in chunks
-    sub_results_slk_true = []
-    sub_results_min_max_original_index = []
-    sub_results_indexes = [[] for _ in range(len(categories)+1)]
-
-    # stretch index;
-    # MOD_result_index = new_index_summary.index.repeat(
-    #     new_index_summary.loc[:,("__sorted_order","max")] - new_index_summary.loc[:,("__sorted_order","min")]
-    # )
-
-
-    # The following logic is similar to a pandas.DataFrame.reindex() call with an Index.repeat()
-    for (
-            index,
-            slk_from,
-            slk_to,
-            true_from,
-            true_to,
-            sorted_index_from,
-            sorted_index_to
-        ) in new_index_summary.itertuples(index=True):
-
-        if(slk_to-slk_from == true_to-true_from):
-            # if the slk spacing is the same as true spacing we can make the SLK's land on nice round multiples of the spacing
-            new_slks = linspace_steps(
-                measure_from   = slk_from,
-                measure_to     = slk_to,
-                multiples      = max_segment_length,
-                minimum_length = min_segment_length
-            )
-
-            new_trues = np.round(
-                (new_slks - slk_from)
-                / (slk_to   - slk_from)
-                * (true_to  - true_from)
-                +  true_from,
-                3
-            )
-        else:
-            new_trues = linspace_steps(
-                measure_from   = true_from,
-                measure_to     = true_to,
-                multiples      = max_segment_length,
-                minimum_length = min_segment_length
-            )
-
-            new_slks = np.round(
-                (new_trues - true_from)
-                / (true_to  - true_from)
-                * (slk_to   - slk_from)
-                +  slk_from,
-                3
-            )
-
-        sub_results_slk_true.append(
-            np.array([
-                    new_slks [ :-1],
-                    new_slks [1:  ],
-                    new_trues[ :-1],
-                    new_trues[1:  ],
-                ])
+    (
+        slk_from,
+        slk_to,
+        true_from,
+        true_to,
+        sorted_index_from,
+        sorted_index_to
+    ) = (new_index_summary.iloc[:, i].to_numpy() for i in range(6))
+
+    if measure_decimals is not None:
+        # the integer measures are exactly representable as floats, so linspace_steps_batch is exact below
+        slk_from, slk_to, true_from, true_to = (
+            to_fixed_point(measure, measure_decimals)
+            for measure in (slk_from, slk_to, true_from, true_to)
         )
-
-        # collect these original index columns separately
-        # so that when they are added to the dataframe they don't
-        # get converted to floats
-        # max rows allowed by u4; 4,294,967,295
-        sub_results_min_max_original_index.append(
-            np.array([
-                np.full(len(new_slks)-1, sorted_index_from, dtype= "u4"),
-                np.full(len(new_slks)-1, sorted_index_to,   dtype= "u4"),
-            ])
-        )
-
-        # we have to collect each level of the index separately
-        # otherwise numpy will coerce them all to a single type, normally a string.
-        for sub_index, sub_results_index in zip(index, sub_results_indexes):
-            sub_results_index.append(
-                np.repeat(sub_index, len(new_slks)-1)
-            )
-
-    # stack up the columns collected in the for-loop
-    sub_results_indexes = [
-        np.concatenate(sub_results_index) for sub_results_index in sub_results_indexes
-    ]
-    
-    sub_results_slk_true = np.concatenate(sub_results_slk_true, axis=1)
-    
-
+        max_segment_length = to_fixed_point([max_segment_length], measure_decimals)[0]
+        min_segment_length = to_fixed_point([min_segment_length], measure_decimals)[0]
+
+    # if the slk spacing is the same as true spacing we can make the SLK's land on nice round multiples of the spacing
+    # otherwise the true distance is used to position the splits and the SLK is interpolated
+    slk_driven = (slk_to - slk_from) == (true_to - true_from)
+
+    driver_from = np.where(slk_driven, slk_from,  true_from)
+    driver_to   = np.where(slk_driven, slk_to,    true_to  )
+    driven_from = np.where(slk_driven, true_from, slk_from )
+    driven_to   = np.where(slk_driven, true_to,   slk_to   )
+
+    # All chunks are split in one call; the new measures for the chunk `i` are
+    # `new_driver[offsets[i]:offsets[i+1]]`
+    new_driver, offsets = linspace_steps_batch(
+        measure_from   = driver_from,
+        measure_to     = driver_to,
+        multiples      = max_segment_length,
+        minimum_length = min_segment_length
+    )
+    chunk_lengths = np.diff(offsets)
+    chunk_of_value = np.repeat(np.arange(len(chunk_lengths)), chunk_lengths)
+
+    new_driven = np.round(
+        (new_driver - driver_from[chunk_of_value])
+        / (driver_to[chunk_of_value] - driver_from[chunk_of_value])
+        * (driven_to[chunk_of_value] - driven_from[chunk_of_value])
+        +  driven_from[chunk_of_value],
+        3 if measure_decimals is None else 0
+    )
+    slk_driven_value = slk_driven[chunk_of_value]
+    new_slks  = np.where(slk_driven_value, new_driver, new_driven)
+    new_trues = np.where(slk_driven_value, new_driven, new_driver)
+    if measure_decimals is not None:
+        new_slks  = from_fixed_point(new_slks,  measure_decimals)
+        new_trues = from_fixed_point(new_trues, measure_decimals)
+
+    # each chunk of n values produces n-1 rows; every value except the last in each chunk starts a row
+    rows_per_chunk = np.maximum(chunk_lengths - 1, 0)
+    is_row_start = np.ones(len(new_driver), dtype=bool)
+    is_row_start[offsets[1:][chunk_lengths > 0] - 1] = False
+    row_start = np.flatnonzero(is_row_start)
+
+    # stretch the index so that there is one entry per row
+    # (the segment_index level is stored as signed integers for consistency with previous versions)
+    result_index = new_index_summary.index.repeat(rows_per_chunk).set_names([*categories, "segment_index"])
+    result_index = result_index.set_levels(result_index.levels[-1].astype("i8"), level=-1)
 
     # build the result dataframe
     # contains index / columns that look like
     # (*categories, segment_index) / (slk_from, slk_to, true_from, true_to)
     result = pandas.DataFrame(
-        sub_results_slk_true.transpose(),
-        index=pandas.MultiIndex.from_arrays(
-            arrays = sub_results_indexes,
-            names  = [*categories, "segment_index"]
-        ),
-        columns    = [*measure_slk, *measure_true],
-    )
-    # afterwards add two more columns (cant be built into the call above otherwise dtypes will be forced to match sub_results_slk_true)
-    result["__sorted_index_from"], result["__sorted_index_to"  ] = np.concatenate(
-        sub_results_min_max_original_index,
-        axis=1
+        {
+            measure_slk[0]:  new_slks [row_start    ],
+            measure_slk[1]:  new_slks [row_start + 1],
+            measure_true[0]: new_trues[row_start    ],
+            measure_true[1]: new_trues[row_start + 1],
+        },
+        index=result_index,
     )
+
+    # collect these original index columns separately
+    # so that when they are added to the dataframe they don't
+    # get converted to floats
+    # max rows allowed by u4; 4,294,967,295
+    result["__sorted_index_from"] = np.repeat(sorted_index_from.astype("u4"), rows_per_chunk)
+    result["__sorted_index_to"  ] = np.repeat(sorted_index_to  .astype("u4"), rows_per_chunk)
     
 
     # NOTE: `segment_index` created above is like the "network_element" field in the imaginary geometry table.
@@ -188,16 +275,18 @@ def split_rows_by_category_to_max_segment_length(
     # with original data columns that got left behind
     
     # TODO: warning; will fail if data has complex index?
-    recombination_index = _recombine_segmentation_index(
+    row_order, pair_row, pair_position, overlap_len = _segmentation_overlaps(
         segmentation   = result,
         original_data  = data,
         measure        = measure_true,
         grouping_id    = "segment_index",
         grouping_range = ("__sorted_index_from", "__sorted_index_to")
     )
-    
+    recombination_index = _longest_overlap_index(result, data, row_order, pair_row, pair_position, overlap_len)
+
     # get a list of column names that are not part of the index we built
-    value_columns = list(set(data.columns) - {*categories, *measure_slk, *measure_true})
+    aggregation = aggregation or {}
+    value_columns = list(set(data.columns) - {*categories, *measure_slk, *measure_true, *aggregation})
 
     final_result = (
         result
@@ -215,7 +304,20 @@ def split_rows_by_category_to_max_segment_length(
         ])
     )
 
-    return final_result
+    # the aggregated columns share one set of overlap pairs
+    aggregated_columns = aggregate_overlaps(
+        original_data = data,
+        aggregation   = aggregation,
+        measure       = measure_true,
+        pair_row      = row_order[pair_row],
+        pair_position = pair_position,
+        overlap_len   = overlap_len,
+        num_rows      = len(result.index),
+    )
+    for column, values in aggregated_columns.items():
+        final_result[column] = values
+
+    return final_result, (int(segment_index.max()) + 1 if len(segment_index) > 0 else 0)
 
 
 
@@ -247,59 +349,122 @@ def _recombine_segmentation_index(
                        that matches the observation in `segmentation`.
     """
 
-    
+
+
+    row_order, pair_row, pair_position, overlap_len = _segmentation_overlaps(
+        segmentation, original_data, measure, grouping_id, grouping_range
+    )
+    return _longest_overlap_index(segmentation, original_data, row_order, pair_row, pair_position, overlap_len)
+
+
+def _segmentation_overlaps(
+        segmentation:pandas.DataFrame,
+        original_data:pandas.DataFrame,
+        measure:Tuple[str,str],
+        grouping_id:str,
+        grouping_range:Tuple[str,str],
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Finds every pair of an observation in `segmentation` and an observation in `original_data` which overlap by more than zero.
+    See `_recombine_segmentation_index()` for the arguments.
+
+    Returns `(row_order, pair_row, pair_position, overlap_len)`:
+    `row_order` holds the positions of the rows of `segmentation` in the order they are visited,
+    and pair `i` is the row at position `row_order[pair_row[i]]` of `segmentation` overlapping
+    the row at position `pair_position[i]` of `original_data` by `overlap_len[i]`.
+    """
 
     # segment_index is like the "network_element" field in the imaginary geometry table
     # it is defined in the function above and is subject to change.
-    result = []
-    result_index = []
-    for _index, group in segmentation.groupby(grouping_id):
-        original_data_possibly_overlapping = (
-            original_data
-            .iloc[
-                group.loc[:,grouping_range[0]].iloc[0]:group.loc[:, grouping_range[1]].iloc[0]+1
-            ]
-            [list(measure)]
-        )
 
-        # pandas uses named tuples which is super annoying to work with
-        # here we get the index of the fields we want in advance.
-        # we add 1 because itertuples inserts the index as item zero
-        measure_from_index = group.columns.get_loc(measure[0]) + 1
-        measure_to_index   = group.columns.get_loc(measure[1]) + 1
-
-        for itertup in group.itertuples(index=True):
-            index = itertup[0]
-            group_measure_from = itertup[measure_from_index]
-            group_measure_to   = itertup[  measure_to_index]
-
-            #                                                                Series,       Scalar Float
-            overlap_min = np.maximum(original_data_possibly_overlapping[measure[0]], group_measure_from)
-            overlap_max = np.minimum(original_data_possibly_overlapping[measure[1]],   group_measure_to)
-            
-            # overlap_len = np.maximum(overlap_max - overlap_min, 0)  # np.maximum() is not needed due to filters above
-            overlap_len = overlap_max - overlap_min
-
-            mask_overlaps_greater_than_zero = overlap_len > 0
-
-            if not np.any(mask_overlaps_greater_than_zero):
-                # Infill with np.nan or we will lose our column position.
-                result.append(np.nan)
-                result_index.append(index)
-                continue
-            
-            # Here we are merging whichever observation has the longest overlap
-            # we are unable to find the "longest non-null overlap" since we are looking at multiple columns
-            # in the merge tool we work with one column at a time, and therefore we can decide which observation to choose
-
-            # this next line would be the beginning of an implementation that would allow us to choose the "longest non-null overlap"
-            # but for the moment this attempt is abandoned.
-            # original_data_actually_overlapping = original_data_possibly_overlapping.loc[mask_overlaps_greater_than_zero]
-            
-            result_index.append(index)
-
-            result.append(
-               overlap_len[mask_overlaps_greater_than_zero].idxmax()
-            )
-    
-    return pandas.Series(result, index=result_index)
+    # The rows of `segmentation` are visited in the same order as `segmentation.groupby(grouping_id)`
+    if grouping_id in segmentation.columns:
+        grouping_values = segmentation[grouping_id]
+    else:
+        grouping_values = segmentation.index.get_level_values(grouping_id)
+    group_codes, _ = pandas.factorize(grouping_values, sort=True)
+    row_order      = np.argsort(group_codes, kind="stable")
+    row_order      = row_order[group_codes[row_order] >= 0]
+    row_group      = group_codes[row_order]
+
+    # Each group of rows in `segmentation` may overlap the rows of `original_data` in the
+    # positional range given by the `grouping_range` of the first row in the group
+    group_first_row  = row_order[np.flatnonzero(np.diff(row_group, prepend=-1) != 0)]
+    range_from       = segmentation[grouping_range[0]].to_numpy()[group_first_row].astype(np.int64)
+    range_to         = np.minimum(segmentation[grouping_range[1]].to_numpy()[group_first_row].astype(np.int64) + 1, len(original_data))
+    candidate_count  = np.maximum(range_to - range_from, 0)
+
+    candidate_group    = np.repeat(np.arange(len(candidate_count)), candidate_count)
+    candidate_position = (
+        range_from[candidate_group]
+        + np.arange(len(candidate_group))
+        - np.repeat(np.cumsum(candidate_count) - candidate_count, candidate_count)
+    )
+    candidate_from = original_data[measure[0]].to_numpy()[candidate_position]
+    candidate_to   = original_data[measure[1]].to_numpy()[candidate_position]
+
+    # sort candidates within each group by their start
+    candidate_order    = np.lexsort((candidate_position, candidate_from, candidate_group))
+    candidate_group    = candidate_group   [candidate_order]
+    candidate_position = candidate_position[candidate_order]
+    candidate_from     = candidate_from    [candidate_order]
+    candidate_to       = candidate_to      [candidate_order]
+
+    # the running maximum of `candidate_to` is sorted within each group even if the original data overlaps itself,
+    # therefore every candidate which may overlap a row lies in the range [first_candidate, last_candidate)
+    candidate_to_running_max = pandas.Series(candidate_to).groupby(candidate_group).cummax().to_numpy()
+
+    row_from = segmentation[measure[0]].to_numpy()[row_order]
+    row_to   = segmentation[measure[1]].to_numpy()[row_order]
+
+    first_candidate = searchsorted_by_group(candidate_group, candidate_to_running_max, row_group, row_from, side="right")
+    last_candidate  = searchsorted_by_group(candidate_group, candidate_from,           row_group, row_to,   side="left" )
+    pair_count      = np.maximum(last_candidate - first_candidate, 0)
+
+    # expand to one entry per (row, candidate) pair
+    pair_row       = np.repeat(np.arange(len(row_order)), pair_count)
+    pair_candidate = (
+        np.repeat(first_candidate, pair_count)
+        + np.arange(len(pair_row))
+        - np.repeat(np.cumsum(pair_count) - pair_count, pair_count)
+    )
+    overlap_len = (
+          np.minimum(candidate_to  [pair_candidate], row_to  [pair_row])
+        - np.maximum(candidate_from[pair_candidate], row_from[pair_row])
+    )
+    mask_overlaps_greater_than_zero = overlap_len > 0
+    return (
+        row_order,
+        pair_row                         [mask_overlaps_greater_than_zero],
+        candidate_position[pair_candidate[mask_overlaps_greater_than_zero]],
+        overlap_len                      [mask_overlaps_greater_than_zero],
+    )
+
+
+def _longest_overlap_index(
+        segmentation:pandas.DataFrame,
+        original_data:pandas.DataFrame,
+        row_order:np.ndarray,
+        pair_row:np.ndarray,
+        pair_position:np.ndarray,
+        overlap_len:np.ndarray,
+    ) -> pandas.Series:
+    """Picks the longest overlap of each row from the pairs found by `_segmentation_overlaps()`; see `_recombine_segmentation_index()`"""
+    # Here we are merging whichever observation has the longest overlap
+    # (ties are broken in favour of the first observation in `original_data`)
+    # regardless of missing values; the "longest non-null overlap" is chosen column by column
+    # when requested with the `aggregation` argument (see `aggregate_overlaps()`)
+    pair_order = np.lexsort((pair_position, -overlap_len, pair_row))
+    pair_row      = pair_row     [pair_order]
+    pair_position = pair_position[pair_order]
+    is_best_pair  = np.diff(pair_row, prepend=-1) != 0
+
+    # rows with no overlap are infilled with np.nan (via reindex with -1) or we will lose our column position.
+    best_position = np.full(len(row_order), -1, dtype=np.int64)
+    best_position[pair_row[is_best_pair]] = pair_position[is_best_pair]
+
+    return (
+        pandas.Series(original_data.index)
+        .reindex(best_position)
+        .set_axis(segmentation.index.take(row_order))
+    )
@@ -1,31 +1,50 @@
-from typing import List, Tuple
+from functools import partial
+from typing import List, Optional, Tuple, Union
 import pandas
 import numpy as np
 
 from .check_segmentation import check_linear_index, check_linear_index_is_ordered_and_disjoint
+from .network_index import NetworkIndex, network_data
+from .fixed_point import to_fixed_point, from_fixed_point
+from .validation import check_validate_level, run_check, is_range_index
 
 def _check_columns_present(name, df, column_names, df_name):
     if not all(item in df.columns for item in column_names):
         raise ValueError(f"{name} {[column_name for column_name in column_names if column_name not in df.columns]} not in `{df_name}`. Did you mean to use `{df_name}.reset_index(drop=False)`?")
 
 
-class CN:
-    original_index     = "original_index"
-    original_df_num    = "original_df_num"
-    additional_index   = "additional_index"
-    event_measure_true = "event_measure_true"
-    event_measure_slk  = "event_measure_slk"
-    event_type         = "event_type"
+def _check_input(segmentation:pandas.DataFrame, df_name:str, categories, measure_slk, measure_true):
+    """The structural checks of each input; all are cheap except `has_duplicates` on an index which is not a `RangeIndex`"""
+    # force the user to drop any multi-index
+    if isinstance(segmentation.index, pandas.MultiIndex):
+        raise ValueError(f"`{df_name}` has a MultiIndex which is not supported. Please use `{df_name}.reset_index()`")
+
+    # confirm indexes do not have duplicates
+    if segmentation.index.has_duplicates:
+        raise ValueError(f"`{df_name}` has duplicates in its index. Please use `{df_name}.reset_index()`")
+
+    # since we do not preserve the original indexes (see `split_rows_by_segmentation()`)
+    # for now, we will force the user to use a range-index
+    if not is_range_index(segmentation.index):
+        raise ValueError(f"`{df_name}` index is not a RangeIndex (0,1,2,3,...). This will cause problems downstream due to the index not being preserved. This will be fixed in the future. Please use `{df_name}.reset_index()`")
+
+    # check that all columns required by the parameters are present
+    _check_columns_present("categories",   segmentation, categories,   df_name)
+    _check_columns_present("measure_slk",  segmentation, measure_slk,  df_name)
+    _check_columns_present("measure_true", segmentation, measure_true, df_name)
+
 
 def split_rows_by_segmentation(
-        original_segmentation:pandas.DataFrame,
-        additional_segmentation:pandas.DataFrame,
+        original_segmentation:Union[pandas.DataFrame, NetworkIndex],
+        additional_segmentation:Union[pandas.DataFrame, NetworkIndex],
         categories:List[str],
         measure_slk:Tuple[str,str],
         measure_true:Tuple[str,str],
         name_original_index:str,
         name_additional_index:str,
-        relax_slk_checks:bool=False
+        relax_slk_checks:bool=False,
+        measure_decimals:Optional[int]=None,
+        validate:str="full",
     ):
     """
     Combines two segmentations, returning a new dataframe. The new segmentation will
@@ -49,140 +68,322 @@ def split_rows_by_segmentation(
         name_original_index: The desired name of the column that will be output into result. The value in this column will be the integer index of the row in `original_segmentation` that corresponds to each row of the `result`. Typically `'original_index'`
         name_additional_index:  The desired name of the column that will be output into result. The value in this column will be the integer index of the row in `original_segmentation` that corresponds to each row of the `result`. Typically `'additional_index'`
         relax_slk_checks:  Relax the ordered and disjoint checks on the addititional_segments dataframe SLK columns. Sometimes it is valid to have an SLK_END < SLK_START when the segment lies inside a point of equation. False by default untill further testing.
+        measure_decimals: Opt-in fixed point mode. Measures are converted to integer units of `10**-measure_decimals` (eg `6` for millimetres when measures are in kilometres) so that coincident splits are detected exactly, and converted back to floats on output.
+        validate: `"full"` (default) checks both inputs on every call. `"fast"` only runs the cheap structural checks, and skips the linear index checks for inputs which have been passed to `mark_validated()`. `"none"` skips all checks.
+
+    Either segmentation may be passed as a `NetworkIndex`. If it is grouped by `categories`, its grouping is reused by the
+    ordered and disjoint checks and by the sweep, and if it is also sorted by `measure_true[0]` its sort order is reused by the sweep.
     """
-    
     if (name_original_index==name_additional_index):
         raise ValueError(f"`name_original_index` and `name_additional_index` cannot be the same: {name_original_index}")
-    
-    # force the user to drop any multi-index
-    if isinstance(original_segmentation.index, pandas.MultiIndex):
-        raise ValueError(f"`original_segmentation` has a MultiIndex which is not supported. Please use `original_segmentation.reset_index()`")
-    if isinstance(additional_segmentation.index, pandas.MultiIndex):
-        raise ValueError(f"`additional_segmentation` has a MultiIndex which is not supported. Please use `additional_segmentation.reset_index()`")
 
-    # confirm indexes do not have duplicates
-    if original_segmentation.index.has_duplicates:
-        raise ValueError(f"`original_segmentation` has duplicates in its index. Please use `original_segmentation.reset_index()`")
-    if additional_segmentation.index.has_duplicates:
-        raise ValueError(f"`additional_segmentation` has duplicates in its index. Please use `additional_segmentation.reset_index()`")
+    return _split_rows_by_segmentations(
+        segmentations     = [original_segmentation, additional_segmentation],
+        df_names          = ["original_segmentation", "additional_segmentation"],
+        categories        = categories,
+        measure_slk       = measure_slk,
+        measure_true      = measure_true,
+        names             = [name_original_index, name_additional_index],
+        relax_slk_checks  = relax_slk_checks,
+        measure_decimals  = measure_decimals,
+        validate          = validate,
+    )
 
-    # since we do not preserve the original indexes due to the problems explained below
-    # for now, we will force the user to use a range-index
-    if not (original_segmentation.index == pandas.RangeIndex(len(original_segmentation.index))).all():
-        raise ValueError(f"`original_segmentation` index is not a RangeIndex (0,1,2,3,...). This will cause problems downstream due to the index not being preserved. This will be fixed in the future. Please use `original_segmentation.reset_index()`")
-    if not (additional_segmentation.index == pandas.RangeIndex(len(additional_segmentation.index))).all():
-        raise ValueError(f"`additional_segmentation` index is not a RangeIndex (0,1,2,3,...). This will cause problems downstream due to the index not being preserved. This will be fixed in the future. Please use `additional_segmentation.reset_index()`")
 
-    # check that all columns required by the parameters are present
-    _check_columns_present("categories",   original_segmentation, categories,   "original_segmentation")
-    _check_columns_present("measure_slk",  original_segmentation, measure_slk,  "original_segmentation")
-    _check_columns_present("measure_true", original_segmentation, measure_true, "original_segmentation")
-    
-    _check_columns_present("categories",   additional_segmentation, categories,   "additional_segmentation")
-    _check_columns_present("measure_slk",  additional_segmentation, measure_slk,  "additional_segmentation")
-    _check_columns_present("measure_true", additional_segmentation, measure_true, "additional_segmentation")
-
-    check_linear_index(original_segmentation[list(measure_slk)])
-    check_linear_index(original_segmentation[list(measure_true)])
-    check_linear_index_is_ordered_and_disjoint(original_segmentation, measure_true, categories)
-
-    if not relax_slk_checks:
-        check_linear_index(additional_segmentation[list(measure_slk)])
-    check_linear_index(additional_segmentation[list(measure_true)])
-    check_linear_index_is_ordered_and_disjoint(additional_segmentation, measure_true, categories)
-    
+def split_rows_by_segmentations(
+        segmentations:List[Union[pandas.DataFrame, NetworkIndex]],
+        categories:List[str],
+        measure_slk:Tuple[str,str],
+        measure_true:Tuple[str,str],
+        names:List[str],
+        relax_slk_checks:bool=False,
+        measure_decimals:Optional[int]=None,
+        validate:str="full",
+    ) -> pandas.DataFrame:
+    """
+    Combines any number of segmentations in a single sweep, returning a new dataframe. The new segmentation will
+
+    - Have a split wherever any of the input dataframes had a split
+    - Cover any area that is covered by any of the input dataframes
+
+    Where the inputs share a consistent slk/true mapping (each true distance has the same SLK in every input, except at
+    points of equation where rows end at the SLK before the jump and start at the SLK after it), this gives the same result as
+    chaining `split_rows_by_segmentation()` pairwise. Where the inputs disagree, the SLK of each output row is interpolated
+    from whichever input rows are active, so the result may differ from chaining. The inputs are each validated once,
+    and the "from" and "to" events of every input are sorted together and swept once, instead of once per pair.
+
+    Args:
+        segmentations: A list of non-overlapping (in `measure_true`) segmentations over `categories`.
+                       Each may be passed as a `NetworkIndex`; its grouping and sort order are reused as in `split_rows_by_segmentation()`.
+        categories: Typically `['road','carriageway']`
+        measure_slk: Typically `('slk_from','slk_to')`
+        measure_true: Typically `('true_from','true_to')`
+        names: The desired names of the output columns, one per input. Each column contains the integer position (for use with `.iloc[]`)
+               of the row of the corresponding input which covers each row of the result, or NaN if there is none.
+        relax_slk_checks: Skip the SLK checks for every input except the first (see `split_rows_by_segmentation()`)
+        measure_decimals: see `split_rows_by_segmentation()`
+        validate: see `split_rows_by_segmentation()`
 
-    # TODO: there are problems with these next lines;
-    #       the original indexes are dropped by the .loc[]
-    #       and are replaced by a rangeindex.
-    #       this is super safe, but kinda annoying and unexpected.
-
-    oseg = (
-        original_segmentation
-        #.reset_index(drop=False) # will be lost due to loc[] anyway
-        .loc[:,[*categories, *measure_slk, *measure_true]]
-        .assign(**{
-            CN.original_index: lambda df: pandas.RangeIndex(len(df.index)),
-            CN.original_df_num:0
-        })
-        .copy()
+    ```python
+    result = split_rows_by_segmentations(
+        [surface, pavement_age, speed_zones, lane_count],
+        categories   = ["road", "cwy"],
+        measure_slk  = ("slk_from", "slk_to"),
+        measure_true = ("true_from", "true_to"),
+        names        = ["surface_index", "pavement_age_index", "speed_zone_index", "lane_count_index"],
     )
-    
+    result = result.join(surface["surface_type"], on="surface_index")
+    ```
+    """
+    return _split_rows_by_segmentations(
+        segmentations     = segmentations,
+        df_names          = [f"segmentations[{number}]" for number in range(len(segmentations))],
+        categories        = categories,
+        measure_slk       = measure_slk,
+        measure_true      = measure_true,
+        names             = names,
+        relax_slk_checks  = relax_slk_checks,
+        measure_decimals  = measure_decimals,
+        validate          = validate,
+    )
+
+
+def _split_rows_by_segmentations(
+        segmentations:List[Union[pandas.DataFrame, NetworkIndex]],
+        df_names:List[str],
+        categories:List[str],
+        measure_slk:Tuple[str,str],
+        measure_true:Tuple[str,str],
+        names:List[str],
+        relax_slk_checks:bool,
+        measure_decimals:Optional[int],
+        validate:str,
+    ) -> pandas.DataFrame:
+    check_validate_level(validate)
+    if len(names) != len(segmentations):
+        raise ValueError(f"One name is required for each of the {len(segmentations)} segmentations; got {len(names)} names")
+    if len(set(names)) != len(names):
+        raise ValueError(f"The output column names must all be different: {names}")
+
+    # the NetworkIndex (if any) is kept for the ordered and disjoint checks and for the sweep
+    networks = segmentations
+    segmentations = [network_data(segmentation) for segmentation in segmentations]
+
+    if validate != "none":
+        for segmentation, df_name in zip(segmentations, df_names):
+            _check_input(segmentation, df_name, categories, measure_slk, measure_true)
 
-    aseg = (
-        additional_segmentation
-        #.reset_index(drop=False) # will be lost due to loc[] anyway
-        .loc[:,[*categories, *measure_slk, *measure_true]]
-        .assign(**{
-            CN.original_index: lambda df: pandas.RangeIndex(len(df.index)),
-            CN.original_df_num:1
-        })
-        .copy()
+    for number, (segmentation, network) in enumerate(zip(segmentations, networks)):
+        if number == 0 or not relax_slk_checks:
+            run_check(validate, segmentation, "check_linear_index", list(measure_slk), partial(_check_linear_index, segmentation, measure_slk))
+        run_check(validate, segmentation, "check_linear_index", list(measure_true), partial(_check_linear_index, segmentation, measure_true))
+        run_check(
+            validate, segmentation, "check_linear_index_is_ordered_and_disjoint", [*categories, *measure_true],
+            partial(check_linear_index_is_ordered_and_disjoint, network, measure_true, categories),
+        )
+
+    # NOTE: the original indexes are not preserved.
+    #       The `names` columns contain integer positions (for use with `.iloc[]`)
+
+    result_categories, result_measures, result_positions = _sweep_segmentations(
+        segmentations    = networks,
+        categories       = categories,
+        measure_slk      = measure_slk,
+        measure_true     = measure_true,
+        measure_decimals = measure_decimals,
     )
 
+    # TODO: the `names` columns are always floating point so that missing values can be represented by NaN.
+    result = result_categories.assign(**{
+        measure_slk[0]:  result_measures[0],
+        measure_slk[1]:  result_measures[1],
+        measure_true[0]: result_measures[2],
+        measure_true[1]: result_measures[3],
+        **{
+            name: _positions_to_float(positions)
+            for name, positions
+            in zip(names, result_positions)
+        },
+    })
+    return result
 
-    from_events = pandas.concat([oseg, aseg])
-    from_events[CN.event_measure_true] = from_events[measure_true[0]]
-    from_events[CN.event_measure_slk] = from_events[measure_slk[0]]
-    from_events = from_events.sort_values([CN.event_measure_true, CN.original_df_num], ascending=[True, True], kind="stable")
-    from_events[CN.event_type] = "from"
-
-    to_events = pandas.concat([oseg, aseg])
-    to_events[CN.event_measure_true] = to_events[measure_true[1]]
-    to_events[CN.event_measure_slk] = to_events[measure_slk[1]]
-    to_events = to_events.sort_values([CN.event_measure_true, CN.original_df_num], ascending=[True, False], kind="stable")
-    to_events[CN.event_type] = "to"
-
-    events = pandas.concat([from_events, to_events]).sort_values([*categories, CN.event_measure_true, CN.original_index], kind="stable")#.sort_values([*categories,"event_measure"], kind="stable")
-
-    results = []
-    for group_index, group in events.groupby(categories):
-        segments = []
-        index_o = None
-        index_a = None
-        last_measure_true = None
-        last_measure_slk = None
-        for row_index, row in group.iterrows():
-            if (
-                not last_measure_true is None 
-                and row[CN.event_measure_true] - last_measure_true > 0 
-                and row[CN.event_measure_slk] - last_measure_slk > 0 
-                and not(index_o is None and index_a is None)
-                ):
-                # We have found a Non-Zero length segment, append it to the record
-                group_index_columns = [group_index] if isinstance(group_index, str) else group_index
-                #               [*categories,            measure_slk[0],     measure_slk[1],              measure_true[0],     measure_true[1],              name_original_index,   name_additional_index]
-                segments.append([*group_index_columns,   last_measure_slk,   row[CN.event_measure_slk],   last_measure_true,   row[CN.event_measure_true],   index_o,               index_a              ])
-            if row[CN.event_type] == "from":
-                # Toggle the index_o and index_a ON (storing the event start index)
-                if row[CN.original_df_num] == 0:
-                    index_o = row[CN.original_index]
-                else:
-                    index_a = row[CN.original_index]
-            elif row[CN.event_type] == "to":
-                # Toggle the index_o and index_a OFF (by setting to None)
-                if row[CN.original_df_num] == 0:
-                    index_o = None
-                else:
-                    index_a = None
-            last_measure_true = row[CN.event_measure_true]
-            last_measure_slk = row[CN.event_measure_slk]
-        results += segments
-    # TODO: sometimes `name_original_index` and `name_additional_index` are floating point and sometimes int depending if all rows have a value.
-    
-    column_names = [*categories,*measure_slk, *measure_true, name_original_index, name_additional_index]
-    # this error should never happen now due to the index checks added above.
-    # if len(results)>0 and len(column_names)!=len(results[0]):
-    #     raise Exception(
-    #          "split_rows_by_segmentation() has become confused about the number of columns\n"
-    #         f"column_names: {column_names}\n"
-    #         f"results[0]: {results[0]}"
-    #     )
-    result =  pandas.DataFrame(
-        data=results,
-        columns=column_names,
-    ) 
-    result[name_original_index]   = result[name_original_index  ].astype("f8")
-    result[name_additional_index] = result[name_additional_index].astype("f8")
+
+def _check_linear_index(segmentation:pandas.DataFrame, measure:Tuple[str,str]) -> None:
+    check_linear_index(segmentation[list(measure)])
+
+
+def _positions_to_float(positions:np.ndarray) -> np.ndarray:
+    """Convert integer positions (where -1 means missing) to floats (where np.nan means missing)"""
+    result = positions.astype("f8")
+    result[positions < 0] = np.nan
     return result
 
+
+def _sweep_segmentations(
+        segmentations:List[Union[pandas.DataFrame, NetworkIndex]],
+        categories:List[str],
+        measure_slk:Tuple[str,str],
+        measure_true:Tuple[str,str],
+        measure_decimals:Optional[int]=None,
+    ) -> Tuple[pandas.DataFrame, Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray], List[np.ndarray]]:
+    """
+    Sweep-line engine behind `split_rows_by_segmentation()`.
+
+    Each row of each dataframe in `segmentations` is converted into a "from" and a "to" event.
+    The events are encoded as plain arrays (category codes, measures, dataframe number,
+    event type, row position), ordered with a single `np.lexsort`, and then the rows which
+    are "active" between each pair of consecutive events are found using running maximums
+    rather than a python loop.
+
+    The inputs are assumed to have been validated already; within each dataframe,
+    rows must be ordered and disjoint (in `measure_true`) within each group of `categories`.
+    An input may be a `NetworkIndex`; if it is grouped by `categories` its category codes and sort order are reused (see `_sweep_rows()`).
+
+    If `measure_decimals` is given, measures are converted to fixed point integers (see `to_fixed_point()`)
+    before the sweep, and converted back to floats in `result_measures`.
+
+    Returns:
+        A tuple `(result_categories, result_measures, result_positions)` where
+        
+        - `result_categories` is a dataframe with the `categories` columns of each output row,
+        - `result_measures` is a tuple of arrays `(slk_from, slk_to, true_from, true_to)`, and
+        - `result_positions` is a list containing an integer array for each input dataframe
+          containing the position of the active row in that dataframe, or -1 if there is none.
+    """
+    num_segmentations = len(segmentations)
+    rows = [_sweep_rows(segmentation, categories, measure_true) for segmentation in segmentations]
+    num_rows = np.array([len(row_order) for row_order, _, _ in rows], dtype=np.int64)
+
+    # the category values of each row are looked up in `rows_categories` (one row per group of a `NetworkIndex`,
+    # otherwise one row per row of the input); `rows_key` is the row of `rows_categories` for each row
+    rows_categories = pandas.concat([keys for _, keys, _ in rows], ignore_index=True)
+    key_offsets = np.cumsum([0, *(len(keys.index) for _, keys, _ in rows)])
+    rows_key = np.concatenate([key_offset + row_key for (_, _, row_key), key_offset in zip(rows, key_offsets)]).astype(np.int64)
+    rows_df_num   = np.repeat(np.arange(num_segmentations), num_rows)
+    rows_position = np.concatenate([row_order for row_order, _, _ in rows]).astype(np.int64)
+
+    # factorize with sort=True so that integer codes sort in the same order as the category values
+    rows_category_codes = [
+        pandas.factorize(rows_categories[category], sort=True)[0][rows_key]
+        for category in categories
+    ]
+
+    # one "from" event and one "to" event for every row
+    event_row     = np.concatenate([np.arange(len(rows_df_num)), np.arange(len(rows_df_num))])
+    event_is_from = np.repeat([True, False], len(rows_df_num))
+    event_true    = np.concatenate([
+        np.concatenate([_sweep_measure(segmentation, measure_true[0], row_order) for segmentation, (row_order, _, _) in zip(segmentations, rows)]),
+        np.concatenate([_sweep_measure(segmentation, measure_true[1], row_order) for segmentation, (row_order, _, _) in zip(segmentations, rows)]),
+    ])
+    event_slk     = np.concatenate([
+        np.concatenate([_sweep_measure(segmentation, measure_slk[0], row_order) for segmentation, (row_order, _, _) in zip(segmentations, rows)]),
+        np.concatenate([_sweep_measure(segmentation, measure_slk[1], row_order) for segmentation, (row_order, _, _) in zip(segmentations, rows)]),
+    ])
+    if measure_decimals is not None:
+        event_true = to_fixed_point(event_true, measure_decimals)
+        event_slk  = to_fixed_point(event_slk,  measure_decimals)
+    event_df_num   = rows_df_num  [event_row]
+    event_position = rows_position[event_row]
+    
+    # Where events coincide (same categories and true measure), rows ending there come first and rows starting there next,
+    # so the output row ending at a point of equation takes the SLK before the jump, and the output row starting there
+    # takes the SLK after it. The "to" events of zero length rows come last so that those rows are not left active.
+    event_row_length = event_true[len(rows_df_num):] - event_true[:len(rows_df_num)]
+    event_kind = np.where(event_is_from, 1, np.where(event_row_length[event_row] > 0, 0, 2))
+    # Remaining ties are broken by row position, then "from" events are ordered by dataframe number,
+    # and "to" events are in reverse order of dataframe number.
+    event_tie_breaker = np.where(event_is_from, event_df_num, 2 * num_segmentations - 1 - event_df_num)
+
+    event_order = np.lexsort((
+        event_tie_breaker,
+        event_position,
+        event_kind,
+        event_true,
+        *(codes[event_row] for codes in reversed(rows_category_codes)),
+    ))
+    # rows with a missing category are dropped (as they would be by .groupby())
+    if len(categories) > 0:
+        rows_has_categories = np.logical_and.reduce([codes >= 0 for codes in rows_category_codes])
+        event_order = event_order[rows_has_categories[event_row[event_order]]]
+
+    event_row      = event_row     [event_order]
+    event_is_from  = event_is_from [event_order]
+    event_true     = event_true    [event_order]
+    event_slk      = event_slk     [event_order]
+    event_df_num   = event_df_num  [event_order]
+    event_position = event_position[event_order]
+
+    num_events = len(event_order)
+    event_index = np.arange(num_events)
+
+    # find the first event in each group of categories
+    event_group_start = np.zeros(num_events, dtype=bool)
+    if num_events > 0:
+        event_group_start[0] = True
+    for codes in rows_category_codes:
+        event_codes = codes[event_row]
+        event_group_start[1:] |= event_codes[1:] != event_codes[:-1]
+    event_group_start_index = np.maximum.accumulate(np.where(event_group_start, event_index, 0))
+
+    # For each input dataframe; the active row position just after each event.
+    # This is given by the most recent event for that dataframe in the same group:
+    # if it was a "from" event then its row is active, otherwise there is no active row.
+    active_position = []
+    for df_num in range(num_segmentations):
+        last_event = np.maximum.accumulate(np.where(event_df_num == df_num, event_index, -1))
+        last_event_valid = last_event >= event_group_start_index
+        last_event = np.where(last_event_valid, last_event, 0)
+        active_position.append(
+            np.where(last_event_valid & event_is_from[last_event], event_position[last_event], -1)
+        )
+
+    # A segment is output between each pair of consecutive events in the same group where both the true and slk measures
+    # increase, and at least one of the inputs has an active row
+    is_output = ~event_group_start[1:]
+    is_output &= (event_true[1:] - event_true[:-1]) > 0
+    is_output &= (event_slk [1:] - event_slk [:-1]) > 0
+    is_output &= np.logical_or.reduce([position[:-1] >= 0 for position in active_position])
+    output_event = np.flatnonzero(is_output) + 1
+
+    result_categories = rows_categories.iloc[rows_key[event_row[output_event]]].reset_index(drop=True)
+    result_measures = (
+        event_slk [output_event - 1],
+        event_slk [output_event    ],
+        event_true[output_event - 1],
+        event_true[output_event    ],
+    )
+    if measure_decimals is not None:
+        result_measures = tuple(from_fixed_point(measure, measure_decimals) for measure in result_measures)
+    result_positions = [position[output_event - 1] for position in active_position]
+    return result_categories, result_measures, result_positions
+
+
+def _sweep_rows(
+        segmentation:Union[pandas.DataFrame, NetworkIndex],
+        categories:List[str],
+        measure_true:Tuple[str,str],
+    ) -> Tuple[np.ndarray, pandas.DataFrame, np.ndarray]:
+    """
+    The rows of one input of `_sweep_segmentations()`, as `(row_order, keys, row_key)` where
+
+    - `row_order` is the position of each row in the input, in the order the rows are given to the sweep
+    - `keys` is a dataframe of `categories` values, and `row_key` is the row of `keys` for each row in `row_order`
+
+    A `NetworkIndex` grouped by `categories` contributes only its `group_keys`, so its rows are not factorized again,
+    and if it is also sorted by `measure_true[0]` its rows are given in sorted order, which makes the final sort of the events cheaper.
+    """
+    if isinstance(segmentation, NetworkIndex) and segmentation.is_grouped_by(categories):
+        if segmentation.is_sorted_by(categories, measure_true[0]):
+            row_order = segmentation.order
+        else:
+            row_order = np.arange(len(segmentation.data.index))
+        return row_order, segmentation.group_keys, segmentation.group_number[row_order]
+    data = network_data(segmentation)
+    return np.arange(len(data.index)), data[categories], np.arange(len(data.index))
+
+
+def _sweep_measure(segmentation:Union[pandas.DataFrame, NetworkIndex], column:str, row_order:np.ndarray) -> np.ndarray:
+    """`column` of one input of `_sweep_segmentations()` in `row_order`; the cached sorted measure of a `NetworkIndex` is reused"""
+    if isinstance(segmentation, NetworkIndex) and row_order is segmentation.order:
+        return segmentation.sorted_measure(column)
+    return network_data(segmentation)[column].to_numpy()[row_order]
@@ -0,0 +1,293 @@
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple
+import pandas as pd
+
+from .by_category import segment_by_categories_and_slk_discontinuities, segment_by_categories_and_slk_true_discontinuities
+from .split_rows_by_category_to_max_measure_length import split_rows_by_category_to_max_segment_length
+from .split_rows_by_segmentation import split_rows_by_segmentation
+from .cross_sections.cross_sections import cross_sections, cross_sections_normalised
+
+
+def stream_partitions(function:Callable, partitions:Iterable, **kwargs) -> Iterator[Any]:
+    """
+    Applies `function` to each of `partitions` in turn, yielding one result per partition,
+    such that concatenating the results gives the same ids as applying `function` to the whole dataset.
+
+    `function` is one of
+    - `segment_by_categories_and_slk_discontinuities` / `segment_by_categories_and_slk_true_discontinuities`:
+      segment labels continue from the previous partition
+    - `split_rows_by_category_to_max_segment_length`: the `segment_index` level continues from the previous partition
+    - `split_rows_by_segmentation`: `partitions` must yield `(original_segmentation, additional_segmentation)` pairs
+      (see `align_partitions()`); the `name_original_index` and `name_additional_index` columns are positions in the whole
+      stream of original / additional rows
+    - `cross_sections` / `cross_sections_normalised`: the cross section numbers continue from the previous partition
+
+    All other arguments of `function` must be passed as keyword arguments.
+
+    Each partition must hold every row for one or more values of the leading category (`categories[0]`, or
+    `group_categories[0]` for the cross section functions), and partitions must be in increasing order of that category;
+    `iter_parquet_partitions()` yields partitions like this. A `ValueError` is raised if the partitions are out of order.
+    Rows with a missing leading category value are not supported.
+
+    Each partition is re-indexed with the position of its rows in the whole stream (`0, 1, 2, ...` across all partitions),
+    so `original_index` values refer to the whole dataset. Results with a `RangeIndex` are re-indexed in the same way;
+    where the result is a tuple of tables (`cross_sections_normalised()`), each table is re-indexed separately.
+
+    Only one partition (and its result) needs to be held in memory at a time:
+
+    ```python
+    partitions = iter_parquet_partitions("lanes/", partition_column="ROAD")
+    results = stream_partitions(
+        cross_sections,
+        partitions,
+        group_categories         = ["ROAD", "CWY"],
+        cross_section_categories = ["XSP"],
+        measure_slk              = ("SLK_FROM", "SLK_TO"),
+        measure_true             = ("TRUE_FROM", "TRUE_TO"),
+    )
+    write_parquet(results, "cross_sections.parquet")
+    ```
+    """
+    if function not in _STREAMABLE_FUNCTIONS:
+        raise ValueError(f"stream_partitions does not support {getattr(function, '__name__', function)}; supported functions are {[supported.__name__ for supported in _STREAMABLE_FUNCTIONS]}")
+    is_paired = function is split_rows_by_segmentation
+    is_cross_section = function in (cross_sections, cross_sections_normalised)
+    leading_category = (kwargs["group_categories"] if is_cross_section else kwargs["categories"])[0]
+
+    row_offsets = [0, 0]
+    id_offset = 0
+    result_rows:List[int] = []
+    previous_key = None
+    for partition in partitions:
+        frames = list(partition) if is_paired else [partition]
+
+        keys = pd.concat([frame[leading_category] for frame in frames if leading_category in frame.columns]).dropna()
+        if len(keys) > 0:
+            if previous_key is not None and not keys.min() > previous_key:
+                raise ValueError(f"Partitions must be in increasing order of {leading_category!r} and must not share values; found {keys.min()!r} after {previous_key!r}")
+            previous_key = keys.max()
+
+        frames = [
+            frame.set_axis(pd.RangeIndex(row_offset, row_offset + len(frame.index)), axis="index")
+            for frame, row_offset
+            in zip(frames, row_offsets)
+        ]
+
+        if is_paired:
+            result = function(frames[0].reset_index(drop=True), frames[1].reset_index(drop=True), **kwargs)
+            result[kwargs["name_original_index"]]   += row_offsets[0]
+            result[kwargs["name_additional_index"]] += row_offsets[1]
+
+        elif function is split_rows_by_category_to_max_segment_length:
+            result = function(frames[0], **kwargs)
+            if len(result.index) > 0:
+                segment_index = result.index.levels[-1]
+                result.index = result.index.set_levels(segment_index + id_offset, level=-1)
+                id_offset += int(segment_index.max()) + 1
+
+        elif is_cross_section:
+            result = function(frames[0], **kwargs)
+            number_column = kwargs.get("out_col_name_cross_section_number", "cross_section_number")
+            tables = result if function is cross_sections_normalised else (result,)
+            if len(tables[0].index) > 0:
+                for table in tables:
+                    table[number_column] += id_offset
+                id_offset = int(tables[0][number_column].max()) + 1
+
+        else:
+            result = function(frames[0], **kwargs)
+            if len(result) > 0:
+                result += id_offset
+                id_offset = int(result.max()) + 1
+
+        for index, frame in enumerate(frames):
+            row_offsets[index] += len(frame.index)
+        # each table of the result (eg both tables of `cross_sections_normalised()`) continues its own row count
+        tables = result if isinstance(result, tuple) else (result,)
+        if not result_rows:
+            result_rows = [0] * len(tables)
+        for number, table in enumerate(tables):
+            if isinstance(table, (pd.DataFrame, pd.Series)) and isinstance(table.index, pd.RangeIndex):
+                table.index = pd.RangeIndex(result_rows[number], result_rows[number] + len(table.index))
+                result_rows[number] += len(table.index)
+        yield result
+
+
+_STREAMABLE_FUNCTIONS = (
+    segment_by_categories_and_slk_discontinuities,
+    segment_by_categories_and_slk_true_discontinuities,
+    split_rows_by_category_to_max_segment_length,
+    split_rows_by_segmentation,
+    cross_sections,
+    cross_sections_normalised,
+)
+
+
+def align_partitions(
+        original_partitions:Iterable[pd.DataFrame],
+        additional_partitions:Iterable[pd.DataFrame],
+        partition_column:str,
+    ) -> Iterator[Tuple[pd.DataFrame, pd.DataFrame]]:
+    """
+    Pairs up two streams of partitions (each in increasing order of `partition_column`, as yielded by `iter_parquet_partitions()`)
+    so that each pair holds every row of both streams for the same values of `partition_column`.
+    A side with no rows for those values is represented by an empty dataframe.
+    Used to stream `split_rows_by_segmentation()` with `stream_partitions()`.
+    """
+    sides = [_PartitionBuffer(original_partitions, partition_column), _PartitionBuffer(additional_partitions, partition_column)]
+    while True:
+        for side in sides:
+            side.fill()
+        if all(side.is_done() for side in sides):
+            return
+
+        # every row with a value below the smallest last buffered value is complete on both sides
+        bounds = [side.last_key() for side in sides if not side.is_exhausted]
+        bound = min(bounds) if bounds else None
+        pair = tuple(side.take_before(bound) for side in sides)
+        if any(len(frame.index) > 0 for frame in pair):
+            yield pair
+        else:
+            # nothing is complete yet; read further on the side(s) holding back the bound
+            for side in sides:
+                if not side.is_exhausted and side.last_key() == bound:
+                    side.read()
+
+
+class _PartitionBuffer:
+    """The rows read from a stream of partitions but not yet yielded by `align_partitions()`"""
+
+    def __init__(self, partitions:Iterable[pd.DataFrame], partition_column:str):
+        self.partitions = iter(partitions)
+        self.partition_column = partition_column
+        self.buffer:Optional[pd.DataFrame] = None
+        self.is_exhausted = False
+        self.empty:Optional[pd.DataFrame] = None
+
+    def read(self) -> None:
+        partition = next(self.partitions, None)
+        if partition is None:
+            self.is_exhausted = True
+            return
+        if self.empty is None:
+            self.empty = partition.iloc[:0]
+        if self.buffer is not None and len(self.buffer.index) > 0 and len(partition.index) > 0:
+            if partition[self.partition_column].iloc[0] < self.last_key():
+                raise ValueError(f"Partitions must be in increasing order of {self.partition_column!r}")
+        self.buffer = partition if self.buffer is None else pd.concat([self.buffer, partition], ignore_index=True)
+
+    def fill(self) -> None:
+        while not self.is_exhausted and (self.buffer is None or len(self.buffer.index) == 0):
+            self.read()
+
+    def is_done(self) -> bool:
+        return self.is_exhausted and (self.buffer is None or len(self.buffer.index) == 0)
+
+    def last_key(self) -> Any:
+        return self.buffer[self.partition_column].iloc[-1]
+
+    def take_before(self, bound:Any) -> pd.DataFrame:
+        if self.buffer is None:
+            # this stream was empty; the other stream's columns are unknown here, so an empty frame has no columns
+            return pd.DataFrame() if self.empty is None else self.empty
+        if bound is None:
+            taken, self.buffer = self.buffer, self.buffer.iloc[:0]
+        else:
+            is_before = (self.buffer[self.partition_column] < bound).to_numpy()
+            taken, self.buffer = self.buffer[is_before], self.buffer[~is_before]
+        return taken.reset_index(drop=True)
+
+
+def iter_parquet_partitions(
+        path:str,
+        partition_column:str,
+        columns:Optional[List[str]]=None,
+        batch_rows:int=1_000_000,
+    ) -> Iterator[pd.DataFrame]:
+    """
+    Reads a Parquet dataset (a file or a directory of files) in partitions which each hold every row for one or more
+    values of `partition_column`, in increasing order of `partition_column`, for use with `stream_partitions()`.
+    Requires `pyarrow`.
+
+    - If the dataset is hive partitioned by `partition_column` (eg `lanes/ROAD=H001/part-0.parquet`), each value is read
+      separately, and rows may be in any order on disk.
+    - Otherwise the rows on disk (files in sorted order of their paths, then rows within each file) must be sorted by
+      `partition_column`. The files are read in record batches of up to `batch_rows` rows, which are cut where
+      `partition_column` changes so that no value is split across partitions.
+
+    Only the rows of one partition are held in memory at a time (a single value of `partition_column` with
+    more than `batch_rows` rows is still read in one piece).
+    """
+    try:
+        import pyarrow.dataset
+        import pyarrow.parquet
+    except ImportError as error:
+        raise ImportError("iter_parquet_partitions() requires pyarrow; install it with `pip install segmenter[parquet]`") from error
+
+    if columns is not None and partition_column not in columns:
+        columns = [partition_column, *columns]
+
+    dataset = pyarrow.dataset.dataset(path, format="parquet", partitioning="hive")
+    if dataset.partitioning is not None and partition_column in dataset.partitioning.schema.names:
+        values = sorted({
+            pyarrow.dataset.get_partition_keys(fragment.partition_expression)[partition_column]
+            for fragment in dataset.get_fragments()
+        })
+        for value in values:
+            table = dataset.to_table(columns=columns, filter=pyarrow.dataset.field(partition_column) == value)
+            yield table.to_pandas()
+        return
+
+    previous_key = None
+    pending:List[pd.DataFrame] = []
+    for file in sorted(dataset.files):
+        for batch in pyarrow.parquet.ParquetFile(file).iter_batches(batch_size=batch_rows, columns=columns):
+            frame = batch.to_pandas()
+            if len(frame.index) == 0:
+                continue
+            keys = frame[partition_column]
+            if not keys.is_monotonic_increasing or (previous_key is not None and keys.iloc[0] < previous_key):
+                raise ValueError(f"The Parquet dataset {path!r} is neither hive partitioned nor sorted by {partition_column!r}")
+            previous_key = keys.iloc[-1]
+
+            # rows with the last value may continue in the next batch
+            is_complete = (keys != previous_key).to_numpy()
+            if is_complete.any():
+                yield pd.concat([*pending, frame[is_complete]], ignore_index=True)
+                pending = []
+            pending.append(frame[~is_complete])
+    if pending:
+        yield pd.concat(pending, ignore_index=True)
+
+
+def write_parquet(results:Iterable[Any], path:str) -> int:
+    """
+    Writes each dataframe (or series) yielded by `results` to a single Parquet file as it arrives, and returns the number of rows written.
+    Typically used with `stream_partitions()` so that results never need to be held in memory together.
+    The index is written as columns unless it is a `RangeIndex`. Requires `pyarrow`.
+    """
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as error:
+        raise ImportError("write_parquet() requires pyarrow; install it with `pip install segmenter[parquet]`") from error
+
+    writer = None
+    rows_written = 0
+    try:
+        for result in results:
+            if isinstance(result, pd.Series):
+                result = result.to_frame(name="value" if result.name is None else str(result.name))
+            if writer is None:
+                preserve_index = not isinstance(result.index, pd.RangeIndex)
+                table = pyarrow.Table.from_pandas(result, preserve_index=preserve_index)
+                schema = table.schema
+                writer = pyarrow.parquet.ParquetWriter(path, schema)
+            else:
+                table = pyarrow.Table.from_pandas(result, preserve_index=preserve_index)
+                table = table.cast(schema.remove_metadata()).replace_schema_metadata(schema.metadata)
+            writer.write_table(table)
+            rows_written += len(result.index)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows_written
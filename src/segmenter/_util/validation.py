@@ -0,0 +1,89 @@
+from typing import Callable, Dict, List, Set, Tuple, Union
+import weakref
+import pandas as pd
+
+from .network_index import NetworkIndex, network_data
+from .check_segmentation import check_linear_index, check_linear_index_is_ordered_and_disjoint
+
+
+VALIDATE_LEVELS = ("full", "fast", "none")
+
+# the checks passed by each dataframe given to `mark_validated()`, keyed by `id()`;
+# the weak reference confirms the identity of the dataframe, and its callback drops the entry when the dataframe is collected
+_validated:Dict[int, Tuple[weakref.ref, Set[str]]] = {}
+
+
+def check_validate_level(validate:str) -> None:
+    if validate not in VALIDATE_LEVELS:
+        raise ValueError(f"validate must be one of {VALIDATE_LEVELS}, got {validate!r}")
+
+
+def run_check(validate:str, data:pd.DataFrame, check_name:str, columns:List[str], check:Callable[[], None]) -> None:
+    """
+    Runs `check()` on `data` according to the `validate` level:
+
+    - `"full"`: the check always runs
+    - `"fast"`: the check is skipped if `data` was passed to `mark_validated()` and passed the same check there
+    - `"none"`: the check is skipped
+
+    `data` itself is never modified.
+    """
+    if validate == "none":
+        return
+    if validate == "fast" and _check_key(check_name, columns) in _validated_checks(data):
+        return
+    check()
+
+
+def mark_validated(
+        segmentation:Union[pd.DataFrame, NetworkIndex],
+        categories:List[str],
+        measure_slk:Tuple[str,str],
+        measure_true:Tuple[str,str],
+    ) -> None:
+    """
+    Runs the linear index checks on `measure_slk` and `measure_true`, and the ordered and disjoint check
+    on `measure_true` within `categories`, then records that `segmentation` passed them, so that functions called with
+    `validate="fast"` can skip those checks for this exact dataframe object.
+    Raises a `ValueError` (and forgets any earlier record for `segmentation`) if a check fails.
+
+    The record belongs to the dataframe object; copies, slices and sorted versions of it are not marked.
+    Edits made in place after marking are not detected, so call `mark_validated()` again after editing the dataframe.
+    Nothing is stored on the dataframe itself.
+    """
+    data = network_data(segmentation)
+    _validated.pop(id(data), None)
+
+    check_linear_index(data[list(measure_slk)])
+    check_linear_index(data[list(measure_true)])
+    check_linear_index_is_ordered_and_disjoint(segmentation, measure_true, categories)
+
+    key = id(data)
+    _validated[key] = (
+        weakref.ref(data, lambda _reference: _validated.pop(key, None)),
+        {
+            _check_key("check_linear_index", list(measure_slk)),
+            _check_key("check_linear_index", list(measure_true)),
+            _check_key("check_linear_index_is_ordered_and_disjoint", [*categories, *measure_true]),
+        },
+    )
+
+
+def is_range_index(index:pd.Index) -> bool:
+    """`True` if `index` is `0, 1, 2, ...`; avoids materialising a boolean array when `index` is a `RangeIndex`"""
+    if len(index) == 0:
+        return True
+    if isinstance(index, pd.RangeIndex):
+        return index.start == 0 and (index.step == 1 or len(index) == 1)
+    return index.equals(pd.RangeIndex(len(index)))
+
+
+def _check_key(check_name:str, columns:List[str]) -> str:
+    return f"{check_name}{list(columns)}"
+
+
+def _validated_checks(data:pd.DataFrame) -> Set[str]:
+    entry = _validated.get(id(data))
+    if entry is None or entry[0]() is not data:
+        return set()
+    return entry[1]
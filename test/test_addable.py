@@ -0,0 +1,28 @@
+
+
+def test_addable_membership_counts():
+    from segmenter._util.cross_sections.Addable import Addable
+
+    a = Addable([(1, 1), (2, 1)])
+    b = a + Addable([(1, 1)])
+    c = b - Addable([(1, 1)]) - Addable([(1, 1)])
+
+    assert list(a) == [(1, 1), (2, 1)]
+    assert list(b) == [(1, 2), (2, 1)]
+    # removal is decided by the membership count, not by the value
+    assert list(c) == [(2, 1)]
+    assert list(Addable([(1, 0.0)])) == [(1, 0.0)]
+    assert len(Addable([(1, 1)]) - Addable([(1, 1)])) == 0
+
+
+def test_addable_map_and_sorted_iteration():
+    from segmenter._util.cross_sections.Addable import Addable
+
+    a = Addable([("b", 1), ("a", 1)])
+    mapped = a.map(lambda item: (item[0], 0.0000001))
+
+    # values which are very small are still members
+    assert len(mapped) == 2
+    assert list(mapped + mapped) == [("a", 0.0000002), ("b", 0.0000002)]
+    # the original is not modified
+    assert list(a) == [("a", 1), ("b", 1)]
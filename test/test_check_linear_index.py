@@ -145,4 +145,37 @@ def test_check_linear_index_is_ordered_and_disjoint():
         # confirm passes regular test
         check_linear_index(df[["slk_from", "slk_to"]])
         # confirm fails disjoint test
-        check_linear_index_is_ordered_and_disjoint(df, measure=("slk_from", "slk_to"),categories=["group_categories"])
\ No newline at end of file
+        check_linear_index_is_ordered_and_disjoint(df, measure=("slk_from", "slk_to"),categories=["group_categories"])
+
+def test_linear_index_violations():
+    import pandas as pd
+    import numpy as np
+    from segmenter import linear_index_violations, NetworkIndex
+    df = pd.DataFrame(
+        columns=["road", "slk_from", "slk_to"],
+        data=[
+            ["a", 0, 1],
+            ["b", 5, 6],
+            ["a", 1, 3],
+            ["a", 2, 2],   # zero length, unsorted, overlapping
+            ["b", 4, 7],   # unsorted, overlapping
+            [None, 9, 8],  # reversed, missing category
+            ["a", np.nan, 4],
+        ],
+    )
+    expected = [
+        (3,    -1, 0, "zero_length"),
+        (3,     2, 0, "unsorted"),
+        (3,     2, 0, "overlapping"),
+        (4,     1, 1, "unsorted"),
+        (4,     1, 1, "overlapping"),
+        (5,    -1, -1, "reversed"),
+        (6,    -1, 0, "nan"),
+    ]
+    for data in [df, NetworkIndex(df, ["road"], ("slk_from", "slk_to"))]:
+        violations = linear_index_violations(data, ("slk_from", "slk_to"), ["road"])
+        assert list(violations.columns) == ["position", "previous_position", "group", "kind", "road"]
+        assert list(violations[["position", "previous_position", "group", "kind"]].itertuples(index=False, name=None)) == expected
+        assert list(violations["road"].fillna("")) == ["a", "a", "a", "b", "b", "", "a"]
+
+    assert len(linear_index_violations(df.iloc[[0, 1, 2]], ("slk_from", "slk_to"), ["road"])) == 0
@@ -86,4 +86,36 @@ def test_reversed_segments():
     assert not check_no_reversed_segments(
         df,
         measure=('slk_from', 'slk_to'),
-    )
\ No newline at end of file
+    )
+
+def test_check_monotonically_increasing_segments_matches_original_behaviour():
+    import numpy as np
+    import pandas as pd
+    from segmenter._util.check_segmentation import check_monotonically_increasing_segments
+    categories = ['road', 'carriageway']
+    measure = ('slk_from', 'slk_to')
+
+    # the first segment of each group must start at or after zero
+    df = pd.DataFrame(
+        columns=['road', 'carriageway', 'slk_from', 'slk_to'],
+        data=[
+            ["H001", "L", 0.001, 0.005],
+            ["H002", "L", -0.001, 0.005],
+        ]
+    )
+    assert not check_monotonically_increasing_segments(df, categories=categories, measure=measure)
+
+    # a missing end on the last segment of a group is not compared with anything
+    df = pd.DataFrame(
+        columns=['road', 'carriageway', 'slk_from', 'slk_to'],
+        data=[
+            ["H001", "L", 0.001, 0.005],
+            ["H001", "L", 0.005, np.nan],
+            ["H002", "L", 0.001, 0.005],
+        ]
+    )
+    assert check_monotonically_increasing_segments(df, categories=categories, measure=measure)
+
+    # ... but it fails the next segment of the group
+    df.loc[2, "road"] = "H001"
+    assert not check_monotonically_increasing_segments(df, categories=categories, measure=measure)
@@ -113,5 +113,34 @@ def test_cross_sections_preserves_index():
         atol=0.0001, # absolute tolerance of 1 cm
     )
 
+def test_cross_sections_parallel_matches_serial():
+    import pandas as pd
+    from concurrent.futures import ThreadPoolExecutor
+    from segmenter import cross_sections
+    data_to_iterate_over = pd.DataFrame(
+        columns=["road_no", "carriageway", "xsp", "slk_from", "slk_to", "true_from", "true_to"],
+        data=[
+            [road_no, carriageway, xsp, 0.010*start, 0.010*(start+length), 0.010*start, 0.010*(start+length)]
+            for road_no in ["H001", "H002", "H003", "H004", "H005"]
+            for carriageway in ["L", "R"]
+            for xsp, starts_and_lengths in [("L1", [(0, 3), (3, 4), (7, 2)]), ("L2", [(1, 2), (4, 5)])]
+            for start, length in starts_and_lengths
+        ]
+    )
+    arguments = dict(
+        segmentation             = data_to_iterate_over,
+        group_categories         = ["road_no", "carriageway"],
+        cross_section_categories = ["xsp"],
+        measure_slk              = ("slk_from", "slk_to"),
+        measure_true             = ("true_from", "true_to"),
+    )
+    expected_result = cross_sections(**arguments)
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        result_executor = cross_sections(**arguments, executor=executor)
+    result_processes = cross_sections(**arguments, n_jobs=2)
+
+    pd.testing.assert_frame_equal(result_executor, expected_result)
+    pd.testing.assert_frame_equal(result_processes, expected_result)
+
 if __name__ == "__main__":
     test_cross_sections()
\ No newline at end of file
@@ -0,0 +1,185 @@
+
+
+def road_network_features(count):
+    return [
+        {
+            "ROAD":            f"H{record_number // 7:03d}",
+            "CWY":             "Single",
+            "START_SLK":       record_number * 0.01,
+            "END_SLK":         (record_number + 1) * 0.01,
+            "START_TRUE_DIST": record_number * 0.01,
+            "END_TRUE_DIST":   (record_number + 1) * 0.01,
+            "NETWORK_TYPE":    "State Road",
+            "RA_NO":           "07",
+        }
+        for record_number in range(count)
+    ]
+
+
+def test_fetch_road_network_info_concurrent_matches_sequential():
+    import pandas as pd
+    from segmenter import fetch_road_network_info
+    from util.fake_arcgis_server import FakeArcGISServer
+    features = road_network_features(95)
+    with FakeArcGISServer(features, page_size=10) as server:
+        sequential = fetch_road_network_info(server.url)
+        concurrent = fetch_road_network_info(server.url, max_workers=4)
+    pd.testing.assert_frame_equal(sequential, concurrent)
+    pd.testing.assert_frame_equal(concurrent, pd.DataFrame(features))
+
+
+def test_fetch_road_network_info_chunk_limit():
+    from segmenter import fetch_road_network_info
+    from util.fake_arcgis_server import FakeArcGISServer
+    with FakeArcGISServer(road_network_features(95), page_size=10) as server:
+        assert len(fetch_road_network_info(server.url, chunk_limit=3)) == 30
+        assert len(fetch_road_network_info(server.url, chunk_limit=3, max_workers=4)) == 30
+
+
+def test_fetch_road_network_info_retries():
+    import pytest
+    import requests
+    from segmenter import fetch_road_network_info
+    from util.fake_arcgis_server import FakeArcGISServer
+    with FakeArcGISServer(road_network_features(25), page_size=10, fail_requests=2) as server:
+        result = fetch_road_network_info(server.url, max_workers=2, retries=2, backoff=0.01)
+    assert len(result) == 25
+    with FakeArcGISServer(road_network_features(25), page_size=10, fail_requests=3) as server:
+        with pytest.raises(requests.HTTPError):
+            fetch_road_network_info(server.url, retries=2, backoff=0.01)
+
+
+def test_fetch_road_network_info_cache(tmp_path):
+    import pytest
+    import pandas as pd
+    from segmenter import fetch_road_network_info
+    from util.fake_arcgis_server import FakeArcGISServer
+    features = road_network_features(25)
+    for record_number, attributes in enumerate(features):
+        attributes["EDIT_DATE"] = 1000 + record_number
+    cache_arguments = dict(cache_dir=str(tmp_path), cache_format="pickle", edit_date_field="EDIT_DATE")
+
+    with pytest.raises(FileNotFoundError):
+        fetch_road_network_info("http://127.0.0.1:1/query", offline=True, **cache_arguments)
+
+    with FakeArcGISServer(features, page_size=10) as server:
+        first = fetch_road_network_info(server.url, **cache_arguments)
+        assert len(server.queries) == 2 + 3
+
+        # unchanged; only the count and max edit date are requested
+        server.queries.clear()
+        pd.testing.assert_frame_equal(fetch_road_network_info(server.url, **cache_arguments), first)
+        assert len(server.queries) == 2
+
+        # an edited record invalidates the cache even though the count is the same
+        features[3] = features[3] | {"RA_NO": "99", "EDIT_DATE": 2000}
+        server.queries.clear()
+        edited = fetch_road_network_info(server.url, **cache_arguments)
+        assert len(server.queries) == 2 + 3
+        assert edited.loc[3, "RA_NO"] == "99"
+
+    pd.testing.assert_frame_equal(fetch_road_network_info(server.url, offline=True, **cache_arguments), edited)
+
+
+def test_fetch_road_network_info_cache_parquet(tmp_path):
+    import pytest
+    import pandas as pd
+    pytest.importorskip("pyarrow")
+    from segmenter import fetch_road_network_info
+    from util.fake_arcgis_server import FakeArcGISServer
+    with FakeArcGISServer(road_network_features(25), page_size=10) as server:
+        result = fetch_road_network_info(server.url, cache_dir=str(tmp_path))
+    pd.testing.assert_frame_equal(fetch_road_network_info(server.url, cache_dir=str(tmp_path), offline=True), result)
+
+
+def test_iter_road_network_info():
+    import pandas as pd
+    from segmenter import iter_road_network_info, concat_road_network_pages
+    from util.fake_arcgis_server import FakeArcGISServer
+    features = road_network_features(25)
+    for record_number, attributes in enumerate(features):
+        attributes["EDIT_DATE"] = 86_400_000 * record_number
+    features[4]["RA_NO"] = None
+    fields = [
+        {"name":"ROAD",            "type":"esriFieldTypeString"},
+        {"name":"CWY",             "type":"esriFieldTypeString"},
+        {"name":"START_SLK",       "type":"esriFieldTypeDouble"},
+        {"name":"END_SLK",         "type":"esriFieldTypeDouble"},
+        {"name":"START_TRUE_DIST", "type":"esriFieldTypeDouble"},
+        {"name":"END_TRUE_DIST",   "type":"esriFieldTypeDouble"},
+        {"name":"NETWORK_TYPE",    "type":"esriFieldTypeString"},
+        {"name":"RA_NO",           "type":"esriFieldTypeString"},
+        {"name":"EDIT_DATE",       "type":"esriFieldTypeDate"},
+    ]
+    with FakeArcGISServer(features, page_size=10, fields=fields) as server:
+        pages = list(iter_road_network_info(server.url))
+        pages_concurrent = list(iter_road_network_info(server.url, max_workers=3))
+
+    assert [len(page) for page in pages] == [10, 10, 5]
+    for page in pages:
+        assert list(page.columns) == [field["name"] for field in fields]
+        assert page["ROAD"].dtype == "string"
+        assert page["START_SLK"].dtype == "float64"
+        assert pd.api.types.is_datetime64_dtype(page["EDIT_DATE"])
+
+    result = concat_road_network_pages(pages)
+    pd.testing.assert_frame_equal(result, concat_road_network_pages(pages_concurrent))
+    assert list(result.index) == list(range(25))
+    assert result.loc[1, "EDIT_DATE"] == pd.Timestamp("1970-01-02")
+    assert pd.isna(result.loc[4, "RA_NO"])
+
+
+def test_sync_road_network_info(tmp_path):
+    import pandas as pd
+    from segmenter import sync_road_network_info
+    from util.fake_arcgis_server import FakeArcGISServer
+    DAY = 86_400_000
+    features = road_network_features(70)
+    for attributes in features:
+        attributes["EDIT_DATE"] = 10 * DAY
+    sync_arguments = dict(snapshot_dir=str(tmp_path), cache_format="pickle", edit_date_field="EDIT_DATE", roads_per_request=2)
+
+    def downloaded_roads(queries):
+        return sorted({
+            query["where"]
+            for query in queries
+            if "IN" in query.get("where", "") and "resultOffset" in query
+        })
+
+    with FakeArcGISServer(features, page_size=10) as server:
+        first = sync_road_network_info(url=server.url, **sync_arguments)
+        pd.testing.assert_frame_equal(first, pd.DataFrame(features))
+
+        # nothing changed
+        server.queries.clear()
+        pd.testing.assert_frame_equal(sync_road_network_info(url=server.url, **sync_arguments), first)
+        assert downloaded_roads(server.queries) == []
+
+        # H001 edited, H003 gains a record, H009 is deleted
+        features[8] = features[8] | {"RA_NO":"99", "EDIT_DATE":20 * DAY}
+        features.append(features[25] | {"START_SLK":9.0, "END_SLK":9.1})
+        del features[63:70]
+        server.queries.clear()
+        synced = sync_road_network_info(url=server.url, **sync_arguments)
+        assert downloaded_roads(server.queries) == ["(ROAD IN ('H001','H003'))", "(ROAD IN ('H009'))"]
+
+    expected = pd.DataFrame(features).sort_values("ROAD", kind="stable").reset_index(drop=True)
+    pd.testing.assert_frame_equal(synced, expected)
+
+
+def test_sync_road_network_info_more_roads_than_page_size(tmp_path):
+    import pandas as pd
+    from segmenter import sync_road_network_info
+    from util.fake_arcgis_server import FakeArcGISServer
+    features = road_network_features(70)
+    sync_arguments = dict(snapshot_dir=str(tmp_path), cache_format="pickle")
+
+    # 10 roads are counted in pages of 3 groups
+    with FakeArcGISServer(features, page_size=3) as server:
+        first = sync_road_network_info(url=server.url, **sync_arguments)
+        pd.testing.assert_frame_equal(first, pd.DataFrame(features))
+
+        server.queries.clear()
+        pd.testing.assert_frame_equal(sync_road_network_info(url=server.url, **sync_arguments), first)
+        assert [query for query in server.queries if "IN" in query.get("where", "")] == []
+        assert [int(query.get("resultOffset", 0)) for query in server.queries if "groupByFieldsForStatistics" in query] == [0, 3, 6, 9]
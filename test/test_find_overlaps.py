@@ -0,0 +1,47 @@
+import pytest
+
+
+def test_find_overlaps():
+    import pandas as pd
+    from segmenter import find_overlaps, NetworkIndex
+    df = pd.DataFrame(
+        columns=["road", "slk_from", "slk_to"],
+        data=[
+            ["a", 0, 10],
+            ["b", 0, 1],
+            ["a", 1, 2],
+            ["a", 3, 4],
+            ["b", 1, 2],   # touching is not overlapping
+            ["a", 9, 12],
+            ["a", 5, 5],   # zero length
+        ],
+    )
+    for data in [df, NetworkIndex(df, ["road"], ("slk_from", "slk_to"))]:
+        overlaps = find_overlaps(data, ["road"], ("slk_from", "slk_to"))
+        assert list(overlaps.columns) == ["first_position", "second_position", "overlap_length", "road"]
+        assert list(overlaps[["first_position", "second_position", "overlap_length"]].itertuples(index=False, name=None)) == [
+            (0, 2, 1),
+            (0, 3, 1),
+            (0, 5, 1),
+        ]
+        assert list(overlaps["road"]) == ["a", "a", "a"]
+
+    assert len(find_overlaps(df.iloc[[1, 2, 3, 4]], ["road"], ("slk_from", "slk_to"))) == 0
+
+
+def test_segment_by_categories_check_overlaps():
+    import pandas as pd
+    from segmenter import segment_by_categories_and_slk_discontinuities
+    df = pd.DataFrame(
+        columns=["road", "slk_from", "slk_to"],
+        data=[
+            ["a", 0, 1],
+            ["a", 1, 2],
+            ["b", 1, 3],
+            ["b", 0, 2],
+        ],
+    )
+    segment_by_categories_and_slk_discontinuities(df, ["road"], ("slk_from", "slk_to"))
+    with pytest.raises(ValueError, match="1 rows overlap.*index 2"):
+        segment_by_categories_and_slk_discontinuities(df, ["road"], ("slk_from", "slk_to"), check_overlaps=True)
+    segment_by_categories_and_slk_discontinuities(df.iloc[[0, 1, 2]], ["road"], ("slk_from", "slk_to"), check_overlaps=True)
@@ -0,0 +1,38 @@
+
+
+def test_to_fixed_point():
+    import numpy as np
+    import pytest
+    from segmenter._util.fixed_point import to_fixed_point, from_fixed_point
+
+    result = to_fixed_point([0.1, 0.2, 0.30000000000000004, 1234.5675], 3)
+    assert result.dtype == np.int32
+    assert result.tolist() == [100, 200, 300, 1234568]
+    assert from_fixed_point(result, 3).tolist() == [0.1, 0.2, 0.3, 1234.568]
+
+    assert to_fixed_point([5000.0], 6).dtype == np.int64
+
+    with pytest.raises(ValueError):
+        to_fixed_point([0.1, np.nan], 3)
+
+
+def test_split_rows_by_category_to_max_segment_length_fixed_point():
+    import pandas as pd
+    from segmenter import split_rows_by_category_to_max_segment_length
+    data = pd.DataFrame(
+        columns=["road", "slk_from", "slk_to", "true_from", "true_to"],
+        data=[
+            ["H001", 0.0, 0.7, 0.0, 0.7],
+        ]
+    )
+    result = split_rows_by_category_to_max_segment_length(
+        data,
+        measure_slk        = ("slk_from", "slk_to"),
+        measure_true       = ("true_from", "true_to"),
+        categories         = ["road"],
+        max_segment_length = 0.1,
+        measure_decimals   = 6,
+    )
+    # without fixed point, 3 * 0.1 == 0.30000000000000004
+    assert result["slk_from"].tolist() == [0.0, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6]
+    assert result["true_to" ].tolist() == [0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7]
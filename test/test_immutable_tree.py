@@ -0,0 +1,41 @@
+
+
+def test_immutable_tree_add_remove_shares_structure():
+    from segmenter._util.cross_sections.Addable import Addable
+    from segmenter._util.cross_sections.ImmutableTree import ImmutableTree
+
+    tree_0 = ImmutableTree()
+    tree_1 = tree_0.add_data(["L", "L1"], Addable([(0, 1)]))
+    tree_2 = tree_1.add_data(["R", "R1"], Addable([(1, 1)]))
+    tree_3 = tree_2.remove_data(["L", "L1"], Addable([(0, 1)]))
+
+    # earlier versions are not modified
+    assert str(tree_0) == "<>"
+    assert str(tree_1) == "<L:<L1:<(0, 1.000)>>>"
+    assert str(tree_2) == "<L:<L1:<(0, 1.000)>> R:<R1:<(1, 1.000)>>>"
+    # empty nodes are pruned
+    assert str(tree_3) == "<R:<R1:<(1, 1.000)>>>"
+
+    # untouched subtrees are shared rather than copied
+    assert tree_2._children["L"] is tree_1._children["L"]
+    assert tree_3._children["R"] is tree_2._children["R"]
+
+    # removing everything gives an empty tree
+    assert tree_1.remove_data(["L", "L1"], Addable([(0, 1)])).is_empty_leaf()
+
+
+def test_immutable_tree_merge():
+    import pytest
+    from segmenter._util.cross_sections.Addable import Addable
+    from segmenter._util.cross_sections.ImmutableTree import ImmutableTree, ImmutableTreeMergeError
+
+    tree_a = ImmutableTree().add_data(["L", "L1"], Addable([(0, 1)]))
+    tree_b = ImmutableTree().add_data(["L", "L1"], Addable([(0, 2), (1, 1)]))
+    tree_c = tree_b.add_data(["L", "L2"], Addable([(2, 1)]))
+
+    assert str(tree_a.merge(tree_b)) == "<L:<L1:<(0, 3.000), (1, 1.000)>>>"
+
+    with pytest.raises(ImmutableTreeMergeError):
+        tree_a.merge(tree_c)
+    with pytest.raises(ImmutableTreeMergeError):
+        tree_c.merge(tree_a)
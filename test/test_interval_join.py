@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+
+
+def test_interval_join():
+    from segmenter import interval_join
+    left = pd.DataFrame(
+        columns=["road", "true_from", "true_to"],
+        data=[
+            ["H001", 0.0, 1.0],
+            ["H001", 1.0, 2.0],
+            ["H002", 0.0, 1.0],
+            ["H001", 5.0, 6.0],
+        ]
+    )
+    right = pd.DataFrame(
+        columns=["road", "true_from", "true_to"],
+        data=[
+            ["H001", 0.5, 1.5],
+            ["H001", 0.0, 0.5],
+            ["H001", 1.9, 3.0],
+            ["H001", 1.0, 1.0], # zero length rows never overlap
+            ["H003", 0.0, 1.0],
+        ]
+    )
+    left_position, right_position, overlap_length = interval_join(left, right, ["road"], ("true_from", "true_to"))
+    np.testing.assert_array_equal(left_position,  [0, 0, 1, 1])
+    np.testing.assert_array_equal(right_position, [1, 0, 0, 2])
+    np.testing.assert_allclose(overlap_length,    [0.5, 0.5, 0.5, 0.1])
+
+    left_position, right_position, overlap_length = interval_join(
+        left, right, ["road"], ("true_from", "true_to"), how="left", min_overlap=0.2
+    )
+    np.testing.assert_array_equal(left_position,  [0, 0, 1, 2, 3])
+    np.testing.assert_array_equal(right_position, [1, 0, 0, -1, -1])
+    np.testing.assert_allclose(overlap_length,    [0.5, 0.5, 0.5, np.nan, np.nan])
+
+
+def test_interval_join_matches_brute_force():
+    from segmenter import interval_join, NetworkIndex
+    rng = np.random.default_rng(0)
+
+    def random_table(num_rows):
+        start  = rng.integers(0, 20, num_rows).astype(float)
+        length = rng.integers(-1, 6, num_rows)
+        return pd.DataFrame({
+            "road":      rng.choice(["H001", "H002"], num_rows),
+            "cwy":       rng.choice(["L", "R", None], num_rows),
+            "true_from": start,
+            "true_to":   start + length,
+        })
+
+    for _ in range(20):
+        left  = random_table(30)
+        right = random_table(30)
+        result = interval_join(left, NetworkIndex(right, ["road", "cwy"], ("true_from", "true_to")), ["road", "cwy"], ("true_from", "true_to"))
+
+        expected = left.reset_index().merge(right.reset_index(), on=["road", "cwy"], suffixes=("_left", "_right"))
+        expected["overlap_length"] = (
+              np.minimum(expected["true_to_left"],   expected["true_to_right"])
+            - np.maximum(expected["true_from_left"], expected["true_from_right"])
+        )
+        expected = expected[
+              (expected["overlap_length"] > 0)
+            & (expected["true_from_left"]  < expected["true_to_left"])
+            & (expected["true_from_right"] < expected["true_to_right"])
+        ].sort_values(["index_left", "true_from_right", "index_right"])
+
+        np.testing.assert_array_equal(result[0], expected["index_left"])
+        np.testing.assert_array_equal(result[1], expected["index_right"])
+        np.testing.assert_allclose   (result[2], expected["overlap_length"])
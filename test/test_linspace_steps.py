@@ -73,3 +73,28 @@ def test_linspace_steps(test_input, expected_result, expectation):
 
 		assert len(actual_result) == len(expected_result)
 		assert np.isclose(actual_result, expected_result).all()
+
+
+def test_linspace_steps_batch_matches_linspace_steps():
+	import numpy as np
+	from segmenter import linspace_steps, linspace_steps_batch
+
+	measure_from = np.array([190, 190, 14.2, 14.2,  13.95, 14.05, 14.05, 0.004, 0.000, 14.0])
+	measure_to   = np.array([195, 270, 16.3, 16.05, 15.6,  15.95, 14.05, 0.006, 0.006, 14.0])
+
+	for multiples, minimum_length in [(50, 0), (0.3, 0), (0.5, 0.1), (0.005, 0.002), (0.005, 0.003)]:
+		values, offsets = linspace_steps_batch(measure_from, measure_to, multiples, minimum_length)
+		assert len(offsets) == len(measure_from) + 1
+		for index, (each_from, each_to) in enumerate(zip(measure_from, measure_to)):
+			expected_result = linspace_steps(each_from, each_to, multiples, minimum_length)
+			actual_result   = values[offsets[index]:offsets[index+1]]
+			assert len(actual_result) == len(expected_result)
+			assert (actual_result == expected_result).all()
+
+
+def test_linspace_steps_batch_raises():
+	import numpy as np
+	from segmenter import linspace_steps_batch
+
+	with pytest.raises(ValueError):
+		linspace_steps_batch(np.array([14.05, 1.0]), np.array([14.00, 2.0]), 0.5)
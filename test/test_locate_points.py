@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+
+
+def test_locate_points():
+    from segmenter import locate_points
+    segmentation = pd.DataFrame(
+        columns=["road", "cwy", "slk_from", "slk_to"],
+        data=[
+            ["H001", "L", 0.1, 0.2],
+            ["H001", "L", 0.0, 0.1],
+            ["H001", "L", 0.3, 0.4], # gap before
+            ["H001", "R", 0.0, 0.1],
+            ["H001", "R", 0.1, 0.1], # zero length rows are ignored
+        ]
+    )
+    points = pd.DataFrame(
+        columns=["road", "cwy", "slk"],
+        data=[
+            ["H001", "L", 0.05  ], # inside
+            ["H001", "L", 0.1   ], # boundary; located in the row which starts there
+            ["H001", "L", 0.0   ], # start of the first row
+            ["H001", "L", 0.2   ], # end of a row followed by a gap
+            ["H001", "L", 0.25  ], # gap
+            ["H001", "L", 0.4   ], # end of the last row
+            ["H001", "L", 0.41  ], # after the last row
+            ["H001", "L", -0.1  ], # before the first row
+            ["H001", "R", 0.1   ], # end of a row followed by a zero length row
+            ["H002", "L", 0.05  ], # no such road
+            ["H001", "L", np.nan],
+        ]
+    )
+    result = locate_points(segmentation, points, ["road", "cwy"], ("slk_from", "slk_to"), point_measure="slk")
+    np.testing.assert_array_equal(result, [1, 0, 1, 0, -1, 2, -1, -1, 3, -1, -1])
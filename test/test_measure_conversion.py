@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+
+
+def test_measure_conversion_index():
+    from segmenter import MeasureConversionIndex
+    network = pd.DataFrame(
+        columns=["ROAD", "CWY", "START_SLK", "END_SLK", "START_TRUE_DIST", "END_TRUE_DIST"],
+        data=[
+            ["H001", "Single", 0.00, 5.00, 0.00, 5.00],
+            ["H001", "Single", 5.02, 7.00, 5.00, 6.98], # point of equation; SLK jumps forward
+            ["H001", "Single", 7.00, 7.50, 6.98, 7.48],
+            ["H001", "Single", 7.40, 8.00, 7.48, 8.08], # point of equation; SLK repeats
+            ["H002", "Left",   0.00, 1.00, 0.00, 1.00],
+        ]
+    )
+    conversion = MeasureConversionIndex(network)
+
+    data = pd.DataFrame(
+        columns=["road", "cwy", "slk"],
+        data=[
+            ["H001", "Single", 2.50],
+            ["H001", "Single", 5.00],
+            ["H001", "Single", 5.01], # in the SLK gap
+            ["H001", "Single", 5.02],
+            ["H001", "Single", 7.45], # on both sides of the second point of equation
+            ["H001", "Single", 8.00],
+            ["H002", "Right",  0.50], # not in the network
+        ]
+    )
+    true_start = conversion.slk_to_true(data, "slk", categories=["road", "cwy"], side="start")
+    np.testing.assert_allclose(true_start, [2.50, 5.00, np.nan, 5.00, 7.53, 8.08, np.nan])
+
+    data["true"] = [0.00, 5.00, 6.98, 7.48, 8.08, np.nan, 0.5]
+    np.testing.assert_array_equal(
+        conversion.true_to_slk(data, "true", categories=["road", "cwy"], side="start"),
+        [0.00, 5.02, 7.00, 7.40, 8.00, np.nan, np.nan],
+    )
+    np.testing.assert_array_equal(
+        conversion.true_to_slk(data, "true", categories=["road", "cwy"], side="end"),
+        [0.00, 5.00, 7.00, 7.50, 8.00, np.nan, np.nan],
+    )
@@ -0,0 +1,84 @@
+
+
+def test_network_index():
+    import numpy as np
+    import pandas as pd
+    from segmenter import NetworkIndex
+    data = pd.DataFrame(
+        columns=["road", "cwy", "true_from", "true_to"],
+        data=[
+            ["H002", "L", 0.2, 0.3],
+            ["H001", "R", 0.1, 0.2],
+            ["H001", "L", 0.1, 0.2],
+            ["H002", "L", 0.0, 0.2],
+            ["H001", "L", 0.0, 0.1],
+            [None,   "L", 0.0, 0.1],
+        ],
+        index=[10, 11, 12, 13, 14, 15],
+    )
+    network = NetworkIndex(data, ["road", "cwy"], ("true_from", "true_to"))
+
+    np.testing.assert_array_equal(network.order,         [4, 2, 1, 3, 0, 5])
+    np.testing.assert_array_equal(network.group_offsets, [0, 2, 3, 5, 6])
+    np.testing.assert_array_equal(network.group_number,  [2, 1, 0, 2, 0, 3])
+    np.testing.assert_array_equal(network.sorted_measure("true_from"), [0.0, 0.1, 0.1, 0.0, 0.2, 0.0])
+    assert network.num_groups == 4
+    assert network.group_keys.iloc[:3].values.tolist() == [["H001", "L"], ["H001", "R"], ["H002", "L"]]
+
+    # groups are the same as a groupby; the group with a missing category is skipped
+    groups = list(network.groups())
+    expected_groups = list(data.groupby(["road", "cwy"]))
+    assert [key for key, _ in groups] == [key for key, _ in expected_groups]
+    for (_, group), (_, expected_group) in zip(groups, expected_groups):
+        pd.testing.assert_frame_equal(group, expected_group)
+
+
+def test_network_index_accepted_in_place_of_dataframe():
+    import pandas as pd
+    from segmenter import (
+        NetworkIndex,
+        segment_by_categories_and_slk_true_discontinuities,
+        split_rows_by_category_to_max_segment_length,
+        check_linear_index_is_ordered_and_disjoint,
+        cross_sections,
+        split_rows_by_segmentation,
+    )
+    data = pd.DataFrame(
+        columns=["road", "cwy", "slk_from", "slk_to", "true_from", "true_to", "value"],
+        data=[
+            ["H001", "L", 0.00, 0.05, 0.00, 0.05, 1],
+            ["H001", "R", 0.00, 0.10, 0.00, 0.10, 2],
+            ["H001", "L", 0.05, 0.12, 0.05, 0.12, 3],
+            ["H002", "L", 0.30, 0.40, 0.00, 0.10, 4],
+            ["H002", "L", 0.20, 0.30, 0.10, 0.20, 5],
+        ]
+    )
+    network = NetworkIndex(data, ["road", "cwy"], ("true_from", "true_to"))
+    measure_slk  = ("slk_from", "slk_to")
+    measure_true = ("true_from", "true_to")
+
+    pd.testing.assert_series_equal(
+        segment_by_categories_and_slk_true_discontinuities(network, ["road", "cwy"], measure_slk, measure_true),
+        segment_by_categories_and_slk_true_discontinuities(data,    ["road", "cwy"], measure_slk, measure_true),
+    )
+    pd.testing.assert_frame_equal(
+        split_rows_by_category_to_max_segment_length(network, measure_slk, measure_true, ["road", "cwy"], 0.04),
+        split_rows_by_category_to_max_segment_length(data,    measure_slk, measure_true, ["road", "cwy"], 0.04),
+    )
+    check_linear_index_is_ordered_and_disjoint(network, measure_true, ["road", "cwy"])
+    pd.testing.assert_frame_equal(
+        cross_sections(network, ["road"], ["cwy"], measure_slk, measure_true),
+        cross_sections(data,    ["road"], ["cwy"], measure_slk, measure_true),
+    )
+    pd.testing.assert_frame_equal(
+        cross_sections(NetworkIndex(data, ["road"], measure_true), ["road"], ["cwy"], measure_slk, measure_true),
+        cross_sections(data,                                       ["road"], ["cwy"], measure_slk, measure_true),
+    )
+
+    # the sweep reuses the grouping and order of a NetworkIndex grouped by the same categories, and falls back to the data otherwise
+    additional = data.iloc[[1, 0, 4]].reset_index(drop=True).assign(slk_to=lambda df: df["slk_to"] - 0.02, true_to=lambda df: df["true_to"] - 0.02)
+    names = dict(name_original_index="original_index", name_additional_index="additional_index")
+    pd.testing.assert_frame_equal(
+        split_rows_by_segmentation(network, NetworkIndex(additional, ["road"], measure_true), ["road", "cwy"], measure_slk, measure_true, **names),
+        split_rows_by_segmentation(data,    additional,                                       ["road", "cwy"], measure_slk, measure_true, **names),
+    )
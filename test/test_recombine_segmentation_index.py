@@ -69,3 +69,45 @@ def test_recombine_segmentation_index():
         check_like=False # ignore column and row order
     )
 
+
+def test_recombine_segmentation_index_no_overlap():
+    from segmenter._util.split_rows_by_category_to_max_measure_length import _recombine_segmentation_index
+
+    original_data = pd.DataFrame(
+        columns = ["from","to","value"],
+        data=[
+            [ 0,15,"a"],
+            [15,24,"b"],
+            [35,50,"c"],
+        ],
+        index=["x","y","z"]
+    )
+
+    segmentation = pd.DataFrame(
+        columns = [
+            "from",
+            "to",
+            "segment_index",
+            "index_from",
+            "index_to"
+        ],
+        data = [
+            [35,45,2,2,2],
+            [ 0,10,1,0,1],
+            [10,20,1,0,1], # equal overlap; the first observation wins
+            [24,30,1,0,1], # in a gap; no overlap
+        ]
+    )
+
+    result = _recombine_segmentation_index(
+        segmentation   = segmentation,
+        original_data  = original_data,
+        measure        = ("from", "to"),
+        grouping_id    = "segment_index",
+        grouping_range = ("index_from", "index_to")
+    )
+
+    # rows are returned in the same order as segmentation.groupby("segment_index")
+    assert result.index.tolist() == [1, 2, 3, 0]
+    assert result.loc[[1, 2, 0]].tolist() == ["x", "x", "z"]
+    assert pd.isna(result.loc[3])
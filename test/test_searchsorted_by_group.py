@@ -0,0 +1,24 @@
+import numpy as np
+import pytest
+
+
+@pytest.mark.parametrize("side", ["left", "right"])
+def test_searchsorted_by_group(side):
+    from segmenter._util.searchsorted_by_group import searchsorted_by_group
+
+    sorted_group  = np.array([0,   0,   0,   2,   2,   3  ])
+    sorted_values = np.array([1.0, 2.0, 2.0, 0.0, 5.0, 1.0])
+
+    query_group   = np.array([0,   0,   0,   1,   2,   2,   3,   3  ])
+    query_values  = np.array([0.0, 2.0, 9.0, 4.0, 0.0, 6.0, 1.0, 0.5])
+
+    actual_result = searchsorted_by_group(sorted_group, sorted_values, query_group, query_values, side=side)
+
+    # compare against a plain searchsorted applied to each group separately
+    expected_result = []
+    for group, value in zip(query_group, query_values):
+        group_start = np.searchsorted(sorted_group, group, side="left")
+        group_end   = np.searchsorted(sorted_group, group, side="right")
+        expected_result.append(group_start + np.searchsorted(sorted_values[group_start:group_end], value, side=side))
+
+    assert actual_result.tolist() == expected_result
@@ -171,4 +171,92 @@ def test_test_split_rows_by_category_to_max_segment_length_troublesome():
     #print(result)
     # we will not check the result here... we just want to make sure there is no error
 
-    #    1752.89, 1744.58, 1746.46
\ No newline at end of file
+    #    1752.89, 1744.58, 1746.46
+
+def test_split_rows_by_category_to_max_segment_length_parallel_matches_serial():
+    import pandas as pd
+    from concurrent.futures import ThreadPoolExecutor
+    from segmenter import split_rows_by_category_to_max_segment_length
+    data = pd.DataFrame(
+        columns=["road_no", "carriageway", "slk_from", "slk_to", "true_from", "true_to", "value"],
+        data=[
+            [road_no, carriageway, 0.010*start, 0.010*(start+length), 0.010*start, 0.010*(start+length), start]
+            for road_no in ["H001", "H002", "H003", "H004", "H005"]
+            for carriageway in ["L", "R"]
+            for start, length in [(0, 3), (3, 4), (9, 2), (11, 7)]
+        ]
+    )
+    arguments = dict(
+        data               = data,
+        measure_slk        = ("slk_from", "slk_to"),
+        measure_true       = ("true_from", "true_to"),
+        categories         = ["road_no", "carriageway"],
+        max_segment_length = 0.020,
+    )
+    expected_result = split_rows_by_category_to_max_segment_length(**arguments)
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        result_executor = split_rows_by_category_to_max_segment_length(**arguments, executor=executor)
+    result_processes = split_rows_by_category_to_max_segment_length(**arguments, n_jobs=2)
+
+    pd.testing.assert_frame_equal(result_executor, expected_result)
+    pd.testing.assert_frame_equal(result_processes, expected_result)
+    assert expected_result.index.get_level_values("segment_index").max() == 19
+
+def test_split_rows_by_category_to_max_segment_length_aggregation():
+    import numpy as np
+    import pytest
+    import pandas as pd
+    from segmenter import split_rows_by_category_to_max_segment_length
+    data = pd.DataFrame(
+        columns=["road_no", "slk_from", "slk_to", "true_from", "true_to", "width", "surface", "count"],
+        data=[
+            ["H001", 0.000, 0.030, 0.000, 0.030, 3.0,    "seal",    3.0],
+            ["H001", 0.030, 0.040, 0.030, 0.040, np.nan, "asphalt", 2.0],
+            ["H001", 0.040, 0.050, 0.040, 0.050, 5.0,    "asphalt", np.nan],
+        ]
+    )
+    result = split_rows_by_category_to_max_segment_length(
+        data,
+        measure_slk        = ("slk_from", "slk_to"),
+        measure_true       = ("true_from", "true_to"),
+        categories         = ["road_no"],
+        max_segment_length = 0.050,
+        aggregation        = {
+            "width":   "length_weighted_mean",
+            "surface": "mode_by_length",
+            "count":   "sum_prorated",
+        },
+    )
+    assert len(result.index) == 1
+    assert result["width"].iloc[0] == (3.0*0.030 + 5.0*0.010) / 0.040
+    # "seal" overlaps 0.030 whereas "asphalt" overlaps 0.020 in total
+    assert result["surface"].iloc[0] == "seal"
+    assert result["count"].iloc[0] == 5.0
+
+    result = split_rows_by_category_to_max_segment_length(
+        data,
+        measure_slk        = ("slk_from", "slk_to"),
+        measure_true       = ("true_from", "true_to"),
+        categories         = ["road_no"],
+        max_segment_length = 0.020,
+        aggregation        = {
+            "width":   "longest_non_null",
+            "surface": "min",
+            "count":   "sum_prorated",
+        },
+    )
+    assert result["true_from"].tolist() == [0.000, 0.020, 0.040]
+    # the longest overlap of the second row has a missing width
+    assert result["width"].tolist() == [3.0, 3.0, 5.0]
+    assert result["surface"].tolist() == ["seal", "asphalt", "asphalt"]
+    np.testing.assert_allclose(result["count"].to_numpy(), [2.0, 1.0 + 2.0, np.nan])
+
+    with pytest.raises(ValueError):
+        split_rows_by_category_to_max_segment_length(
+            data,
+            measure_slk        = ("slk_from", "slk_to"),
+            measure_true       = ("true_from", "true_to"),
+            categories         = ["road_no"],
+            max_segment_length = 0.020,
+            aggregation        = {"surface": "length_weighted_mean"},
+        )
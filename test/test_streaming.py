@@ -0,0 +1,99 @@
+
+
+def lane_segmentation():
+    import pandas as pd
+    return pd.DataFrame(
+        columns=["road", "cwy", "xsp", "slk_from", "slk_to", "true_from", "true_to", "value"],
+        data=[
+            ["H001", "L", "L1", 0.00, 0.10, 0.00, 0.10, 1],
+            ["H001", "L", "L1", 0.10, 0.20, 0.10, 0.20, 2],
+            ["H001", "L", "L2", 0.05, 0.20, 0.05, 0.20, 3],
+            ["H002", "S", "L1", 0.00, 0.05, 0.00, 0.05, 4],
+            ["H002", "S", "L1", 0.10, 0.15, 0.10, 0.15, 5],
+            ["H003", "S", "L1", 0.00, 0.30, 0.00, 0.30, 6],
+            ["H003", "S", "R1", 0.00, 0.30, 0.00, 0.30, 7],
+        ],
+    )
+
+
+def test_stream_partitions_matches_whole_dataset():
+    import pandas as pd
+    import pytest
+    from segmenter import stream_partitions, segment_by_categories_and_slk_true_discontinuities, cross_sections, cross_sections_normalised, split_rows_by_category_to_max_segment_length
+    df = lane_segmentation()
+    partitions = [df.iloc[0:3].reset_index(drop=True), df.iloc[3:5].reset_index(drop=True), df.iloc[5:].reset_index(drop=True)]
+
+    arguments = dict(categories=["road", "cwy", "xsp"], measure_slk=("slk_from", "slk_to"), measure_true=("true_from", "true_to"))
+    pd.testing.assert_series_equal(
+        pd.concat(stream_partitions(segment_by_categories_and_slk_true_discontinuities, partitions, **arguments)),
+        segment_by_categories_and_slk_true_discontinuities(df, **arguments),
+    )
+
+    arguments = dict(group_categories=["road", "cwy"], cross_section_categories=["xsp"], measure_slk=("slk_from", "slk_to"), measure_true=("true_from", "true_to"))
+    pd.testing.assert_frame_equal(
+        pd.concat(stream_partitions(cross_sections, partitions, **arguments)),
+        cross_sections(df, **arguments),
+    )
+
+    results = list(stream_partitions(cross_sections_normalised, partitions, **arguments))
+    for table, expected in zip((pd.concat([result[number] for result in results]) for number in range(2)), cross_sections_normalised(df, **arguments)):
+        pd.testing.assert_frame_equal(table, expected)
+
+    with pytest.raises(ValueError, match="increasing order"):
+        list(stream_partitions(cross_sections, partitions[::-1], **arguments))
+
+    arguments = dict(categories=["road", "cwy", "xsp"], measure_slk=("slk_from", "slk_to"), measure_true=("true_from", "true_to"), max_segment_length=0.1)
+    pd.testing.assert_frame_equal(
+        pd.concat(stream_partitions(split_rows_by_category_to_max_segment_length, partitions, **arguments)),
+        split_rows_by_category_to_max_segment_length(df, **arguments),
+    )
+
+
+def test_stream_partitions_split_rows_by_segmentation():
+    import pandas as pd
+    from segmenter import stream_partitions, align_partitions, split_rows_by_segmentation
+    original = lane_segmentation()
+    additional = original[original["road"] != "H002"].reset_index(drop=True)
+    additional["slk_to"] = additional["true_to"] = additional["slk_to"] - 0.02
+    arguments = dict(
+        categories            = ["road", "cwy", "xsp"],
+        measure_slk           = ("slk_from", "slk_to"),
+        measure_true          = ("true_from", "true_to"),
+        name_original_index   = "original_index",
+        name_additional_index = "additional_index",
+    )
+    pairs = list(align_partitions(
+        [original.iloc[0:4].reset_index(drop=True), original.iloc[4:].reset_index(drop=True)],
+        [additional.iloc[0:2].reset_index(drop=True), additional.iloc[2:].reset_index(drop=True)],
+        "road",
+    ))
+    assert [
+        (list(original_part["road"].unique()), list(additional_part["road"].unique()))
+        for original_part, additional_part in pairs
+    ] == [(["H001"], ["H001"]), (["H002"], []), (["H003"], ["H003"])]
+    pd.testing.assert_frame_equal(
+        pd.concat(stream_partitions(split_rows_by_segmentation, pairs, **arguments)),
+        split_rows_by_segmentation(original, additional, **arguments),
+    )
+
+
+def test_parquet_partitions(tmp_path):
+    import pytest
+    import pandas as pd
+    pytest.importorskip("pyarrow")
+    from segmenter import iter_parquet_partitions, write_parquet, stream_partitions, segment_by_categories_and_slk_true_discontinuities
+    df = lane_segmentation()
+    df.to_parquet(tmp_path / "sorted.parquet")
+    df.to_parquet(tmp_path / "hive", partition_cols=["road"])
+
+    partitions = list(iter_parquet_partitions(str(tmp_path / "sorted.parquet"), "road", batch_rows=2))
+    assert [list(partition["road"].unique()) for partition in partitions] == [["H001"], ["H002"], ["H003"]]
+    pd.testing.assert_frame_equal(pd.concat(partitions, ignore_index=True), df)
+
+    partitions = list(iter_parquet_partitions(str(tmp_path / "hive"), "road"))
+    assert [len(partition) for partition in partitions] == [3, 2, 2]
+
+    arguments = dict(categories=["road", "cwy", "xsp"], measure_slk=("slk_from", "slk_to"), measure_true=("true_from", "true_to"))
+    results = stream_partitions(segment_by_categories_and_slk_true_discontinuities, iter_parquet_partitions(str(tmp_path / "sorted.parquet"), "road"), **arguments)
+    assert write_parquet(results, str(tmp_path / "result.parquet")) == len(df)
+    assert list(pd.read_parquet(tmp_path / "result.parquet")["value"]) == list(segment_by_categories_and_slk_true_discontinuities(df, **arguments))
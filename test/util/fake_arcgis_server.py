@@ -0,0 +1,130 @@
+import json
+import re
+import threading
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional
+from urllib.parse import parse_qs, urlparse
+
+
+class FakeArcGISServer:
+    """
+    A local stand-in for an ArcGIS MapServer layer `query` endpoint, for use in tests.
+
+    Serves `features` (a list of attribute dicts) in pages of `page_size` records;
+    `outStatistics` queries grouped by `groupByFieldsForStatistics` are paged in the same way.
+    `fields` is the list of `{"name":..., "type":...}` field descriptions included with each page.
+    Only the `where` clauses generated by `segmenter` are understood; `1=1`, `FIELD IN (...)`
+    and `FIELD > timestamp '...'`, joined by `AND`. Date fields are stored as milliseconds since the epoch.
+    `fail_requests` is the number of requests which will fail with a 500 status before
+    the server starts responding normally. Every query received is recorded in `queries`.
+
+    ```python
+    with FakeArcGISServer(features, page_size=10) as server:
+        fetch_road_network_info(server.url)
+    ```
+    """
+
+    def __init__(self, features:list[dict], page_size:int=1000, fail_requests:int=0, fields:Optional[List[dict]]=None):
+        self.features      = features
+        self.fields        = [] if fields is None else fields
+        self.page_size     = page_size
+        self.fail_requests = fail_requests
+        self.queries:list[dict] = []
+        self._lock = threading.Lock()
+
+        fake_server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                query = {key:values[0] for key, values in parse_qs(urlparse(self.path).query).items()}
+                with fake_server._lock:
+                    fake_server.queries.append(query)
+                    fail = fake_server.fail_requests > 0
+                    if fail:
+                        fake_server.fail_requests -= 1
+                if fail:
+                    self.send_response(500)
+                    self.end_headers()
+                    return
+                body = json.dumps(fake_server.respond(query)).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/query"
+
+    def respond(self, query:dict) -> dict:
+        features = [attributes for attributes in self.features if _matches_where(query.get("where", "1=1"), attributes)]
+        if query.get("returnCountOnly", "false").lower() == "true":
+            return {"count": len(features)}
+        if "outStatistics" in query:
+            statistics = json.loads(query["outStatistics"])
+            group_field = query.get("groupByFieldsForStatistics")
+            groups = {}
+            for attributes in features:
+                groups.setdefault(attributes[group_field] if group_field else None, []).append(attributes)
+            aggregates = {"max":max, "count":len}
+            # grouped statistics are paged like features, one group per record
+            features = [
+                {
+                    **({group_field: group_value} if group_field else {}),
+                    **{
+                        statistic["outStatisticFieldName"]: aggregates[statistic["statisticType"]](
+                            [attributes[statistic["onStatisticField"]] for attributes in group]
+                        )
+                        for statistic in statistics
+                    },
+                }
+                for group_value, group in groups.items()
+            ]
+        elif query.get("returnDistinctValues", "false").lower() == "true":
+            out_fields = query["outFields"].split(",")
+            features = [dict(values) for values in dict.fromkeys(
+                tuple((field, attributes[field]) for field in out_fields)
+                for attributes in features
+            )]
+        offset = int(query.get("resultOffset", 0))
+        page = features[offset:offset + self.page_size]
+        return {
+            "fields":   self.fields,
+            "features": [{"attributes": attributes} for attributes in page],
+            **({"exceededTransferLimit": True} if offset + self.page_size < len(features) else {}),
+        }
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def _matches_where(where:str, attributes:dict) -> bool:
+    clauses = re.split(r"\) AND \(", where[1:-1]) if where.startswith("(") else [where]
+    for clause in clauses:
+        if clause == "1=1":
+            continue
+        if match := re.fullmatch(r"(\w+) IN \((.*)\)", clause):
+            values = [json.loads(value) if not value.startswith("'") else value[1:-1].replace("''", "'") for value in re.findall(r"'(?:[^']|'')*'|[^,]+", match[2])]
+            if attributes[match[1]] not in values:
+                return False
+        elif match := re.fullmatch(r"(\w+) > timestamp '(.*)'", clause):
+            timestamp = datetime.strptime(match[2], "%Y-%m-%d %H:%M:%S").replace(tzinfo=timezone.utc).timestamp() * 1000
+            if not attributes[match[1]] > timestamp:
+                return False
+        else:
+            raise ValueError(f"FakeArcGISServer does not understand the where clause {clause!r}")
+    return True